@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from .github_client import (
+    ALL_ENDPOINTS,
+    BudgetExhausted,
+    COMMIT_FIELDS,
+    ISSUE_FIELDS,
+    PULL_FIELDS,
+    REPO_FIELDS,
+    REVIEW_FIELDS,
+    ContributionTally,
+    FieldTree,
+    decode_json,
+    endpoint_label,
+    filter_items_by_date,
+    project_fields,
+    pulls_created_between,
+    timestamp_bounds,
+)
+
+class AsyncGitHubClient:
+    """
+    Asyncio counterpart of GitHubClient with the same method surface.
+
+    Requests go through a single httpx.AsyncClient with a shared connection
+    pool and HTTP/2 multiplexing, so hundreds of requests can be in flight
+    on one thread. `max_concurrency` bounds the number of concurrent requests.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = "https://api.github.com",
+        per_page: int = 100,
+        max_concurrency: int = 32,
+        http2: bool = True,
+        logger: Optional[logging.Logger] = None,
+        metrics: Optional[Any] = None,
+        checkpoint: Optional[Any] = None,
+        event_sink: Optional[Any] = None,
+        budget: Optional[Any] = None,
+        exclusions: Optional[Any] = None,
+        review_cache: Optional[Any] = None,
+        identities: Optional[Any] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.per_page = per_page
+        self.client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"token {token}",
+                "Accept": "application/vnd.github+json",
+                "User-Agent": "github-champion-scraper",
+            },
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            timeout=30,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.log = logger or logging.getLogger("github_champion.async_github_client")
+        self.metrics = metrics
+        self.checkpoint = checkpoint
+        self.event_sink = event_sink
+        self.budget = budget
+        self.exclusions = exclusions
+        self.review_cache = review_cache
+        self.identities = identities
+        # "owner/repo" of repositories with an endpoint that failed to fetch
+        self.incomplete: Set[str] = set()
+        # "owner/repo" of repositories with commit emails whose lookup failed
+        # or was cut off, so a later run could credit more commits
+        self.unresolved: Set[str] = set()
+        # Email lookups in flight or done, shared by concurrent repositories
+        self._email_lookups: Dict[str, "asyncio.Future[None]"] = {}
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[FieldTree] = None,
+        stop_before: Optional[Tuple[str, str]] = None,
+    ) -> List[Dict]:
+        url = f"{self.base_url}{path}"
+        endpoint = endpoint_label(path)
+        results: List[Dict[str, Any]] = []
+        page = 1
+
+        cursor_key: Optional[str] = None
+        # Set when resuming: the listing is read again from the top, since it
+        # may have changed since its pages were saved (see ResumedListing)
+        listing: Optional[Any] = None
+        if self.checkpoint is not None:
+            cursor_key = self.checkpoint.cursor_key(url, params, self.per_page, stop_before)
+            listing = self.checkpoint.resume_listing(cursor_key)
+            if listing is not None:
+                self.log.debug("Resuming %s at page %d", url, listing.next_page)
+
+        while True:
+            merged_params = {"per_page": self.per_page, "page": page}
+            if params:
+                merged_params.update(params)
+
+            self.log.debug("GET %s params=%s", url, merged_params)
+            # Hold a slot per request rather than per endpoint so long
+            # paginations do not starve other in-flight work.
+            async with self._semaphore:
+                if self.budget is not None and not self.budget.try_spend():
+                    raise BudgetExhausted(self.budget.reason or "request budget spent")
+                started = time.perf_counter()
+                try:
+                    resp = await self.client.get(url, params=merged_params)
+                except httpx.TransportError as e:
+                    # Timeouts and dropped connections fail this endpoint
+                    # like an error status, not the whole gather
+                    raise RuntimeError(f"Request to {url} failed: {e!r}") from e
+            if self.budget is not None:
+                self.budget.observe_rate_limit(resp.headers)
+            if self.metrics is not None:
+                self.metrics.observe_request(
+                    endpoint, resp.status_code, time.perf_counter() - started
+                )
+                self.metrics.observe_rate_limit(resp.headers)
+            if resp.status_code == 401:
+                raise RuntimeError("Unauthorized: invalid GitHub token")
+            if resp.status_code == 403:
+                raise RuntimeError(
+                    "Forbidden: you may have hit a rate limit or lack permissions"
+                )
+            if resp.status_code == 404:
+                raise RuntimeError(f"Resource not found at {url}")
+            if resp.status_code >= 400:
+                raise RuntimeError(f"HTTP {resp.status_code} from {url}")
+            data = decode_json(resp)
+            if not isinstance(data, list):
+                return data  # type: ignore[return-value]
+            if fields is not None:
+                data = [project_fields(item, fields) for item in data]
+
+            if self.metrics is not None:
+                self.metrics.add_items(endpoint, len(data))
+            done = len(data) < self.per_page
+            if stop_before is not None and not done:
+                # Sorted descending by `key`: nothing older than `bound` is needed.
+                key, bound = stop_before
+                done = (data[-1].get(key) or "") < bound
+            if listing is not None and page < listing.next_page:
+                caught_up = listing.add_head(data)
+                if done:
+                    break
+                # Skip the pages that were saved once they are reached
+                page = listing.next_page if caught_up else page + 1
+                continue
+            if listing is not None:
+                data = listing.add(data)
+            results.extend(data)
+            if done:
+                break
+            if cursor_key is not None:
+                self.checkpoint.save_cursor_page(cursor_key, data)
+            page += 1
+
+        if cursor_key is not None:
+            self.checkpoint.clear_cursor(cursor_key)
+        return listing.merged(results) if listing is not None else results
+
+    async def list_org_repositories(self, org: str) -> List[Dict[str, Any]]:
+        """
+        Fetch listing metadata for the organization's non-archived repositories.
+        """
+        repos = await self._get(f"/orgs/{org}/repos", fields=REPO_FIELDS)
+        return [r for r in repos if not r.get("archived", False)]
+
+    async def get_org_repos(self, org: str) -> List[str]:
+        """
+        Fetch repository names for an organization.
+        """
+        repo_names = [r["name"] for r in await self.list_org_repositories(org)]
+        self.log.info("Fetched %d repositories for org %s", len(repo_names), org)
+        return repo_names
+
+    async def get_closed_issues(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+        until: datetime,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get closed issues (excluding PRs) in the time range.
+        """
+        issues = await self._get(
+            f"/repos/{owner}/{repo}/issues", params={"state": "closed"}, fields=ISSUE_FIELDS
+        )
+        issues = [i for i in issues if "pull_request" not in i]
+        issues = filter_items_by_date(issues, since=since, until=until, date_key="closed_at")
+        return self._exclude("issues", issues)
+
+    async def get_pulls(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+        until: datetime,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get pull requests in the time range.
+        """
+        pulls = await self._get(
+            f"/repos/{owner}/{repo}/pulls",
+            params={"state": "all", "sort": "created", "direction": "desc"},
+            fields=PULL_FIELDS,
+            stop_before=("created_at", timestamp_bounds(since, until)[0]),
+        )
+        pulls = filter_items_by_date(pulls, since=since, until=until, date_key="created_at")
+        return self._exclude("pulls", pulls)
+
+    async def get_pulls_updated_since(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+        until: datetime,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get pull requests created by `until` and updated at or after `since`,
+        most recently updated first.
+        """
+        lower, upper = timestamp_bounds(since, until)
+        pulls = await self._get(
+            f"/repos/{owner}/{repo}/pulls",
+            params={"state": "all", "sort": "updated", "direction": "desc"},
+            fields=PULL_FIELDS,
+            stop_before=("updated_at", lower),
+        )
+        # A pull created after the window cannot have been reviewed in it
+        pulls = [
+            p
+            for p in pulls
+            if (p.get("updated_at") or "") >= lower and (p.get("created_at") or "") <= upper
+        ]
+        return self._exclude("pulls", pulls)
+
+    async def get_pull_reviews(
+        self,
+        owner: str,
+        repo: str,
+        pull_number: int,
+        since: datetime,
+        until: datetime,
+        updated_at: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get reviews for a specific pull request in the time range, from the
+        review cache when the pull's `updated_at` is unchanged.
+        """
+        cache = self.review_cache if updated_at else None
+        reviews = cache.get(owner, repo, pull_number, updated_at) if cache is not None else None
+        if reviews is None:
+            reviews = await self._get(
+                f"/repos/{owner}/{repo}/pulls/{pull_number}/reviews", fields=REVIEW_FIELDS
+            )
+            if cache is not None:
+                cache.put(owner, repo, pull_number, updated_at, reviews)
+        reviews = filter_items_by_date(reviews, since=since, until=until, date_key="submitted_at")
+        return self._exclude("reviews", reviews)
+
+    async def get_commits(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+        until: datetime,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get commits in the time range.
+        """
+        commits = await self._get(
+            f"/repos/{owner}/{repo}/commits",
+            params={"since": since.isoformat(), "until": until.isoformat()},
+            fields=COMMIT_FIELDS,
+        )
+        await self._attribute_commits(owner, repo, commits)
+        return self._exclude("commits", commits)
+
+    async def search_user_by_email(self, email: str) -> Optional[str]:
+        """
+        Login of the account that lists `email` as its public email, if any.
+        """
+        data = await self._get("/search/users", params={"q": f"{email} in:email", "per_page": 1})
+        items = data.get("items") or []  # type: ignore[union-attr]
+        return items[0].get("login") if items else None
+
+    async def _lookup_email(self, email: str) -> None:
+        try:
+            login = await self.search_user_by_email(email)
+        except BudgetExhausted:
+            raise
+        except RuntimeError as e:
+            if not self.identities.stopped:
+                self.log.warning("Stopping email lookups for this run: %s", e)
+            self.identities.stop()
+            self.identities.skip(email)
+            return
+        self.identities.record(email, login)
+
+    async def _attribute_commits(
+        self, owner: str, repo: str, commits: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Credit commits whose email is not linked to an account. Each unknown
+        email is looked up once per run, concurrently with the others. A
+        repository left with commits whose lookup failed or was cut off
+        counts as unresolved.
+        """
+        if self.identities is None:
+            return
+        for email in self.identities.pending_emails(commits):
+            self._email_lookups[email] = asyncio.ensure_future(self._lookup_email(email))
+        waiting = [
+            self._email_lookups[email]
+            for email in self.identities.unlinked_emails(commits)
+            if email in self._email_lookups
+        ]
+        if waiting:
+            await asyncio.gather(*waiting)
+        self.identities.attribute_commits(commits)
+        if self.identities.unsettled(commits):
+            self.unresolved.add(f"{owner}/{repo}")
+
+    def _exclude(self, endpoint: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.exclusions is None:
+            return items
+        return self.exclusions.filter(endpoint, items)
+
+    async def _safe(
+        self, coro: Awaitable[List[Dict[str, Any]]], what: str, slug: str
+    ) -> List[Dict[str, Any]]:
+        try:
+            return await coro
+        except BudgetExhausted:
+            raise
+        except RuntimeError as e:
+            self.log.error("Failed to fetch %s: %s", what, e)
+            self.incomplete.add(slug)
+            return []
+
+    async def _nothing(self) -> List[Dict[str, Any]]:
+        return []
+
+    async def collect_repository_contributions(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+        until: datetime,
+        endpoints: Optional[Iterable[str]] = None,
+        created_between: Optional[Tuple[datetime, datetime]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate contribution metrics for a single repository.
+
+        Issues, pulls and commits are fetched concurrently, then the reviews
+        of every pull updated in the window are fetched concurrently.
+        `endpoints` and `created_between` behave as in GitHubClient.
+        """
+        self.log.info(
+            "Collecting contributions for %s/%s from %s to %s",
+            owner,
+            repo,
+            since.isoformat(),
+            until.isoformat(),
+        )
+        slug = f"{owner}/{repo}"
+        wanted = set(endpoints or ALL_ENDPOINTS)
+        item_since, item_until = created_between or (since, until)
+        issues, pulls, commits = await asyncio.gather(
+            self._safe(self.get_closed_issues(owner, repo, since, until), f"issues for {slug}", slug)
+            if "issues" in wanted
+            else self._nothing(),
+            self._safe(
+                self.get_pulls_updated_since(owner, repo, since, until), f"pulls for {slug}", slug
+            )
+            if "reviews" in wanted
+            else self._safe(
+                self.get_pulls(owner, repo, item_since, item_until), f"pulls for {slug}", slug
+            )
+            if "pulls" in wanted
+            else self._nothing(),
+            self._safe(
+                self.get_commits(owner, repo, item_since, item_until), f"commits for {slug}", slug
+            )
+            if "commits" in wanted
+            else self._nothing(),
+        )
+
+        reviewable: List[Dict[str, Any]] = []
+        if "reviews" in wanted:
+            reviewable = [
+                p
+                for p in pulls
+                if (p.get("user") or {}).get("login") and p.get("number") is not None
+            ]
+            pulls = pulls_created_between(pulls, item_since, item_until)
+        review_lists = await asyncio.gather(
+            *(
+                self._safe(
+                    self.get_pull_reviews(
+                        owner, repo, p["number"], since, until, updated_at=p.get("updated_at")
+                    ),
+                    f"reviews for PR #{p['number']} in {slug}",
+                    slug,
+                )
+                for p in reviewable
+            )
+        )
+
+        tally = ContributionTally(
+            owner, repo, event_sink=self.event_sink, identities=self.identities
+        )
+        tally.add_closed_issues(issues)
+        if "pulls" in wanted:
+            tally.add_pulls(pulls)
+        for reviews in review_lists:
+            tally.add_reviews(reviews)
+        tally.add_commits(commits)
+
+        self.log.info(
+            "Collected metrics for %d contributors in %s",
+            len(tally.contributors),
+            slug,
+        )
+        return tally.contributors
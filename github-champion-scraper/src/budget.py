@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Endpoint groups in the order a budgeted run collects them: closed issues and
+# PR listings are cheap and carry most of the score, per-PR reviews cost one
+# request per pull, and commits only feed the secondary line-count metrics.
+PRIORITY_PASSES: Tuple[Tuple[str, ...], ...] = (
+    ("issues", "pulls"),
+    ("reviews",),
+    ("commits",),
+)
+
+# Endpoint each reported metric is derived from
+METRIC_ENDPOINTS: Dict[str, str] = {
+    "issuesClosed": "issues",
+    "pullsCreated": "pulls",
+    "pullReviews": "reviews",
+    "commits": "commits",
+    "additions": "commits",
+    "deletions": "commits",
+}
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)([smh]?)$")
+_UNIT_SECONDS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+def parse_deadline(raw: str, now: Optional[datetime] = None) -> float:
+    """
+    Seconds from now until `raw`, which is either a duration ("90s", "20m",
+    "1.5h", plain seconds) or an ISO-8601 timestamp.
+    """
+    match = _DURATION.match(raw.strip())
+    if match:
+        return float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    try:
+        target = datetime.fromisoformat(raw.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid deadline {raw!r}; use e.g. 20m, 1h or an ISO timestamp") from None
+    if target.tzinfo is None:
+        target = target.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return (target - now).total_seconds()
+
+class RequestBudget:
+    """
+    Caps the number of API requests and the wall-clock time of a run.
+
+    Clients call `try_spend()` before every request; once the request budget,
+    the deadline or GitHub's own remaining quota is used up it refuses, the
+    client raises BudgetExhausted and the run stops cleanly instead of
+    failing on a 403.
+    """
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        deadline_seconds: Optional[float] = None,
+        quota_reserve: int = 0,
+    ) -> None:
+        self.max_requests = max_requests
+        self.deadline_seconds = deadline_seconds
+        self.quota_reserve = quota_reserve
+        self.used = 0
+        self.quota_remaining: Optional[int] = None
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """
+        Requests left under the explicit budget and the observed quota.
+        """
+        limits: List[int] = []
+        if self.max_requests is not None:
+            limits.append(self.max_requests - self.used)
+        if self.quota_remaining is not None:
+            limits.append(self.quota_remaining - self.quota_reserve)
+        return max(min(limits), 0) if limits else None
+
+    @property
+    def reason(self) -> Optional[str]:
+        """
+        Why no more requests may be sent, or None while budget is left.
+        """
+        if (
+            self.deadline_seconds is not None
+            and time.monotonic() - self._started >= self.deadline_seconds
+        ):
+            return "deadline reached"
+        if self.max_requests is not None and self.used >= self.max_requests:
+            return f"request budget of {self.max_requests} spent"
+        if self.quota_remaining is not None and self.quota_remaining <= self.quota_reserve:
+            return "GitHub rate-limit quota exhausted"
+        return None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.reason is not None
+
+    def try_spend(self) -> bool:
+        """
+        Account for one request, or return False if it may not be sent.
+        """
+        with self._lock:
+            if self.reason is not None:
+                return False
+            self.used += 1
+            if self.quota_remaining is not None:
+                self.quota_remaining -= 1
+            return True
+
+    def observe_rate_limit(self, headers: Mapping[str, str]) -> None:
+        """
+        Track the core quota from a response's headers. Search and other
+        resources have their own, much smaller quotas and are ignored.
+        """
+        if headers.get("X-RateLimit-Resource", "core") != "core":
+            return
+        raw = headers.get("X-RateLimit-Remaining")
+        if raw is None:
+            return
+        try:
+            remaining = int(raw)
+        except ValueError:
+            return
+        with self._lock:
+            self.quota_remaining = remaining
+
+def completeness_report(
+    repos: Iterable[str],
+    covered: Mapping[str, Iterable[str]],
+    budget: RequestBudget,
+) -> Dict[str, Any]:
+    """
+    Describe which metrics a budgeted run collected for every repository.
+
+    `covered` maps an endpoint group to the repositories it was fully
+    collected for. Metrics are "complete", "partial" or "missing".
+    """
+    repos = list(repos)
+    covered_sets = {endpoint: set(names) for endpoint, names in covered.items()}
+    metrics: Dict[str, str] = {}
+    pending: Dict[str, List[str]] = {}
+    for metric, endpoint in METRIC_ENDPOINTS.items():
+        done = covered_sets.get(endpoint, set())
+        missing = [r for r in repos if r not in done]
+        if not missing:
+            metrics[metric] = "complete"
+        else:
+            metrics[metric] = "missing" if len(missing) == len(repos) else "partial"
+            pending[endpoint] = missing
+    report: Dict[str, Any] = {
+        "status": "partial" if pending else "complete",
+        "metrics": metrics,
+        "requestsUsed": budget.used,
+    }
+    if budget.max_requests is not None:
+        report["requestBudget"] = budget.max_requests
+    if budget.deadline_seconds is not None:
+        report["deadlineSeconds"] = budget.deadline_seconds
+    if pending:
+        report["pendingRepositories"] = pending
+    return report
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+
+MANIFEST_NAME = "manifest.json"
+
+def _write_json_atomic(data: Any, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+def item_key(item: Dict[str, Any]) -> Any:
+    """
+    Identity of a listing item: its sha, number, id or name, else its content.
+    """
+    for field in ("sha", "number", "id", "name"):
+        if item.get(field) is not None:
+            return field, item[field]
+    return json.dumps(item, sort_keys=True)
+
+class ResumedListing:
+    """
+    Merges a paginated listing fetched again after a resume with the pages
+    saved before the interruption.
+
+    The listing may have changed in between: new items, and for listings
+    sorted by update time updated ones, land at the top and push the saved
+    items down. The top is read again page by page (`add_head`) until an
+    item shows up unchanged from its saved copy; everything above it is new
+    or replaces its saved copy. Pages from `next_page` on (`add`) drop the
+    items already seen.
+    """
+
+    def __init__(self, next_page: int, saved: List[Dict[str, Any]]) -> None:
+        self.next_page = next_page
+        self._saved = {item_key(item): item for item in saved}
+        self._head: List[Dict[str, Any]] = []
+        self._head_keys: Set[Any] = set()
+        self._seen: Set[Any] = set(self._saved)
+
+    def add_head(self, page_items: List[Dict[str, Any]]) -> bool:
+        """
+        Take one page from the top; True once the saved items are reached.
+        """
+        for item in page_items:
+            key = item_key(item)
+            if self._saved.get(key) == item:
+                return True
+            if key in self._head_keys:
+                continue
+            self._saved.pop(key, None)
+            self._head.append(item)
+            self._head_keys.add(key)
+            self._seen.add(key)
+        return False
+
+    def add(self, page_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Items of a page past the saved ones that were not seen yet.
+        """
+        fresh: List[Dict[str, Any]] = []
+        for item in page_items:
+            key = item_key(item)
+            if key not in self._seen:
+                self._seen.add(key)
+                fresh.append(item)
+        return fresh
+
+    def merged(self, tail: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self._head + list(self._saved.values()) + tail
+
+class RunCheckpoint:
+    """
+    On-disk checkpoint of a collection run.
+
+    Layout under `directory`:
+        manifest.json       organization and time window of the run
+        repos/<repo>.json   metrics of each fully collected repository
+        cursors/<key>.jsonl one line per fetched page of an in-progress endpoint
+
+    A resumed run skips completed repositories and continues paginated
+    endpoints from the last saved page, so a failure costs at most one
+    repository's worth of re-fetching.
+    """
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]) -> None:
+        self.directory = directory
+        self.manifest = manifest
+        self.repos_dir = directory / "repos"
+        self.cursors_dir = directory / "cursors"
+
+    @classmethod
+    def start(
+        cls,
+        directory: Path,
+        organization: str,
+        since: datetime,
+        until: datetime,
+    ) -> "RunCheckpoint":
+        """
+        Begin a fresh checkpoint, discarding any previous one in `directory`.
+        """
+        if directory.exists():
+            shutil.rmtree(directory)
+        manifest = {
+            "organization": organization,
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+        }
+        _write_json_atomic(manifest, directory / MANIFEST_NAME)
+        return cls(directory, manifest)
+
+    @classmethod
+    def resume(cls, directory: Path, organization: str) -> Optional["RunCheckpoint"]:
+        """
+        Reopen the checkpoint in `directory`, or return None if there is none.
+        """
+        manifest_path = directory / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        with manifest_path.open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("organization") != organization:
+            raise RuntimeError(
+                f"Checkpoint in {directory} belongs to organization "
+                f"{manifest.get('organization')!r}, not {organization!r}."
+            )
+        return cls(directory, manifest)
+
+    @property
+    def since(self) -> datetime:
+        return datetime.fromisoformat(self.manifest["since"])
+
+    @property
+    def until(self) -> datetime:
+        return datetime.fromisoformat(self.manifest["until"])
+
+    def _repo_path(self, repo: str) -> Path:
+        return self.repos_dir / f"{quote(repo, safe='')}.json"
+
+    def completed_repos(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Metrics of every repository already collected by this run.
+        """
+        completed: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if not self.repos_dir.exists():
+            return completed
+        for path in self.repos_dir.glob("*.json"):
+            with path.open("r", encoding="utf-8") as f:
+                completed[unquote(path.stem)] = json.load(f)
+        return completed
+
+    def save_repo(self, repo: str, metrics: Dict[str, Dict[str, Any]]) -> None:
+        _write_json_atomic(metrics, self._repo_path(repo))
+
+    @staticmethod
+    def cursor_key(
+        url: str,
+        params: Optional[Dict[str, Any]],
+        per_page: int,
+        stop_before: Optional[Tuple[str, str]] = None,
+    ) -> str:
+        # Date slices of one repository page through the same listing with
+        # different stop bounds and may run concurrently; keep them apart
+        payload = json.dumps(
+            [url, sorted((params or {}).items()), per_page, stop_before], default=str
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def load_cursor(self, key: str) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Return (next page, items fetched so far) for an in-progress endpoint.
+        """
+        path = self.cursors_dir / f"{key}.jsonl"
+        if not path.exists():
+            return None
+        pages = 0
+        valid_bytes = 0
+        results: List[Dict[str, Any]] = []
+        with path.open("rb") as f:
+            for line in f:
+                try:
+                    page_items = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                results.extend(page_items)
+                pages += 1
+                valid_bytes += len(line)
+        if path.stat().st_size != valid_bytes:
+            # Drop a page torn by a crash so later appends stay readable.
+            with path.open("r+b") as f:
+                f.truncate(valid_bytes)
+        if not pages:
+            return None
+        return pages + 1, results
+
+    def resume_listing(self, key: str) -> Optional[ResumedListing]:
+        """
+        The saved pages of an in-progress endpoint, ready to be merged with
+        the listing as it is now, or None when nothing was saved.
+        """
+        resumed = self.load_cursor(key)
+        return ResumedListing(*resumed) if resumed is not None else None
+
+    def save_cursor_page(self, key: str, page_items: List[Dict[str, Any]]) -> None:
+        """
+        Append one fetched page to an endpoint's cursor.
+        """
+        self.cursors_dir.mkdir(parents=True, exist_ok=True)
+        with (self.cursors_dir / f"{key}.jsonl").open("a", encoding="utf-8") as f:
+            f.write(json.dumps(page_items) + "\n")
+
+    def clear_cursor(self, key: str) -> None:
+        path = self.cursors_dir / f"{key}.jsonl"
+        if path.exists():
+            path.unlink()
+
+    def discard(self) -> None:
+        """
+        Remove the checkpoint once the run has completed successfully.
+        """
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ARCHIVE_VERSION = 2
+# Version 1 archives have no `ref` column and are read without deduplication
+_READABLE_VERSIONS = (1, 2)
+
+EVENT_KINDS = ("issue_closed", "pull_created", "pull_review", "commit")
+_KIND_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+
+# (column name, array typecode); one fixed-width file per column
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("kind", "B"),
+    ("timestamp", "q"),
+    ("login", "I"),
+    ("owner", "I"),
+    ("repo", "I"),
+    ("additions", "I"),
+    ("deletions", "I"),
+    # Hash of the event's identity (issue/pull number, review id, commit sha);
+    # 0 for rows from archives written before refs were stored
+    ("ref", "q"),
+)
+
+# Metric key incremented by each event kind
+_KIND_METRIC = {
+    0: "issuesClosed",
+    1: "pullsCreated",
+    2: "pullReviews",
+    3: "commits",
+}
+
+def _write_json_atomic(data: Any, path: Path) -> None:
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; readers may run as another user
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+def _epoch_seconds(timestamp: str) -> int:
+    return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+
+def _ref_hash(ref: str) -> int:
+    # 56 bits keeps it positive in a signed 64-bit column and nonzero in practice
+    return int.from_bytes(hashlib.blake2b(ref.encode("utf-8"), digest_size=7).digest(), "big") or 1
+
+class EventArchiveWriter:
+    """
+    Appends raw contribution events (one row per closed issue, PR, review and
+    commit) to a columnar archive directory.
+
+    Events are buffered per repository and only appended when the repository
+    is committed, so an archive never contains half of a repository. The row
+    count in `archive.json` is updated last; readers ignore any rows past it.
+    Events already in the archive are kept unless `append` is False; each
+    event carries a ref, so one collected again by a later run is counted
+    once when the archive is read.
+    """
+
+    def __init__(self, directory: Path, append: bool = True) -> None:
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        self._meta_path = directory / "archive.json"
+        self._strings: Dict[str, List[str]] = {"login": [], "owner": [], "repo": []}
+        self._rows = 0
+        if append and self._meta_path.exists():
+            with self._meta_path.open("r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self._strings = meta["strings"]
+            self._rows = int(meta["rows"])
+        self._index = {
+            column: {value: i for i, value in enumerate(values)}
+            for column, values in self._strings.items()
+        }
+        # Drop rows from a torn commit (or everything, when not appending);
+        # a column missing from an older archive is zero-filled
+        for name, code in COLUMNS:
+            path = directory / f"{name}.col"
+            with path.open("ab") as f:
+                f.truncate(self._rows * array(code).itemsize)
+        self._buffers: Dict[Tuple[str, str], List[Tuple[int, ...]]] = {}
+        self._write_meta()
+
+    def _intern(self, column: str, value: str) -> int:
+        index = self._index[column]
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(self._strings[column])
+            self._strings[column].append(value)
+        return code
+
+    def record(
+        self,
+        owner: str,
+        repo: str,
+        kind: str,
+        login: str,
+        timestamp: Optional[str],
+        additions: int = 0,
+        deletions: int = 0,
+        ref: Optional[str] = None,
+    ) -> None:
+        """
+        Buffer one event. `ref` identifies it within the repository (issue
+        or pull number, review id, commit sha); without one, the login and
+        timestamp stand in.
+        """
+        if not timestamp:
+            return
+        try:
+            ts = _epoch_seconds(timestamp)
+        except ValueError:
+            return
+        row = (
+            _KIND_CODES[kind],
+            ts,
+            self._intern("login", login),
+            self._intern("owner", owner),
+            self._intern("repo", repo),
+            additions,
+            deletions,
+            _ref_hash(f"{kind}:{ref if ref else f'{login}@{timestamp}'}"),
+        )
+        self._buffers.setdefault((owner, repo), []).append(row)
+
+    def discard_repo(self, owner: str, repo: str) -> None:
+        self._buffers.pop((owner, repo), None)
+
+    def commit_repo(self, owner: str, repo: str) -> None:
+        """
+        Append the buffered events of one repository to the archive.
+        """
+        rows = self._buffers.pop((owner, repo), [])
+        if not rows:
+            return
+        for position, (name, code) in enumerate(COLUMNS):
+            values = array(code, (row[position] for row in rows))
+            with (self.directory / f"{name}.col").open("ab") as f:
+                values.tofile(f)
+        self._rows += len(rows)
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        _write_json_atomic(
+            {
+                "version": ARCHIVE_VERSION,
+                "byteorder": sys.byteorder,
+                "columns": [name for name, _ in COLUMNS],
+                "rows": self._rows,
+                "strings": self._strings,
+            },
+            self._meta_path,
+        )
+
+class EventArchive:
+    """
+    Read-only, memory-mapped view of an archive written by EventArchiveWriter.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        meta_path = directory / "archive.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No event archive found in {directory}")
+        with meta_path.open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") not in _READABLE_VERSIONS:
+            raise RuntimeError(f"Unsupported event archive version: {meta.get('version')}")
+        if meta.get("byteorder") != sys.byteorder:
+            raise RuntimeError("Event archive was written on a host with different byte order")
+        self.directory = directory
+        self.rows = int(meta["rows"])
+        self.strings: Dict[str, List[str]] = meta["strings"]
+        self._maps: List[mmap.mmap] = []
+        self.columns: Dict[str, Any] = {}
+        stored = set(meta.get("columns") or [])
+        for name, code in COLUMNS:
+            if name in stored:
+                self.columns[name] = self._map_column(directory / f"{name}.col", code)
+
+    def _map_column(self, path: Path, code: str) -> Any:
+        if self.rows == 0:
+            return array(code)
+        with path.open("rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped)[: self.rows * array(code).itemsize].cast(code)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self) -> None:
+        for column in self.columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self.columns.clear()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps.clear()
+
+    def to_repo_metrics(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Rebuild per-repository contributor metrics for events in [since, until].
+
+        Repositories are keyed by name, or by "owner/name" when the archive
+        spans more than one organization. An event archived by several runs
+        counts once, as recorded by the latest of them.
+        """
+        lower = int(since.astimezone(timezone.utc).timestamp()) if since else None
+        upper = int(until.astimezone(timezone.utc).timestamp()) if until else None
+        qualify = len(self.strings["owner"]) > 1
+
+        cols = self.columns
+        kinds, stamps = cols["kind"], cols["timestamp"]
+        logins, owners, repos = cols["login"], cols["owner"], cols["repo"]
+        additions, deletions = cols["additions"], cols["deletions"]
+        login_names = self.strings["login"]
+        owner_names = self.strings["owner"]
+        repo_names = self.strings["repo"]
+
+        refs = cols.get("ref")
+        latest: Dict[Tuple[int, int, int], int] = {}
+        if refs is not None:
+            for i in range(self.rows):
+                if refs[i]:
+                    latest[(owners[i], repos[i], refs[i])] = i
+
+        per_repo: Dict[Any, Dict[str, Dict[str, Any]]] = {}
+        for i in range(self.rows):
+            if refs is not None and refs[i] and latest[(owners[i], repos[i], refs[i])] != i:
+                continue
+            ts = stamps[i]
+            if lower is not None and ts < lower:
+                continue
+            if upper is not None and ts > upper:
+                continue
+            key = (owners[i], repos[i])
+            contributors = per_repo.get(key)
+            if contributors is None:
+                contributors = per_repo[key] = {}
+            login = login_names[logins[i]]
+            data = contributors.get(login)
+            if data is None:
+                data = contributors[login] = {
+                    "issuesClosed": 0,
+                    "pullReviews": 0,
+                    "pullsCreated": 0,
+                    "additions": 0,
+                    "deletions": 0,
+                    "commits": 0,
+                }
+            kind = kinds[i]
+            data[_KIND_METRIC[kind]] += 1
+            if kind == 3:
+                data["additions"] += additions[i]
+                data["deletions"] += deletions[i]
+
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (owner_id, repo_id), contributors in per_repo.items():
+            name = repo_names[repo_id]
+            if qualify:
+                name = f"{owner_names[owner_id]}/{name}"
+            result[name] = contributors
+        return result
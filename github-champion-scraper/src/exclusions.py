@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional
+
+# Where each endpoint's items name the contributor they are credited to
+ACTOR_KEYS: Dict[str, str] = {
+    "issues": "assignee",
+    "pulls": "user",
+    "reviews": "user",
+    "commits": "author",
+}
+
+class ExclusionRules:
+    """
+    Rules for data that should never be collected or counted: contributors
+    matching login globs or with a bot account type, draft pull requests,
+    issues and pull requests carrying certain labels, and repositories
+    matching name globs.
+
+    Clients apply `filter()` to every listing before acting on it, so an
+    excluded pull request never costs a review request, and main drops
+    excluded repositories before they are crawled.
+    """
+
+    def __init__(
+        self,
+        logins: Iterable[str] = (),
+        bots: bool = False,
+        drafts: bool = False,
+        labels: Iterable[str] = (),
+        repos: Iterable[str] = (),
+    ) -> None:
+        self.logins = [p.lower() for p in logins]
+        self.bots = bots
+        self.drafts = drafts
+        self.labels = {label.lower() for label in labels}
+        self.repos = list(repos)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["ExclusionRules"]:
+        """
+        Build rules from the `exclude` settings section, or None when it
+        excludes nothing.
+        """
+        section = settings.get("exclude") or {}
+        rules = cls(
+            logins=section.get("logins") or [],
+            bots=bool(section.get("bots", False)),
+            drafts=bool(section.get("drafts", False)),
+            labels=section.get("labels") or [],
+            repos=section.get("repos") or [],
+        )
+        return rules if rules else None
+
+    def __bool__(self) -> bool:
+        return bool(self.logins or self.bots or self.drafts or self.labels or self.repos)
+
+    def skip_repo(self, repo: str) -> bool:
+        # Multi-org keys are "org/repo"; globs may target either form
+        short = repo.rsplit("/", 1)[-1]
+        return any(fnmatchcase(repo, p) or fnmatchcase(short, p) for p in self.repos)
+
+    def skip_actor(self, actor: Optional[Dict[str, Any]]) -> bool:
+        if not actor:
+            return False
+        login = (actor.get("login") or "").lower()
+        if self.bots and (actor.get("type") == "Bot" or login.endswith("[bot]")):
+            return True
+        return any(fnmatchcase(login, p) for p in self.logins)
+
+    def skip_item(self, endpoint: str, item: Dict[str, Any]) -> bool:
+        if self.skip_actor(item.get(ACTOR_KEYS[endpoint])):
+            return True
+        if endpoint == "pulls" and self.drafts and item.get("draft"):
+            return True
+        if self.labels and endpoint in ("issues", "pulls"):
+            for label in item.get("labels") or []:
+                if (label.get("name") or "").lower() in self.labels:
+                    return True
+        return False
+
+    def filter(self, endpoint: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop the items of one endpoint ("issues", "pulls", "reviews" or
+        "commits") that the rules exclude.
+        """
+        return [item for item in items if not self.skip_item(endpoint, item)]
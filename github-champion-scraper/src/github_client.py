@@ -1,11 +1,270 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 
 import requests
 
+try:  # Optional faster JSON decoder
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None  # type: ignore[assignment]
+
+GITHUB_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Endpoint groups collect_repository_contributions can be restricted to
+ALL_ENDPOINTS: Tuple[str, ...] = ("issues", "pulls", "reviews", "commits")
+
+FieldTree = Dict[str, Any]
+
+class BudgetExhausted(RuntimeError):
+    """
+    Raised instead of sending a request once the run's RequestBudget is spent.
+    """
+
+def field_tree(*paths: str) -> FieldTree:
+    """
+    Compile dotted field paths ("user.login") into a nested projection tree.
+    """
+    tree: FieldTree = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+        node.setdefault(parts[-1], None)
+    return tree
+
+def project_fields(item: Dict[str, Any], tree: FieldTree) -> Dict[str, Any]:
+    """
+    Copy only the fields named in `tree` out of a decoded API item, so the
+    rest of the payload (bodies, full user objects, URLs) can be released.
+    """
+    out: Dict[str, Any] = {}
+    for key, sub in tree.items():
+        if key not in item:
+            continue
+        value = item[key]
+        if sub is not None and isinstance(value, dict):
+            value = project_fields(value, sub)
+        elif sub is not None and isinstance(value, list):
+            value = [project_fields(v, sub) if isinstance(v, dict) else v for v in value]
+        out[key] = value
+    return out
+
+# Fields each endpoint actually needs downstream.
+REPO_FIELDS = field_tree(
+    "name", "archived", "size", "open_issues_count", "pushed_at", "updated_at"
+)
+ISSUE_FIELDS = field_tree(
+    "number", "closed_at", "assignee.login", "assignee.type", "labels.name", "pull_request"
+)
+PULL_FIELDS = field_tree(
+    "number", "created_at", "updated_at", "user.login", "user.type", "draft", "labels.name"
+)
+REVIEW_FIELDS = field_tree("id", "submitted_at", "user.login", "user.type")
+COMMIT_FIELDS = field_tree(
+    "sha", "author.login", "author.type", "stats", "commit.author.date", "commit.author.email"
+)
+
+def decode_json(resp: Any) -> Any:
+    """
+    Decode a response body, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+def timestamp_bounds(since: datetime, until: datetime) -> Tuple[str, str]:
+    """
+    Render [since, until] as GitHub-style `...Z` strings that can be compared
+    lexicographically with API timestamps (which have whole-second precision).
+    """
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    since = since.astimezone(timezone.utc)
+    until = until.astimezone(timezone.utc)
+    if since.microsecond:
+        # Round up so that "ts >= lower" keeps the same meaning at second precision
+        since = since.replace(microsecond=0) + timedelta(seconds=1)
+    return since.strftime(GITHUB_TIMESTAMP_FORMAT), until.strftime(GITHUB_TIMESTAMP_FORMAT)
+
+def filter_items_by_date(
+    items: List[Dict[str, Any]],
+    since: datetime,
+    until: datetime,
+    date_key: str = "created_at",
+) -> List[Dict[str, Any]]:
+    """
+    Keep items whose `date_key` timestamp falls within [since, until].
+
+    Canonical `YYYY-MM-DDTHH:MM:SSZ` timestamps are compared as strings
+    against precomputed bounds; anything else falls back to full parsing.
+    """
+    lower, upper = timestamp_bounds(since, until)
+    filtered: List[Dict[str, Any]] = []
+    for item in items:
+        date_str = item.get(date_key)
+        if not date_str:
+            continue
+        if len(date_str) == 20 and date_str[19] == "Z" and date_str[10] == "T":
+            if lower <= date_str <= upper:
+                filtered.append(item)
+            continue
+        try:
+            dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if since <= dt <= until:
+            filtered.append(item)
+    return filtered
+
+def pulls_created_between(
+    pulls: List[Dict[str, Any]], since: datetime, until: datetime
+) -> List[Dict[str, Any]]:
+    """
+    Pulls created in [since, until], newest first as the created listing returns them.
+    """
+    created = filter_items_by_date(pulls, since=since, until=until, date_key="created_at")
+    created.sort(key=lambda p: p.get("created_at") or "", reverse=True)
+    return created
+
+def endpoint_label(path: str) -> str:
+    """
+    Metric label for an API path: its last segment ("pulls", "reviews"),
+    prefixed for search routes so /search/issues is not counted as issues.
+    """
+    parts = path.strip("/").split("/")
+    if parts[0] == "search":
+        return "_".join(parts)
+    return parts[-1]
+
+def _ref(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+class ContributionTally:
+    """
+    Accumulates per-contributor metrics for one repository from raw API items.
+    Shared by the sync and async clients so both count contributions identically.
+
+    When an `event_sink` (see event_archive.EventArchiveWriter) is given, every
+    counted item is also recorded there as a raw event. With `identities`
+    (see identity.IdentityResolver), alias logins are credited to their
+    canonical login on every kind of contribution.
+    """
+
+    def __init__(
+        self,
+        owner: str = "",
+        repo: str = "",
+        event_sink: Optional[Any] = None,
+        identities: Optional[Any] = None,
+    ) -> None:
+        self.contributors: Dict[str, Dict[str, Any]] = {}
+        self.owner = owner
+        self.repo = repo
+        self.event_sink = event_sink
+        self.identities = identities
+
+    def _login(self, actor: Optional[Dict[str, Any]]) -> Optional[str]:
+        login = (actor or {}).get("login")
+        if login and self.identities is not None:
+            return self.identities.canonical(login)
+        return login
+
+    def _entry(self, login: str) -> Dict[str, Any]:
+        data = self.contributors.get(login)
+        if data is None:
+            data = self.contributors[login] = {
+                "issuesClosed": 0,
+                "pullReviews": 0,
+                "pullsCreated": 0,
+                "additions": 0,
+                "deletions": 0,
+                "commits": 0,
+            }
+        return data
+
+    def add_closed_issues(self, issues: List[Dict[str, Any]]) -> None:
+        for issue in issues:
+            login = self._login(issue.get("assignee"))
+            if not login:
+                continue
+            self._entry(login)["issuesClosed"] += 1
+            if self.event_sink is not None:
+                self.event_sink.record(
+                    self.owner,
+                    self.repo,
+                    "issue_closed",
+                    login,
+                    issue.get("closed_at"),
+                    ref=_ref(issue.get("number")),
+                )
+
+    def add_pulls(self, pulls: List[Dict[str, Any]]) -> None:
+        for pull in pulls:
+            login = self._login(pull.get("user"))
+            if not login:
+                continue
+            self._entry(login)["pullsCreated"] += 1
+            if self.event_sink is not None:
+                self.event_sink.record(
+                    self.owner,
+                    self.repo,
+                    "pull_created",
+                    login,
+                    pull.get("created_at"),
+                    ref=_ref(pull.get("number")),
+                )
+
+    def add_reviews(self, reviews: List[Dict[str, Any]]) -> None:
+        for review in reviews:
+            login = self._login(review.get("user"))
+            if not login:
+                continue
+            self._entry(login)["pullReviews"] += 1
+            if self.event_sink is not None:
+                self.event_sink.record(
+                    self.owner,
+                    self.repo,
+                    "pull_review",
+                    login,
+                    review.get("submitted_at"),
+                    ref=_ref(review.get("id")),
+                )
+
+    def add_commits(self, commits: List[Dict[str, Any]]) -> None:
+        for commit in commits:
+            login = self._login(commit.get("author"))
+            if not login:
+                continue
+            data = self._entry(login)
+            data["commits"] += 1
+            stats = commit.get("stats") or {}
+            additions = int(stats.get("additions", 0))
+            deletions = int(stats.get("deletions", 0))
+            data["additions"] += additions
+            data["deletions"] += deletions
+            if self.event_sink is not None:
+                date = ((commit.get("commit") or {}).get("author") or {}).get("date")
+                self.event_sink.record(
+                    self.owner,
+                    self.repo,
+                    "commit",
+                    login,
+                    date,
+                    additions,
+                    deletions,
+                    ref=commit.get("sha"),
+                )
+
 class GitHubClient:
     """
     Minimal GitHub API v3 wrapper focused on scraping contribution metrics
@@ -18,6 +277,13 @@ class GitHubClient:
         base_url: str = "https://api.github.com",
         per_page: int = 100,
         logger: Optional[logging.Logger] = None,
+        metrics: Optional[Any] = None,
+        checkpoint: Optional[Any] = None,
+        event_sink: Optional[Any] = None,
+        budget: Optional[Any] = None,
+        exclusions: Optional[Any] = None,
+        review_cache: Optional[Any] = None,
+        identities: Optional[Any] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.per_page = per_page
@@ -30,19 +296,68 @@ class GitHubClient:
             }
         )
         self.log = logger or logging.getLogger("github_champion.github_client")
+        # Optional RunMetrics-compatible collector (see run_metrics.py)
+        self.metrics = metrics
+        # Optional RunCheckpoint (see checkpoint.py) used to resume paginations
+        self.checkpoint = checkpoint
+        # Optional EventArchiveWriter (see event_archive.py) receiving raw events
+        self.event_sink = event_sink
+        # Optional RequestBudget (see budget.py) checked before every request
+        self.budget = budget
+        # Optional ExclusionRules (see exclusions.py) applied to every listing
+        self.exclusions = exclusions
+        # Optional ReviewCache (see review_cache.py) of reviews per pull request
+        self.review_cache = review_cache
+        # Optional IdentityResolver (see identity.py) for commit emails and aliases
+        self.identities = identities
+        # "owner/repo" of repositories with an endpoint that failed to fetch
+        self.incomplete: Set[str] = set()
+        # "owner/repo" of repositories with commit emails whose lookup failed
+        # or was cut off, so a later run could credit more commits
+        self.unresolved: Set[str] = set()
 
-    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+    def _get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[FieldTree] = None,
+        stop_before: Optional[Tuple[str, str]] = None,
+    ) -> List[Dict]:
         url = f"{self.base_url}{path}"
+        endpoint = endpoint_label(path)
         results: List[Dict[str, Any]] = []
         page = 1
 
+        cursor_key: Optional[str] = None
+        # Set when resuming: the listing is read again from the top, since it
+        # may have changed since its pages were saved (see ResumedListing)
+        listing: Optional[Any] = None
+        if self.checkpoint is not None:
+            cursor_key = self.checkpoint.cursor_key(url, params, self.per_page, stop_before)
+            listing = self.checkpoint.resume_listing(cursor_key)
+            if listing is not None:
+                self.log.debug("Resuming %s at page %d", url, listing.next_page)
+
         while True:
             merged_params = {"per_page": self.per_page, "page": page}
             if params:
                 merged_params.update(params)
 
             self.log.debug("GET %s params=%s", url, merged_params)
-            resp = self.session.get(url, params=merged_params, timeout=30)
+            if self.budget is not None and not self.budget.try_spend():
+                raise BudgetExhausted(self.budget.reason or "request budget spent")
+            started = time.perf_counter()
+            try:
+                resp = self.session.get(url, params=merged_params, timeout=30)
+            except requests.RequestException as e:
+                raise RuntimeError(f"Request to {url} failed: {e!r}") from e
+            if self.budget is not None:
+                self.budget.observe_rate_limit(resp.headers)
+            if self.metrics is not None:
+                self.metrics.observe_request(
+                    endpoint, resp.status_code, time.perf_counter() - started
+                )
+                self.metrics.observe_rate_limit(resp.headers)
             if resp.status_code == 401:
                 raise RuntimeError("Unauthorized: invalid GitHub token")
             if resp.status_code == 403:
@@ -52,30 +367,82 @@ class GitHubClient:
             if resp.status_code == 404:
                 # For some endpoints, 404 indicates missing repo or insufficient permissions
                 raise RuntimeError(f"Resource not found at {url}")
-
-            resp.raise_for_status()
-            data = resp.json()
+            if resp.status_code >= 400:
+                raise RuntimeError(f"HTTP {resp.status_code} from {url}")
+            data = decode_json(resp)
             if not isinstance(data, list):
                 # Some endpoints return a dict; in this wrapper, we only paginate list responses.
                 return data  # type: ignore[return-value]
+            if fields is not None:
+                data = [project_fields(item, fields) for item in data]
 
+            if self.metrics is not None:
+                self.metrics.add_items(endpoint, len(data))
+            done = len(data) < self.per_page
+            if stop_before is not None and not done:
+                # Sorted descending by `key`: nothing older than `bound` is needed.
+                key, bound = stop_before
+                done = (data[-1].get(key) or "") < bound
+            if listing is not None and page < listing.next_page:
+                caught_up = listing.add_head(data)
+                if done:
+                    break
+                # Skip the pages that were saved once they are reached
+                page = listing.next_page if caught_up else page + 1
+                continue
+            if listing is not None:
+                data = listing.add(data)
             results.extend(data)
-            if len(data) < self.per_page:
+            if done:
                 break
+            if cursor_key is not None:
+                self.checkpoint.save_cursor_page(cursor_key, data)
             page += 1
 
-        return results
+        if cursor_key is not None:
+            self.checkpoint.clear_cursor(cursor_key)
+        return listing.merged(results) if listing is not None else results
+
+    def list_org_repositories(self, org: str) -> List[Dict[str, Any]]:
+        """
+        Fetch listing metadata (name, size, activity timestamps) for the
+        organization's non-archived repositories.
+        """
+        path = f"/orgs/{org}/repos"
+        repos = self._get(path, fields=REPO_FIELDS)
+        return [r for r in repos if not r.get("archived", False)]
 
     def get_org_repos(self, org: str) -> List[str]:
         """
         Fetch repository names for an organization.
         """
-        path = f"/orgs/{org}/repos"
-        repos = self._get(path)
-        repo_names = [r["name"] for r in repos if not r.get("archived", False)]
+        repo_names = [r["name"] for r in self.list_org_repositories(org)]
         self.log.info("Fetched %d repositories for org %s", len(repo_names), org)
         return repo_names
 
+    def get_rate_limit(self) -> Dict[str, Any]:
+        """
+        Current rate-limit status per resource ("core", "search", ...).
+        Does not count against the core quota.
+        """
+        data = self._get("/rate_limit")
+        return data.get("resources", {})  # type: ignore[union-attr]
+
+    def search_total_count(self, query: str) -> int:
+        """
+        Number of issues/PRs matching a search query, without fetching them.
+        """
+        data = self._get("/search/issues", params={"q": query, "per_page": 1})
+        return int(data.get("total_count", 0))  # type: ignore[union-attr]
+
+    def search_user_by_email(self, email: str) -> Optional[str]:
+        """
+        Login of the account that lists `email` as its public email, if any.
+        """
+        data = self._get("/search/users", params={"q": f"{email} in:email", "per_page": 1})
+        items = data.get("items") or []  # type: ignore[union-attr]
+        return items[0].get("login") if items else None
+
     def _filter_items_by_date(
         self,
         items: List[Dict[str, Any]],
@@ -83,18 +450,12 @@ class GitHubClient:
         until: datetime,
         date_key: str = "created_at",
     ) -> List[Dict[str, Any]]:
-        filtered: List[Dict[str, Any]] = []
-        for item in items:
-            date_str = item.get(date_key)
-            if not date_str:
-                continue
-            try:
-                dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            except ValueError:
-                continue
-            if since <= dt <= until:
-                filtered.append(item)
-        return filtered
+        return filter_items_by_date(items, since=since, until=until, date_key=date_key)
+
+    def _exclude(self, endpoint: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.exclusions is None:
+            return items
+        return self.exclusions.filter(endpoint, items)
 
     def get_closed_issues(
         self,
@@ -107,11 +468,12 @@ class GitHubClient:
         Get closed issues (excluding PRs) in the time range.
         """
         path = f"/repos/{owner}/{repo}/issues"
-        issues = self._get(path, params={"state": "closed"})
+        issues = self._get(path, params={"state": "closed"}, fields=ISSUE_FIELDS)
         issues = [i for i in issues if "pull_request" not in i]  # exclude PRs
-        return self._filter_items_by_date(
+        issues = self._filter_items_by_date(
             issues, since=since, until=until, date_key="closed_at"
         )
+        return self._exclude("issues", issues)
 
     def get_pulls(
         self,
@@ -124,8 +486,42 @@ class GitHubClient:
         Get pull requests in the time range.
         """
         path = f"/repos/{owner}/{repo}/pulls"
-        pulls = self._get(path, params={"state": "all", "sort": "created", "direction": "desc"})
-        return self._filter_items_by_date(pulls, since=since, until=until, date_key="created_at")
+        pulls = self._get(
+            path,
+            params={"state": "all", "sort": "created", "direction": "desc"},
+            fields=PULL_FIELDS,
+            stop_before=("created_at", timestamp_bounds(since, until)[0]),
+        )
+        pulls = self._filter_items_by_date(pulls, since=since, until=until, date_key="created_at")
+        return self._exclude("pulls", pulls)
+
+    def get_pulls_updated_since(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+        until: datetime,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get pull requests created by `until` and updated at or after `since`,
+        most recently updated first. Every pull with a review submitted in
+        the window is among them, including pulls created before it.
+        """
+        path = f"/repos/{owner}/{repo}/pulls"
+        lower, upper = timestamp_bounds(since, until)
+        pulls = self._get(
+            path,
+            params={"state": "all", "sort": "updated", "direction": "desc"},
+            fields=PULL_FIELDS,
+            stop_before=("updated_at", lower),
+        )
+        # A pull created after the window cannot have been reviewed in it
+        pulls = [
+            p
+            for p in pulls
+            if (p.get("updated_at") or "") >= lower and (p.get("created_at") or "") <= upper
+        ]
+        return self._exclude("pulls", pulls)
 
     def get_pull_reviews(
         self,
@@ -134,13 +530,25 @@ class GitHubClient:
         pull_number: int,
         since: datetime,
         until: datetime,
+        updated_at: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Get reviews for a specific pull request in the time range.
+
+        With a review cache and the pull's `updated_at`, a pull that has not
+        changed since its reviews were last fetched costs no request.
         """
-        path = f"/repos/{owner}/{repo}/pulls/{pull_number}/reviews"
-        reviews = self._get(path)
-        return self._filter_items_by_date(reviews, since=since, until=until, date_key="submitted_at")
+        cache = self.review_cache if updated_at else None
+        reviews = cache.get(owner, repo, pull_number, updated_at) if cache is not None else None
+        if reviews is None:
+            path = f"/repos/{owner}/{repo}/pulls/{pull_number}/reviews"
+            reviews = self._get(path, fields=REVIEW_FIELDS)
+            if cache is not None:
+                cache.put(owner, repo, pull_number, updated_at, reviews)
+        reviews = self._filter_items_by_date(
+            reviews, since=since, until=until, date_key="submitted_at"
+        )
+        return self._exclude("reviews", reviews)
 
     def get_commits(
         self,
@@ -159,8 +567,34 @@ class GitHubClient:
                 "since": since.isoformat(),
                 "until": until.isoformat(),
             },
+            fields=COMMIT_FIELDS,
         )
-        return commits
+        self._attribute_commits(owner, repo, commits)
+        return self._exclude("commits", commits)
+
+    def _attribute_commits(self, owner: str, repo: str, commits: List[Dict[str, Any]]) -> None:
+        """
+        Credit commits whose email is not linked to an account, looking up
+        each unknown email once per run. A repository left with commits whose
+        lookup failed or was cut off counts as unresolved.
+        """
+        if self.identities is None:
+            return
+        for email in self.identities.pending_emails(commits):
+            try:
+                login = self.search_user_by_email(email)
+            except BudgetExhausted:
+                raise
+            except RuntimeError as e:
+                # Usually the search rate limit; retried on the next run
+                self.log.warning("Stopping email lookups for this run: %s", e)
+                self.identities.stop()
+                self.identities.skip(email)
+                break
+            self.identities.record(email, login)
+        self.identities.attribute_commits(commits)
+        if self.identities.unsettled(commits):
+            self.unresolved.add(f"{owner}/{repo}")
 
     def collect_repository_contributions(
         self,
@@ -168,10 +602,20 @@ class GitHubClient:
         repo: str,
         since: datetime,
         until: datetime,
+        endpoints: Optional[Iterable[str]] = None,
+        created_between: Optional[Tuple[datetime, datetime]] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """
         Aggregate contribution metrics for a single repository.
         Returns a dict keyed by contributor id (login).
+
+        `endpoints` restricts collection to a subset of ALL_ENDPOINTS
+        ("reviews" lists pulls to find them but does not count the pulls).
+        Reviews come from every pull updated since the start of the window,
+        so reviews on older pulls count too. `created_between` narrows the
+        pulls and commits covered to a slice of the window, so large
+        repositories can be split into independent sub-tasks.
+        BudgetExhausted is never swallowed.
         """
         self.log.info(
             "Collecting contributions for %s/%s from %s to %s",
@@ -181,64 +625,56 @@ class GitHubClient:
             until.isoformat(),
         )
 
-        contributors: Dict[str, Dict[str, Any]] = {}
+        wanted = set(endpoints or ALL_ENDPOINTS)
+        item_since, item_until = created_between or (since, until)
+        tally = ContributionTally(
+            owner, repo, event_sink=self.event_sink, identities=self.identities
+        )
 
         # Closed issues
-        try:
-            issues = self.get_closed_issues(owner, repo, since, until)
-        except RuntimeError as e:
-            self.log.error("Failed to fetch issues for %s/%s: %s", owner, repo, e)
-            issues = []
-
-        for issue in issues:
-            assignee = issue.get("assignee") or {}
-            login = assignee.get("login")
-            if not login:
-                continue
-            data = contributors.setdefault(
-                login,
-                {
-                    "issuesClosed": 0,
-                    "pullReviews": 0,
-                    "pullsCreated": 0,
-                    "additions": 0,
-                    "deletions": 0,
-                    "commits": 0,
-                },
-            )
-            data["issuesClosed"] += 1
+        issues: List[Dict[str, Any]] = []
+        if "issues" in wanted:
+            try:
+                issues = self.get_closed_issues(owner, repo, since, until)
+            except BudgetExhausted:
+                raise
+            except RuntimeError as e:
+                self.log.error("Failed to fetch issues for %s/%s: %s", owner, repo, e)
+                self.incomplete.add(f"{owner}/{repo}")
+        tally.add_closed_issues(issues)
 
         # Pull requests and reviews
+        pulls: List[Dict[str, Any]] = []
+        touched: List[Dict[str, Any]] = []
         try:
-            pulls = self.get_pulls(owner, repo, since, until)
+            if "reviews" in wanted:
+                # One listing serves both: a pull created in the window was
+                # also updated in or after it.
+                touched = self.get_pulls_updated_since(owner, repo, since, until)
+                pulls = pulls_created_between(touched, item_since, item_until)
+            elif "pulls" in wanted:
+                pulls = self.get_pulls(owner, repo, item_since, item_until)
+        except BudgetExhausted:
+            raise
         except RuntimeError as e:
             self.log.error("Failed to fetch pulls for %s/%s: %s", owner, repo, e)
-            pulls = []
-
-        for pull in pulls:
-            user = pull.get("user") or {}
-            login = user.get("login")
-            if not login:
-                continue
-            data = contributors.setdefault(
-                login,
-                {
-                    "issuesClosed": 0,
-                    "pullReviews": 0,
-                    "pullsCreated": 0,
-                    "additions": 0,
-                    "deletions": 0,
-                    "commits": 0,
-                },
-            )
-            data["pullsCreated"] += 1
+            self.incomplete.add(f"{owner}/{repo}")
+        if "pulls" in wanted:
+            tally.add_pulls(pulls)
 
+        for pull in touched:
             # Reviews for each pull
+            if not (pull.get("user") or {}).get("login"):
+                continue
             number = pull.get("number")
             if number is None:
                 continue
             try:
-                reviews = self.get_pull_reviews(owner, repo, number, since, until)
+                reviews = self.get_pull_reviews(
+                    owner, repo, number, since, until, updated_at=pull.get("updated_at")
+                )
+            except BudgetExhausted:
+                raise
             except RuntimeError as e:
                 self.log.error(
                     "Failed to fetch reviews for PR #%s in %s/%s: %s",
@@ -247,53 +683,23 @@ class GitHubClient:
                     repo,
                     e,
                 )
+                self.incomplete.add(f"{owner}/{repo}")
                 reviews = []
-            for review in reviews:
-                user = review.get("user") or {}
-                login = user.get("login")
-                if not login:
-                    continue
-                data = contributors.setdefault(
-                    login,
-                    {
-                        "issuesClosed": 0,
-                        "pullReviews": 0,
-                        "pullsCreated": 0,
-                        "additions": 0,
-                        "deletions": 0,
-                        "commits": 0,
-                    },
-                )
-                data["pullReviews"] += 1
+            tally.add_reviews(reviews)
 
         # Commits and line stats
-        try:
-            commits = self.get_commits(owner, repo, since, until)
-        except RuntimeError as e:
-            self.log.error("Failed to fetch commits for %s/%s: %s", owner, repo, e)
-            commits = []
-
-        for commit in commits:
-            author = commit.get("author") or {}
-            login = author.get("login")
-            if not login:
-                continue
-            data = contributors.setdefault(
-                login,
-                {
-                    "issuesClosed": 0,
-                    "pullReviews": 0,
-                    "pullsCreated": 0,
-                    "additions": 0,
-                    "deletions": 0,
-                    "commits": 0,
-                },
-            )
-            data["commits"] += 1
-            stats = commit.get("stats") or {}
-            data["additions"] += int(stats.get("additions", 0))
-            data["deletions"] += int(stats.get("deletions", 0))
+        commits: List[Dict[str, Any]] = []
+        if "commits" in wanted:
+            try:
+                commits = self.get_commits(owner, repo, item_since, item_until)
+            except BudgetExhausted:
+                raise
+            except RuntimeError as e:
+                self.log.error("Failed to fetch commits for %s/%s: %s", owner, repo, e)
+                self.incomplete.add(f"{owner}/{repo}")
+        tally.add_commits(commits)
 
+        contributors = tally.contributors
         self.log.info(
             "Collected metrics for %d contributors in %s/%s",
             len(contributors),
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# <id>+<login>@users.noreply.github.com, or <login>@... for older accounts
+_NOREPLY = re.compile(r"^(?:\d+\+)?([a-z0-9](?:[a-z0-9-]*[a-z0-9])?)@users\.noreply\.github\.com$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS identities (
+    email TEXT PRIMARY KEY,
+    login TEXT,
+    resolved_at REAL NOT NULL
+);
+"""
+
+DAY_SECONDS = 86400.0
+
+class IdentityCache:
+    """
+    SQLite-backed map of commit emails to GitHub logins.
+
+    Emails no account claims are stored with a NULL login (negative
+    caching), so they are not looked up again on every run. Positive and
+    negative entries expire after their own TTL, since emails get linked
+    to accounts later and accounts get renamed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = 30 * DAY_SECONDS,
+        negative_ttl_seconds: float = 7 * DAY_SECONDS,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit: each answer is visible to workers sharing the cache at once
+        self._conn = sqlite3.connect(str(path), timeout=60, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=60000")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, email: str, now: Optional[float] = None) -> Tuple[bool, Optional[str]]:
+        """
+        (found, login) for an email; found is False when there is no entry
+        or it has expired. A found entry with login None is a cached miss.
+        """
+        row = self._conn.execute(
+            "SELECT login, resolved_at FROM identities WHERE email = ?", (email,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        login, resolved_at = row
+        ttl = self.ttl_seconds if login else self.negative_ttl_seconds
+        if (now if now is not None else time.time()) - resolved_at > ttl:
+            return False, None
+        return True, login
+
+    def put(self, email: str, login: Optional[str], now: Optional[float] = None) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO identities (email, login, resolved_at) VALUES (?, ?, ?)",
+            (email, login, now if now is not None else time.time()),
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+class IdentityResolver:
+    """
+    Maps commit emails and alias logins to one canonical GitHub login.
+
+    `aliases` maps emails (keys containing "@") or old/secondary logins to
+    the login they should be credited to. Emails are resolved from the
+    aliases, GitHub noreply addresses, this run's lookups and then the
+    persistent cache; whatever is left is reported by `pending_emails()`
+    so the client can look each unique email up once and `record()` the
+    answer.
+
+    The resolver does no I/O of its own, so the sync and async clients
+    share it and decide how to batch their lookups.
+    """
+
+    def __init__(
+        self,
+        aliases: Optional[Dict[str, str]] = None,
+        cache: Optional[IdentityCache] = None,
+        lookup: bool = True,
+        max_lookups: Optional[int] = None,
+    ) -> None:
+        self.aliases = {key.lower(): login for key, login in (aliases or {}).items()}
+        self.cache = cache
+        self.lookup = lookup
+        self.max_lookups = max_lookups
+        self.lookups = 0
+        # Set once a lookup fails (usually the search rate limit)
+        self.stopped = False
+        # This run's answers, including misses and failed lookups
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._claimed: Set[str] = set()
+        self._skipped: Set[str] = set()
+
+    @classmethod
+    def from_settings(
+        cls, settings: Dict[str, Any], output_dir: str
+    ) -> Optional["IdentityResolver"]:
+        """
+        Build a resolver from the `identities` settings section, or None
+        when it is disabled.
+        """
+        section = settings.get("identities", {})
+        if not section.get("enabled", True):
+            return None
+        cache = IdentityCache(
+            Path(section.get("cache") or Path(output_dir) / ".identity-cache.sqlite"),
+            ttl_seconds=float(section.get("ttl_days", 30)) * DAY_SECONDS,
+            negative_ttl_seconds=float(section.get("negative_ttl_days", 7)) * DAY_SECONDS,
+        )
+        max_lookups = section.get("max_lookups")
+        return cls(
+            aliases=section.get("aliases") or {},
+            cache=cache,
+            lookup=bool(section.get("lookup", True)),
+            max_lookups=int(max_lookups) if max_lookups is not None else None,
+        )
+
+    def canonical(self, login: str) -> str:
+        return self.aliases.get(login.lower(), login)
+
+    def login_for_email(self, email: Optional[str]) -> Optional[str]:
+        """
+        Login for an email without looking it up, or None if unknown.
+        """
+        if not email:
+            return None
+        email = email.lower()
+        if email in self.aliases:
+            return self.aliases[email]
+        match = _NOREPLY.match(email)
+        if match:
+            return self.canonical(match.group(1))
+        if email in self._resolved:
+            login = self._resolved[email]
+        else:
+            found, login = self.cache.get(email) if self.cache is not None else (False, None)
+            if not found:
+                return None
+            self._resolved[email] = login
+        return self.canonical(login) if login else None
+
+    def unlinked_emails(self, commits: List[Dict[str, Any]]) -> List[str]:
+        """
+        Unique lowercased emails of commits without a linked account.
+        """
+        emails: Dict[str, None] = {}
+        for commit in commits:
+            if (commit.get("author") or {}).get("login"):
+                continue
+            email = (commit_email(commit) or "").lower()
+            if email:
+                emails[email] = None
+        return list(emails)
+
+    def pending_emails(self, commits: List[Dict[str, Any]]) -> List[str]:
+        """
+        Emails of commits without a linked account that still need a lookup,
+        within the lookup allowance. Returned emails are claimed, so
+        concurrent callers never look the same email up twice.
+        """
+        if not self.lookup or self.stopped:
+            return []
+        pending: List[str] = []
+        for email in self.unlinked_emails(commits):
+            if email in self._claimed or email in self._resolved:
+                continue
+            if self.login_for_email(email) is None and email not in self._resolved:
+                pending.append(email)
+        if self.max_lookups is not None:
+            pending = pending[: max(self.max_lookups - self.lookups, 0)]
+        self.lookups += len(pending)
+        self._claimed.update(pending)
+        return pending
+
+    def record(self, email: str, login: Optional[str]) -> None:
+        """
+        Store a lookup result; None means no account claims the email.
+        """
+        email = email.lower()
+        self._resolved[email] = login
+        if self.cache is not None:
+            self.cache.put(email, login)
+
+    def skip(self, email: str) -> None:
+        """
+        Give up on an email for this run (failed lookup) without caching it.
+        """
+        email = email.lower()
+        self._resolved[email] = None
+        self._skipped.add(email)
+
+    def stop(self) -> None:
+        """
+        Make no further lookups this run; emails not yet answered stay unsettled.
+        """
+        self.stopped = True
+
+    def unsettled(self, commits: List[Dict[str, Any]]) -> bool:
+        """
+        True when some commit may still be uncredited only because its email
+        lookup failed or never ran (lookups stopped or `max_lookups` reached),
+        so a later run could credit it. Misses answered by GitHub are settled.
+        """
+        if not self.lookup:
+            return False
+        for email in self.unlinked_emails(commits):
+            if email in self._skipped:
+                return True
+            # login_for_email records cached misses in _resolved
+            if self.login_for_email(email) is None and email not in self._resolved:
+                return True
+        return False
+
+    def attribute_commits(self, commits: List[Dict[str, Any]]) -> None:
+        """
+        Fill in `author` for commits whose email resolves to a login.
+        """
+        for commit in commits:
+            if (commit.get("author") or {}).get("login"):
+                continue
+            login = self.login_for_email(commit_email(commit))
+            if login:
+                commit["author"] = {"login": login}
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
+
+def commit_email(commit: Dict[str, Any]) -> Optional[str]:
+    return ((commit.get("commit") or {}).get("author") or {}).get("email")
@@ -1,22 +1,58 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+import logging
+import multiprocessing
+import math
 import os
-from datetime import datetime
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, nullcontext
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Callable, ContextManager, List, Dict, Any, Optional, Set, Tuple
 
-from .github_client import GitHubClient
-from .scoring import compute_all_leaderboards
+from .github_client import ALL_ENDPOINTS, BudgetExhausted, GitHubClient, timestamp_bounds
+from .scoring import IncrementalLeaderboards, RollupHierarchy, ScoringWeights
 from .reporting import (
     generate_leaderboard_report,
     generate_detailed_metrics_report,
+    generate_group_leaderboard_report,
     save_json,
 )
+from .publishing import build_report_partitions, publish_partitions
 from .utils.date_ranges import parse_date_range
 from .utils.logging_setup import setup_logging
-from .filters import filter_repositories_by_activity
+from .run_metrics import RunMetrics
+from .profiling import PhaseProfiler
+from .pipeline import PROGRESS_FILE, LeaderboardPipeline
+from .checkpoint import RunCheckpoint
+from .event_archive import EventArchiveWriter
+from .exclusions import ExclusionRules
+from .review_cache import ReviewCache
+from .identity import IdentityResolver
+from .repo_memo import RepoMemo, activity_fingerprint, window_is_closed
+from .sharding import WorkQueue, default_worker_id, run_worker, split_tokens
+from .budget import PRIORITY_PASSES, RequestBudget, completeness_report, parse_deadline
+from .planner import (
+    DEFAULT_LATENCY_SECONDS,
+    RepoEstimate,
+    build_plan,
+    estimate_from_costs,
+    estimate_from_search,
+    format_plan,
+)
+from .scheduling import (
+    DEFAULT_SLICES,
+    DEFAULT_SPLIT_COST,
+    CollectionTask,
+    RepoStatsStore,
+    estimate_endpoint_costs,
+    merge_contributor_metrics,
+    plan_tasks,
+)
 
 def _load_settings(settings_path: Optional[str]) -> Dict[str, Any]:
     if not settings_path:
@@ -27,20 +63,253 @@ def _load_settings(settings_path: Optional[str]) -> Dict[str, Any]:
     with settings_file.open("r", encoding="utf-8") as f:
         return json.load(f)
 
+# Set by main() when running with --profile; phases are process-wide.
+_profiler: Optional[PhaseProfiler] = None
+
+def _phase(metrics: Optional[RunMetrics], name: str) -> ContextManager[None]:
+    if _profiler is None:
+        return metrics.phase(name) if metrics is not None else nullcontext()
+    stack = ExitStack()
+    if metrics is not None:
+        stack.enter_context(metrics.phase(name))
+    stack.enter_context(_profiler.phase(name))
+    return stack
+
+def _split_repo(key: str, organization: str) -> Tuple[str, str]:
+    """
+    Owner and name of a repository key. Multi-organization runs key
+    repositories as "owner/name"; single-organization runs by bare name.
+    """
+    owner, _, name = key.rpartition("/")
+    return owner or organization, name
+
+def _collect_sync(
+    client: GitHubClient,
+    organization: str,
+    repos: List[str],
+    since: datetime,
+    until: datetime,
+    logger: logging.Logger,
+    on_repo_done: Callable[[str, Optional[Dict[str, Dict[str, Any]]]], None],
+) -> None:
+    """
+    Collect repositories one after another; results only go to `on_repo_done`.
+    """
+    for repo_name in repos:
+        owner, name = _split_repo(repo_name, organization)
+        try:
+            repo_metrics = client.collect_repository_contributions(
+                owner=owner,
+                repo=name,
+                since=since,
+                until=until,
+            )
+        except RuntimeError as e:
+            logger.error("Error collecting contributions for %s/%s: %s", owner, name, e)
+            on_repo_done(repo_name, None)
+            continue
+        on_repo_done(repo_name, repo_metrics)
+
+def _collect_budgeted(
+    client: GitHubClient,
+    organization: str,
+    repos: List[str],
+    endpoint_costs: Dict[str, Dict[str, float]],
+    since: datetime,
+    until: datetime,
+    budget: RequestBudget,
+    logger: logging.Logger,
+    event_sink: Optional[EventArchiveWriter],
+) -> Tuple[Dict[str, Dict[str, Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Collect endpoint groups in priority order across all repositories until
+    the budget runs out, cheapest repositories first within each pass.
+
+    A repository's pass counts as covered only when none of its endpoints
+    failed, so the returned completeness report is exact. Repositories
+    whose estimated cost exceeds what is left are skipped in favour of
+    cheaper ones.
+    """
+    merged: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    covered: Dict[str, List[str]] = {}
+    for endpoints in PRIORITY_PASSES:
+        if budget.exhausted:
+            break
+        ordered = sorted(
+            repos, key=lambda r: sum(endpoint_costs[r].get(e, 0.0) for e in endpoints)
+        )
+        for repo_name in ordered:
+            owner, name = _split_repo(repo_name, organization)
+            remaining = budget.remaining
+            estimate = sum(endpoint_costs[repo_name].get(e, 0.0) for e in endpoints)
+            if remaining is not None and estimate > remaining:
+                logger.info(
+                    "Skipping %s for %s/%s: needs ~%d requests, %d left",
+                    "+".join(endpoints),
+                    owner,
+                    name,
+                    estimate,
+                    remaining,
+                )
+                continue
+            # The client logs and skips endpoints that fail and flags the
+            # repository; tell this pass's failures apart from earlier ones
+            slug = f"{owner}/{name}"
+            failed_before = slug in client.incomplete
+            client.incomplete.discard(slug)
+            try:
+                partial = client.collect_repository_contributions(
+                    owner=owner,
+                    repo=name,
+                    since=since,
+                    until=until,
+                    endpoints=endpoints,
+                )
+            except BudgetExhausted as e:
+                logger.warning("Stopping collection: %s", e)
+                if event_sink is not None:
+                    event_sink.discard_repo(owner, name)
+                break
+            except RuntimeError as e:
+                logger.error("Error collecting contributions for %s/%s: %s", owner, name, e)
+                if event_sink is not None:
+                    event_sink.discard_repo(owner, name)
+                continue
+            finally:
+                failed = slug in client.incomplete
+                if failed_before:
+                    client.incomplete.add(slug)
+            if event_sink is not None:
+                event_sink.commit_repo(owner, name)
+            merge_contributor_metrics(merged.setdefault(repo_name, {}), partial)
+            if failed:
+                logger.warning(
+                    "Counting %s for %s as not collected: an endpoint failed",
+                    "+".join(endpoints),
+                    slug,
+                )
+                continue
+            for endpoint in endpoints:
+                covered.setdefault(endpoint, []).append(repo_name)
+
+    completeness = completeness_report(repos, covered, budget)
+    per_repo_metrics = {r: merged[r] for r in repos if merged.get(r)}
+    return per_repo_metrics, completeness
+
+def _task_order(entry: Tuple[CollectionTask, Any]) -> Tuple[int, float]:
+    task = entry[0]
+    endpoint = ALL_ENDPOINTS.index(task.endpoints[0]) if task.endpoints else -1
+    start = task.created_between[0].timestamp() if task.created_between else 0.0
+    return endpoint, -start
+
+async def _collect_async(
+    token: str,
+    settings: Dict[str, Any],
+    concurrency: int,
+    organization: str,
+    tasks: List[CollectionTask],
+    since: datetime,
+    until: datetime,
+    logger: logging.Logger,
+    metrics: Optional[RunMetrics],
+    checkpoint: Optional[RunCheckpoint],
+    event_sink: Optional[EventArchiveWriter],
+    review_cache: Optional[ReviewCache],
+    identities: Optional[IdentityResolver],
+    incomplete: Set[str],
+    unresolved: Set[str],
+    on_repo_done: Callable[[str, Optional[Dict[str, Dict[str, Any]]]], None],
+) -> None:
+    """
+    Collect tasks on a pool of runners; each repository goes to `on_repo_done`
+    once all of its sub-tasks are in.
+    """
+    # Imported lazily so the default synchronous mode does not require httpx.
+    from .async_github_client import AsyncGitHubClient
+
+    api_settings = settings.get("github_api", {})
+    task_concurrency = int(api_settings.get("task_concurrency", 8))
+    # Tasks arrive most expensive first; a fixed pool of runners takes them in
+    # that order so the largest repositories never start last.
+    pending = deque(tasks)
+    remaining = Counter(task.repo for task in tasks)
+    partials: Dict[str, List[Tuple[CollectionTask, Dict[str, Dict[str, Any]]]]] = {}
+    failed: set = set()
+
+    async with AsyncGitHubClient(
+        token=token,
+        base_url=api_settings.get("base_url", "https://api.github.com"),
+        per_page=int(api_settings.get("per_page", 100)),
+        max_concurrency=concurrency,
+        logger=logger,
+        metrics=metrics,
+        checkpoint=checkpoint,
+        event_sink=event_sink,
+        exclusions=ExclusionRules.from_settings(settings),
+        review_cache=review_cache,
+        identities=identities,
+    ) as client:
+        # Shared with the caller, which must not memoize partial results
+        client.incomplete = incomplete
+        client.unresolved = unresolved
+
+        async def runner() -> None:
+            while pending:
+                task = pending.popleft()
+                owner, name = _split_repo(task.repo, organization)
+                try:
+                    partial = await client.collect_repository_contributions(
+                        owner=owner,
+                        repo=name,
+                        since=since,
+                        until=until,
+                        endpoints=task.endpoints,
+                        created_between=task.created_between,
+                    )
+                except RuntimeError as e:
+                    logger.error(
+                        "Error collecting contributions for %s/%s: %s", owner, name, e
+                    )
+                    failed.add(task.repo)
+                    partial = {}
+                partials.setdefault(task.repo, []).append((task, partial))
+                remaining[task.repo] -= 1
+                if remaining[task.repo]:
+                    continue
+                if task.repo in failed:
+                    partials.pop(task.repo)
+                    on_repo_done(task.repo, None)
+                    continue
+                # Merge in a fixed order so contributor order does not depend
+                # on which sub-task happened to finish first.
+                repo_metrics: Dict[str, Dict[str, Any]] = {}
+                for _, part in sorted(partials.pop(task.repo), key=_task_order):
+                    merge_contributor_metrics(repo_metrics, part)
+                on_repo_done(task.repo, repo_metrics)
+
+        await asyncio.gather(*(runner() for _ in range(min(task_concurrency, len(tasks)))))
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Github Champion Scraper - rank contributors across an organization."
     )
     parser.add_argument(
         "--org",
-        dest="organization",
-        help="GitHub organization name",
+        dest="organizations",
+        nargs="+",
+        help=(
+            "GitHub organization name(s). Several organizations are collected in "
+            "one run with per-organization and cross-organization leaderboards."
+        ),
     )
     parser.add_argument(
         "--repos",
         nargs="*",
         dest="repos",
-        help="Optional list of repository names. If omitted, all org repos are used.",
+        help=(
+            "Optional list of repository names ('owner/name' when running over several "
+            "organizations). If omitted, all org repos are used."
+        ),
     )
     parser.add_argument(
         "--since",
@@ -86,6 +355,115 @@ def parse_args() -> argparse.Namespace:
         default="INFO",
         help="Logging level (DEBUG, INFO, WARNING, ERROR).",
     )
+    parser.add_argument(
+        "--metrics-port",
+        dest="metrics_port",
+        type=int,
+        default=None,
+        help="Expose Prometheus metrics on http://127.0.0.1:<port>/metrics during the run.",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        dest="metrics_textfile",
+        default=None,
+        help="Write Prometheus metrics to this file (node_exporter textfile collector).",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Collect with the asyncio/HTTP2 client instead of the synchronous one.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        dest="concurrency",
+        type=int,
+        default=None,
+        help="Maximum in-flight requests when running with --async (default 32).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint instead of starting over.",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        dest="checkpoint_dir",
+        default=None,
+        help="Directory for run checkpoints (default: <output-dir>/.checkpoint).",
+    )
+    parser.add_argument(
+        "--shard-role",
+        dest="shard_role",
+        choices=("coordinator", "worker", "merge", "local"),
+        default=None,
+        help=(
+            "Sharded execution role. 'coordinator' queues repositories, 'worker' "
+            "collects queued repositories, 'merge' scores the results, and 'local' "
+            "runs all three with --workers processes on this host."
+        ),
+    )
+    parser.add_argument(
+        "--work-queue",
+        dest="work_queue",
+        default=None,
+        help="Path of the SQLite work queue (default: <output-dir>/work-queue.sqlite).",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for --shard-role local (default 4).",
+    )
+    parser.add_argument(
+        "--request-budget",
+        dest="request_budget",
+        type=int,
+        default=None,
+        help=(
+            "Send at most this many API requests. Issues and PRs are collected "
+            "before reviews and commits; the report records what is partial."
+        ),
+    )
+    parser.add_argument(
+        "--deadline",
+        dest="deadline",
+        default=None,
+        help="Stop collecting after a duration (e.g. 20m, 1h) or at an ISO timestamp.",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        nargs="?",
+        const="profile",
+        default=None,
+        metavar="DIR",
+        help=(
+            "Profile each phase with cProfile and tracemalloc and write pstats "
+            "files and profile-summary.json to DIR (default: <output-dir>/profile)."
+        ),
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help=(
+            "Estimate the API requests and wall-clock time of the run from cheap "
+            "probes, print the plan and exit without collecting anything."
+        ),
+    )
+    parser.add_argument(
+        "--event-archive",
+        dest="event_archive",
+        default=None,
+        help="Also write every raw event to this archive directory for offline rescoring.",
+    )
+    parser.add_argument(
+        "--reset-event-archive",
+        dest="reset_event_archive",
+        action="store_true",
+        help="Discard the events already in the archive instead of appending to it.",
+    )
     return parser.parse_args()
 
 def main() -> None:
@@ -95,15 +473,133 @@ def main() -> None:
 
     settings = _load_settings(args.settings) if args.settings else {}
 
+    metrics_settings = settings.get("metrics", {})
+    metrics_port = args.metrics_port or metrics_settings.get("port")
+    metrics_textfile = args.metrics_textfile or metrics_settings.get("textfile")
+    metrics: Optional[RunMetrics] = None
+    if metrics_port or metrics_textfile:
+        metrics = RunMetrics()
+        if metrics_port:
+            metrics.serve(int(metrics_port))
+            logger.info("Serving metrics on http://127.0.0.1:%s/metrics", metrics_port)
+
+    global _profiler
+    if args.profile:
+        profile_dir = Path(args.profile)
+        if args.profile == "profile":
+            profile_dir = Path(args.output_dir) / "profile"
+        _profiler = PhaseProfiler(profile_dir, logger=logger)
+
+    try:
+        _run(args, settings, logger, metrics, metrics_textfile)
+    except BaseException:
+        if metrics is not None:
+            metrics.set_run_success(False)
+        raise
+    else:
+        if metrics is not None:
+            metrics.set_run_success(True)
+    finally:
+        if metrics is not None and metrics_textfile:
+            metrics.write_textfile(Path(metrics_textfile))
+        if _profiler is not None:
+            logger.info("Wrote profile summary to %s", _profiler.write())
+            _profiler.close()
+
+def _build_client(
+    token: str,
+    settings: Dict[str, Any],
+    logger: logging.Logger,
+    metrics: Optional[RunMetrics],
+    review_cache: Optional[ReviewCache] = None,
+    identities: Optional[IdentityResolver] = None,
+) -> GitHubClient:
+    return GitHubClient(
+        token=token,
+        base_url=settings.get("github_api", {}).get("base_url", "https://api.github.com"),
+        per_page=int(settings.get("github_api", {}).get("per_page", 100)),
+        logger=logger,
+        metrics=metrics,
+        exclusions=ExclusionRules.from_settings(settings),
+        review_cache=review_cache,
+        identities=identities,
+    )
+
+def _open_review_cache(settings: Dict[str, Any], output_dir: str) -> Optional[ReviewCache]:
+    cache_settings = settings.get("review_cache", {})
+    if not cache_settings.get("enabled", True):
+        return None
+    return ReviewCache(
+        Path(cache_settings.get("path") or Path(output_dir) / ".review-cache.sqlite")
+    )
+
+def _close_review_cache(review_cache: Optional[ReviewCache], logger: logging.Logger) -> None:
+    if review_cache is None:
+        return
+    logger.info(
+        "Review cache: %d pull requests unchanged, %d fetched",
+        review_cache.hits,
+        review_cache.misses,
+    )
+    review_cache.close()
+
+def _close_identities(identities: Optional[IdentityResolver], logger: logging.Logger) -> None:
+    if identities is None:
+        return
+    if identities.lookups:
+        logger.info("Looked up %d commit emails", identities.lookups)
+    identities.close()
+
+def _build_budget(
+    args: argparse.Namespace, settings: Dict[str, Any]
+) -> Optional[RequestBudget]:
+    budget_settings = settings.get("budget", {})
+    max_requests = args.request_budget or budget_settings.get("requests")
+    deadline = args.deadline or budget_settings.get("deadline")
+    if max_requests is None and deadline is None:
+        return None
+    return RequestBudget(
+        max_requests=int(max_requests) if max_requests is not None else None,
+        deadline_seconds=parse_deadline(str(deadline)) if deadline is not None else None,
+        quota_reserve=int(budget_settings.get("quota_reserve", 0)),
+    )
+
+def _exclude_repos(
+    repos: List[str], exclusions: Optional[ExclusionRules], logger: logging.Logger
+) -> List[str]:
+    if exclusions is None:
+        return repos
+    kept = [r for r in repos if not exclusions.skip_repo(r)]
+    if len(kept) < len(repos):
+        logger.info("Excluded %d repositories by exclude.repos", len(repos) - len(kept))
+    if not kept:
+        raise RuntimeError("All repositories are excluded by the exclude.repos settings")
+    return kept
+
+def _require_token() -> str:
     token = os.getenv("GITHUB_TOKEN")
     if not token:
         raise RuntimeError(
             "GITHUB_TOKEN environment variable is required to authenticate with GitHub."
         )
+    return token
 
-    organization = args.organization or settings.get("organization")
-    if not organization:
-        raise RuntimeError("Organization name must be provided via --org or settings.")
+def _run(
+    args: argparse.Namespace,
+    settings: Dict[str, Any],
+    logger: logging.Logger,
+    metrics: Optional[RunMetrics],
+    metrics_textfile: Optional[str],
+) -> None:
+    token = _require_token()
+
+    if args.shard_role:
+        _run_sharded(args, settings, logger, metrics, token)
+        return
+
+    organizations = _resolve_organizations(args, settings)
+    # Label identifying the run in checkpoints; also the owner of bare repository keys
+    organization = ",".join(organizations)
 
     # Resolve repositories
     repos: List[str]
@@ -111,70 +607,485 @@ def main() -> None:
         repos = args.repos
     else:
         repos = settings.get("repositories") or []
+    if len(organizations) > 1 and any("/" not in r for r in repos):
+        raise RuntimeError(
+            "Repositories must be given as owner/name when using several organizations."
+        )
 
-    client = GitHubClient(
-        token=token,
-        base_url=settings.get("github_api", {}).get("base_url", "https://api.github.com"),
-        per_page=int(settings.get("github_api", {}).get("per_page", 100)),
-        logger=logger,
-    )
+    # One client, connection pool and budget serve every organization
+    client = _build_client(token, settings, logger, metrics)
+    budget = _build_budget(args, settings)
+    client.budget = budget
 
+    repo_meta: Dict[str, Dict[str, Any]] = {}
+    listing_requests = 0
     if not repos:
-        logger.info("No repositories specified, fetching all repositories for %s", organization)
-        repos = client.get_org_repos(organization)
+        with _phase(metrics, "list_repos"):
+            for org in organizations:
+                logger.info("No repositories specified, fetching all repositories for %s", org)
+                listing = client.list_org_repositories(org)
+                listing_requests += max(1, math.ceil(len(listing) / client.per_page))
+                for r in listing:
+                    key = r["name"] if len(organizations) == 1 else f"{org}/{r['name']}"
+                    repo_meta[key] = r
+        repos = list(repo_meta)
         if not repos:
             raise RuntimeError(f"No repositories found for organization {organization}")
+    repos = _exclude_repos(repos, client.exclusions, logger)
 
-    # Date range
-    preset = args.preset or settings.get("time_range", {}).get("preset")
-    since_str = args.since or settings.get("time_range", {}).get("since")
-    until_str = args.until or settings.get("time_range", {}).get("until")
+    since, until = _resolve_window(args, settings)
 
-    date_range = parse_date_range(preset=preset, since_str=since_str, until_str=until_str)
-    since, until = date_range.since, date_range.until
-    time_range_meta = {
-        "since": since.date().isoformat(),
-        "until": until.date().isoformat(),
-    }
+    if args.plan:
+        _plan_run(
+            args, settings, logger, client, organization, repos, repo_meta,
+            listing_requests, since, until,
+        )
+        return
+
+    # Checkpointing: every completed repository is persisted so that
+    # --resume can skip it after a crash. Budgeted runs collect repositories
+    # in several partial passes, so they are not checkpointed.
+    checkpoint_dir = Path(args.checkpoint_dir or Path(args.output_dir) / ".checkpoint")
+    checkpoint: Optional[RunCheckpoint] = None
+    completed: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    if budget is not None:
+        if args.resume:
+            logger.warning("--resume is ignored when collecting under a request budget")
+    elif args.resume:
+        checkpoint = RunCheckpoint.resume(checkpoint_dir, organization)
+        if checkpoint is None:
+            logger.warning("No checkpoint found in %s; starting a fresh run", checkpoint_dir)
+        else:
+            # The window is pinned by the checkpoint so presets such as
+            # last_30_days do not drift between the original run and the resume.
+            since, until = checkpoint.since, checkpoint.until
+            completed = checkpoint.completed_repos()
+            logger.info(
+                "Resuming from %s: %d repositories already collected",
+                checkpoint_dir,
+                len(completed),
+            )
+    if checkpoint is None and budget is None:
+        checkpoint = RunCheckpoint.start(checkpoint_dir, organization, since, until)
+    client.checkpoint = checkpoint
+
+    archive_dir = args.event_archive or settings.get("event_archive", {}).get("directory")
+    event_sink: Optional[EventArchiveWriter] = None
+    if archive_dir:
+        # Append unless asked to reset; a resumed run always appends so it
+        # keeps the events of repositories it already committed
+        event_sink = EventArchiveWriter(
+            Path(archive_dir), append=bool(completed) or not args.reset_event_archive
+        )
+        client.event_sink = event_sink
 
     logger.info("Using date range %s to %s", since.isoformat(), until.isoformat())
 
+    # Reviews of pull requests that have not changed since the last run are
+    # read back instead of fetched again
+    review_cache = _open_review_cache(settings, args.output_dir)
+    client.review_cache = review_cache
+    # Commits whose email is not linked to an account are credited by email
+    identities = IdentityResolver.from_settings(settings, args.output_dir)
+    client.identities = identities
+
+    # Repositories are scored as they finish; progress.jsonl shows them as they land
+    pipeline = _new_pipeline(args, settings, logger, total=len(repos), progressive=True)
+    for repo_name in repos:
+        if repo_name in completed:
+            pipeline.add(repo_name, completed[repo_name])
+
+    api_settings = settings.get("github_api", {})
+    repo_stats = RepoStatsStore(Path(args.output_dir) / ".repo-stats.json")
+
+    # A closed window cannot gain events, so a repository whose activity
+    # fingerprint is unchanged since it was collected is not collected again
+    memo, fingerprints = _open_repo_memo(args, settings, repos, repo_meta, until, event_sink)
+
+    def on_repo_done(
+        repo_name: str, repo_metrics: Optional[Dict[str, Dict[str, Any]]]
+    ) -> None:
+        if event_sink is not None:
+            if repo_metrics is not None:
+                event_sink.commit_repo(*_split_repo(repo_name, organization))
+            else:
+                event_sink.discard_repo(*_split_repo(repo_name, organization))
+        if repo_metrics is not None:
+            if checkpoint is not None:
+                checkpoint.save_repo(repo_name, repo_metrics)
+            repo_stats.record(*_split_repo(repo_name, organization), repo_metrics, since, until)
+            _memoize(
+                memo, fingerprints, client.incomplete, client.unresolved,
+                organization, repo_name, repo_metrics, since, until,
+            )
+            # Folded into the leaderboards here; the collectors keep no copy
+            pipeline.add(repo_name, repo_metrics)
+        if metrics is not None:
+            metrics.repo_processed()
+            if metrics_textfile:
+                metrics.write_textfile(Path(metrics_textfile))
+
+    pending_repos = [r for r in repos if r not in completed]
+    # Resumed repositories are scored; their raw metrics are not needed any more
+    completed.clear()
+    if memo is not None:
+        collect_repos = []
+        for repo_name in pending_repos:
+            fingerprint = fingerprints.get(repo_name)
+            memoized = (
+                memo.get(_memo_key(repo_name, organization), since, until, fingerprint)
+                if fingerprint
+                else None
+            )
+            if memoized is None:
+                collect_repos.append(repo_name)
+                continue
+            if checkpoint is not None:
+                checkpoint.save_repo(repo_name, memoized)
+            pipeline.add(repo_name, memoized)
+            if metrics is not None:
+                metrics.repo_processed()
+        logger.info(
+            "Reused memoized metrics of %d repositories with unchanged activity",
+            len(pending_repos) - len(collect_repos),
+        )
+        pending_repos = collect_repos
+
+    # Cost estimates from the previous run's activity, else from the listing
+    endpoint_costs = {
+        repo_name: estimate_endpoint_costs(
+            repo_meta.get(repo_name),
+            repo_stats.get(*_split_repo(repo_name, organization)),
+            since,
+            until,
+            per_page=int(api_settings.get("per_page", 100)),
+        )
+        for repo_name in pending_repos
+    }
+
     # Collect metrics per repo
-    per_repo_metrics: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    use_async = args.use_async or bool(api_settings.get("async", False))
+    completeness: Optional[Dict[str, Any]] = None
+    try:
+        with _phase(metrics, "collect"):
+            if budget is not None:
+                if use_async:
+                    logger.warning("Budgeted runs use the synchronous client; ignoring --async")
+                # Passes fill in repositories piecemeal, so they are scored at the end
+                per_repo_metrics, completeness = _collect_budgeted(
+                    client,
+                    organization,
+                    pending_repos,
+                    endpoint_costs,
+                    since,
+                    until,
+                    budget,
+                    logger,
+                    event_sink,
+                )
+                logger.info(
+                    "Collection %s after %d requests", completeness["status"], budget.used
+                )
+                for repo_name in repos:
+                    repo_metrics = per_repo_metrics.pop(repo_name, None)
+                    if repo_metrics is None:
+                        continue
+                    if completeness["status"] == "complete":
+                        owner, name = _split_repo(repo_name, organization)
+                        repo_stats.record(owner, name, repo_metrics, since, until)
+                        _memoize(
+                            memo, fingerprints, client.incomplete, client.unresolved,
+                            organization, repo_name, repo_metrics, since, until,
+                        )
+                    pipeline.add(repo_name, repo_metrics)
+            elif use_async:
+                concurrency = args.concurrency or int(api_settings.get("concurrency", 32))
+                scheduling_settings = settings.get("scheduling", {})
+                tasks = plan_tasks(
+                    pending_repos,
+                    endpoint_costs,
+                    since,
+                    until,
+                    split_cost=float(scheduling_settings.get("split_cost", DEFAULT_SPLIT_COST)),
+                    slices=int(scheduling_settings.get("slices", DEFAULT_SLICES)),
+                )
+                asyncio.run(
+                    _collect_async(
+                        token,
+                        settings,
+                        concurrency,
+                        organization,
+                        tasks,
+                        since,
+                        until,
+                        logger,
+                        metrics,
+                        checkpoint,
+                        event_sink,
+                        review_cache,
+                        identities,
+                        client.incomplete,
+                        client.unresolved,
+                        on_repo_done,
+                    )
+                )
+            else:
+                ordered = sorted(
+                    pending_repos, key=lambda r: sum(endpoint_costs[r].values()), reverse=True
+                )
+                _collect_sync(client, organization, ordered, since, until, logger, on_repo_done)
+    finally:
+        pipeline.close()
+        _close_review_cache(review_cache, logger)
+        _close_identities(identities, logger)
+        if memo is not None:
+            memo.close()
+    repo_stats.save()
+
+    # Reports list repositories in the requested order, not collection order
+    _write_reports(args, settings, logger, metrics, pipeline, repos, since, until, completeness)
+
+    if checkpoint is not None:
+        checkpoint.discard()
+
+def _open_repo_memo(
+    args: argparse.Namespace,
+    settings: Dict[str, Any],
+    repos: List[str],
+    repo_meta: Dict[str, Dict[str, Any]],
+    until: datetime,
+    event_sink: Optional[EventArchiveWriter],
+) -> Tuple[Optional[RepoMemo], Dict[str, str]]:
+    """
+    Open the repository memo with each repository's activity fingerprint,
+    or return (None, {}) when memoized results cannot be used: an open
+    window, no org listing to fingerprint from, or an event archive that
+    needs every event.
+    """
+    memo_settings = settings.get("repo_memo", {})
+    if not memo_settings.get("enabled", True) or event_sink is not None:
+        return None, {}
+    settle = timedelta(hours=float(memo_settings.get("settle_hours", 24)))
+    if not window_is_closed(until, settle=settle):
+        return None, {}
+    # Settings that change what gets counted invalidate every entry
+    salt = json.dumps(
+        [settings.get("exclude"), (settings.get("identities") or {}).get("aliases")],
+        sort_keys=True,
+    )
+    fingerprints: Dict[str, str] = {}
+    for repo_name in repos:
+        fingerprint = activity_fingerprint(repo_meta.get(repo_name), salt)
+        if fingerprint is not None:
+            fingerprints[repo_name] = fingerprint
+    if not fingerprints:
+        return None, {}
+    path = Path(memo_settings.get("path") or Path(args.output_dir) / ".repo-memo.sqlite")
+    return RepoMemo(path), fingerprints
+
+def _memo_key(repo_name: str, organization: str) -> str:
+    return "/".join(_split_repo(repo_name, organization))
+
+def _memoize(
+    memo: Optional[RepoMemo],
+    fingerprints: Dict[str, str],
+    incomplete: Set[str],
+    unresolved: Set[str],
+    organization: str,
+    repo_name: str,
+    repo_metrics: Dict[str, Dict[str, Any]],
+    since: datetime,
+    until: datetime,
+) -> None:
+    if memo is None or repo_name not in fingerprints:
+        return
+    key = _memo_key(repo_name, organization)
+    # A failed endpoint or email lookup leaves the metrics short; collect it
+    # again next run
+    if key in incomplete or key in unresolved:
+        return
+    memo.put(key, since, until, fingerprints[repo_name], repo_metrics)
+
+def _plan_run(
+    args: argparse.Namespace,
+    settings: Dict[str, Any],
+    logger: logging.Logger,
+    client: GitHubClient,
+    organization: str,
+    repos: List[str],
+    repo_meta: Dict[str, Dict[str, Any]],
+    listing_requests: int,
+    since: datetime,
+    until: datetime,
+) -> None:
+    """
+    Estimate requests per endpoint and the run time, without collecting.
+
+    The largest repositories get search probes (closed issues and PRs ever,
+    PRs updated since the window start) as far as the search quota allows;
+    the rest fall back to the scheduler's estimates.
+    """
+    api_settings = settings.get("github_api", {})
+    plan_settings = settings.get("plan", {})
+    per_page = client.per_page
+    rate_limit = client.get_rate_limit()
+
+    repo_stats = RepoStatsStore(Path(args.output_dir) / ".repo-stats.json")
+    costs = {
+        repo_name: estimate_endpoint_costs(
+            repo_meta.get(repo_name),
+            repo_stats.get(*_split_repo(repo_name, organization)),
+            since,
+            until,
+            per_page=per_page,
+        )
+        for repo_name in repos
+    }
+
+    search_remaining = int((rate_limit.get("search") or {}).get("remaining", 0))
+    max_probed = min(int(plan_settings.get("max_search_probes", 30)), search_remaining // 2)
+    probed = sorted(repos, key=lambda r: sum(costs[r].values()), reverse=True)[:max_probed]
+    lower = timestamp_bounds(since, until)[0]
+
+    estimates: List[RepoEstimate] = []
+    probe_seconds: List[float] = []
     for repo_name in repos:
+        owner, name = _split_repo(repo_name, organization)
+        source = "history" if repo_stats.get(owner, name) else "listing"
+        fallback = estimate_from_costs(repo_name, costs[repo_name], source)
+        if repo_name not in probed:
+            estimates.append(fallback)
+            continue
+        scope = f"repo:{owner}/{name}"
         try:
-            metrics = client.collect_repository_contributions(
-                owner=organization,
-                repo=repo_name,
-                since=since,
-                until=until,
-            )
+            started = time.perf_counter()
+            closed_total = client.search_total_count(f"{scope} is:closed")
+            # Every PR the updated-sorted listing returns gets its reviews fetched
+            pulls_updated = client.search_total_count(f"{scope} is:pr updated:>={lower}")
+            probe_seconds.append((time.perf_counter() - started) / 2)
         except RuntimeError as e:
-            logger.error("Error collecting contributions for %s/%s: %s", organization, repo_name, e)
+            logger.warning("Search probe failed for %s: %s", repo_name, e)
+            estimates.append(fallback)
             continue
-        if metrics:
-            per_repo_metrics[repo_name] = metrics
+        estimates.append(
+            estimate_from_search(
+                repo_name, closed_total, pulls_updated, pulls_updated, fallback.commits, per_page
+            )
+        )
 
-    if not per_repo_metrics:
-        raise RuntimeError("No metrics collected for any repository.")
+    # Probe round trips are the best latency sample available
+    if probe_seconds:
+        latency = sum(probe_seconds) / len(probe_seconds)
+    else:
+        latency = float(plan_settings.get("latency_seconds", DEFAULT_LATENCY_SECONDS))
+    use_async = args.use_async or bool(api_settings.get("async", False))
+    concurrency = (args.concurrency or int(api_settings.get("concurrency", 32))) if use_async else 1
 
-    # Filter repositories with very low activity
-    per_repo_metrics = filter_repositories_by_activity(
-        per_repo_metrics, min_events=args.min_events
+    plan = build_plan(estimates, rate_limit, listing_requests, concurrency, latency)
+    plan["organization"] = organization
+    plan["timeRange"] = {"since": since.isoformat(), "until": until.isoformat()}
+    plan["latencySeconds"] = round(latency, 3)
+    print(format_plan(plan))
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    save_json(plan, output_dir / "plan.json")
+    logger.info("Wrote plan to %s", output_dir / "plan.json")
+
+def _resolve_organizations(args: argparse.Namespace, settings: Dict[str, Any]) -> List[str]:
+    organizations = args.organizations or settings.get("organizations") or []
+    if not organizations and settings.get("organization"):
+        organizations = [settings["organization"]]
+    if not organizations:
+        raise RuntimeError("Organization name must be provided via --org or settings.")
+    # Keep the given order, drop repeats
+    return list(dict.fromkeys(organizations))
+
+def _resolve_window(
+    args: argparse.Namespace, settings: Dict[str, Any]
+) -> Tuple[datetime, datetime]:
+    preset = args.preset or settings.get("time_range", {}).get("preset")
+    since_str = args.since or settings.get("time_range", {}).get("since")
+    until_str = args.until or settings.get("time_range", {}).get("until")
+
+    date_range = parse_date_range(preset=preset, since_str=since_str, until_str=until_str)
+    return date_range.since, date_range.until
+
+def _new_pipeline(
+    args: argparse.Namespace,
+    settings: Dict[str, Any],
+    logger: logging.Logger,
+    total: Optional[int] = None,
+    progressive: bool = False,
+) -> LeaderboardPipeline:
+    leaderboards = IncrementalLeaderboards(
+        top_n=args.top_n,
+        weights=ScoringWeights.from_settings(settings),
+        hierarchy=RollupHierarchy.from_settings(settings),
+    )
+    return LeaderboardPipeline(
+        leaderboards,
+        min_events=args.min_events,
+        progress_path=Path(args.output_dir) / PROGRESS_FILE if progressive else None,
+        total=total,
+        logger=logger,
+    )
+
+def _score_and_report(
+    args: argparse.Namespace,
+    settings: Dict[str, Any],
+    logger: logging.Logger,
+    metrics: Optional[RunMetrics],
+    per_repo_metrics: Dict[str, Dict[str, Dict[str, Any]]],
+    since: datetime,
+    until: datetime,
+    completeness: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Score and report metrics that were collected elsewhere (sharded merge).
+    """
+    pipeline = _new_pipeline(args, settings, logger)
+    with _phase(metrics, "score"):
+        for repo_name, repo_metrics in per_repo_metrics.items():
+            pipeline.add(repo_name, repo_metrics)
+    _write_reports(
+        args, settings, logger, metrics, pipeline, list(per_repo_metrics), since, until, completeness
     )
-    if not per_repo_metrics:
+
+def _write_reports(
+    args: argparse.Namespace,
+    settings: Dict[str, Any],
+    logger: logging.Logger,
+    metrics: Optional[RunMetrics],
+    pipeline: LeaderboardPipeline,
+    repo_order: List[str],
+    since: datetime,
+    until: datetime,
+    completeness: Optional[Dict[str, Any]] = None,
+) -> None:
+    if not pipeline.received:
+        raise RuntimeError("No metrics collected for any repository.")
+    if not pipeline.added:
         raise RuntimeError(
             "All repositories filtered out due to insufficient activity. "
             "Try lowering --min-events."
         )
 
-    # Compute scores and leaderboards
-    (
-        per_repo_scores,
-        org_scores,
-        per_repo_leaderboards,
-        org_leaderboard,
-    ) = compute_all_leaderboards(per_repo_metrics, top_n=args.top_n)
+    time_range_meta = {
+        "since": since.date().isoformat(),
+        "until": until.date().isoformat(),
+    }
+
+    leaderboards = pipeline.leaderboards
+    with _phase(metrics, "score"):
+        # Scores were folded in as repositories arrived; only ranking is left
+        leaderboards.finalize(repo_order)
+        org_leaderboard = leaderboards.org_leaderboard()
+        # Multi-organization runs key repositories "owner/name"; the overall
+        # leaderboard then spans organizations and each one gets its own.
+        organization_leaderboards = leaderboards.organization_leaderboards() or None
+        hierarchy = leaderboards.hierarchy
+        group_leaderboards = leaderboards.group_leaderboards()
 
     organization_label = (
         settings.get("leaderboard", {}).get("organization_label") or "Organization All-stars"
@@ -182,29 +1093,189 @@ def main() -> None:
 
     generated_at = datetime.utcnow()
 
-    leaderboard_report = generate_leaderboard_report(
-        organization_label=organization_label,
-        per_repo_leaderboards=per_repo_leaderboards,
-        org_leaderboard=org_leaderboard,
-        time_range=time_range_meta,
-        generated_at=generated_at,
-    )
-
-    detailed_report = generate_detailed_metrics_report(
-        per_repo_scores=per_repo_scores,
-        time_range=time_range_meta,
-        generated_at=generated_at,
-    )
-
     output_dir = Path(args.output_dir)
     top_contributors_path = output_dir / "top-contributors.json"
     detailed_metrics_path = output_dir / "detailed-metrics.json"
 
-    save_json(leaderboard_report, top_contributors_path)
-    save_json(detailed_report, detailed_metrics_path)
+    with _phase(metrics, "report"):
+        leaderboard_report = generate_leaderboard_report(
+            organization_label=organization_label,
+            per_repo_leaderboards=leaderboards.per_repo_leaderboards,
+            org_leaderboard=org_leaderboard,
+            time_range=time_range_meta,
+            generated_at=generated_at,
+            completeness=completeness,
+            organization_leaderboards=organization_leaderboards,
+        )
+
+        detailed_report = generate_detailed_metrics_report(
+            per_repo_scores=leaderboards.per_repo_scores,
+            time_range=time_range_meta,
+            generated_at=generated_at,
+        )
+
+        save_json(leaderboard_report, top_contributors_path)
+        save_json(detailed_report, detailed_metrics_path)
+
+        group_report: Optional[Dict[str, Any]] = None
+        if hierarchy is not None:
+            group_report = generate_group_leaderboard_report(
+                group_leaderboards=group_leaderboards,
+                kinds={name: hierarchy.kind(name) for name in hierarchy.groups},
+                parents=hierarchy.parents,
+                time_range=time_range_meta,
+                generated_at=generated_at,
+            )
+            save_json(group_report, output_dir / "group-leaderboards.json")
+            logger.info("Wrote %d group leaderboards", len(group_leaderboards))
+
+        publish_settings = settings.get("publish", {})
+        if publish_settings.get("enabled", True):
+            # Per-repository partitions without timestamps: only the ones whose
+            # content changed are rewritten, so syncing them scales with change
+            partitions = build_report_partitions(
+                organization_label=organization_label,
+                org_leaderboard=org_leaderboard,
+                per_repo_leaderboards=leaderboards.per_repo_leaderboards,
+                detailed_rows=generate_detailed_metrics_report(leaderboards.per_repo_scores),
+                organization_leaderboards=organization_leaderboards,
+                groups=group_report["groups"] if group_report is not None else None,
+            )
+            manifest_metadata: Dict[str, Any] = {"timeRange": time_range_meta}
+            if completeness:
+                manifest_metadata["completeness"] = completeness
+            publish_dir = Path(publish_settings.get("directory") or output_dir / "reports")
+            counts = publish_partitions(publish_dir, partitions, manifest_metadata, generated_at)
+            logger.info(
+                "Published %d report partitions to %s (%d unchanged, %d removed)",
+                counts["written"],
+                publish_dir,
+                counts["unchanged"],
+                counts["removed"],
+            )
 
     logger.info("Wrote leaderboard to %s", top_contributors_path)
     logger.info("Wrote detailed metrics to %s", detailed_metrics_path)
 
+def _shard_worker_process(
+    queue_path: str,
+    token: str,
+    settings: Dict[str, Any],
+    log_level: str,
+    worker_id: str,
+    output_dir: str,
+) -> None:
+    logger = setup_logging(log_level)
+    review_cache = _open_review_cache(settings, output_dir)
+    identities = IdentityResolver.from_settings(settings, output_dir)
+    client = _build_client(token, settings, logger, None, review_cache, identities)
+    try:
+        run_worker(
+            WorkQueue.from_settings(Path(queue_path), settings),
+            client,
+            worker_id=worker_id,
+            logger=logger,
+        )
+    finally:
+        _close_review_cache(review_cache, logger)
+        _close_identities(identities, logger)
+
+def _run_sharded(
+    args: argparse.Namespace,
+    settings: Dict[str, Any],
+    logger: logging.Logger,
+    metrics: Optional[RunMetrics],
+    token: str,
+) -> None:
+    """
+    Sharded execution: a coordinator fills a work queue, independent workers
+    (each with their own token) drain it, and a merge step scores the results.
+    """
+    role = args.shard_role
+    sharding_settings = settings.get("sharding", {})
+    queue_path = Path(
+        args.work_queue
+        or sharding_settings.get("queue")
+        or Path(args.output_dir) / "work-queue.sqlite"
+    )
+    queue = WorkQueue.from_settings(queue_path, settings)
+
+    if role == "worker":
+        review_cache = _open_review_cache(settings, args.output_dir)
+        identities = IdentityResolver.from_settings(settings, args.output_dir)
+        client = _build_client(token, settings, logger, metrics, review_cache, identities)
+        try:
+            run_worker(queue, client, logger=logger)
+        finally:
+            _close_review_cache(review_cache, logger)
+            _close_identities(identities, logger)
+        return
+
+    if role in ("coordinator", "local"):
+        organizations = _resolve_organizations(args, settings)
+        organization = ",".join(organizations)
+        client = _build_client(token, settings, logger, metrics)
+        names = args.repos or settings.get("repositories") or []
+        listing_by_name: Dict[str, Dict[str, Any]] = {}
+        with _phase(metrics, "list_repos"):
+            for org in organizations:
+                for r in client.list_org_repositories(org):
+                    key = r["name"] if len(organizations) == 1 else f"{org}/{r['name']}"
+                    listing_by_name[key] = r
+        if not names:
+            names = list(listing_by_name)
+        if not names:
+            raise RuntimeError(f"No repositories found for organization {organization}")
+        names = _exclude_repos(names, client.exclusions, logger)
+        since, until = _resolve_window(args, settings)
+        repo_stats = RepoStatsStore(Path(args.output_dir) / ".repo-stats.json")
+        weights = {
+            name: sum(
+                estimate_endpoint_costs(
+                    listing_by_name.get(name),
+                    repo_stats.get(*_split_repo(name, organization)),
+                    since,
+                    until,
+                    per_page=client.per_page,
+                ).values()
+            )
+            for name in names
+        }
+        count = queue.initialize(
+            organization, since, until, [(name, weights.get(name, 0.0)) for name in names]
+        )
+        logger.info("Queued %d repositories in %s", count, queue_path)
+
+    if role == "local":
+        workers = args.workers or int(sharding_settings.get("workers", 4))
+        tokens = split_tokens(os.getenv("GITHUB_TOKENS")) or [token]
+        processes = [
+            multiprocessing.Process(
+                target=_shard_worker_process,
+                args=(
+                    str(queue_path),
+                    tokens[i % len(tokens)],
+                    settings,
+                    args.log_level,
+                    f"{default_worker_id()}/{i}",
+                    args.output_dir,
+                ),
+            )
+            for i in range(workers)
+        ]
+        with _phase(metrics, "collect"):
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+    if role in ("merge", "local"):
+        organization, since, until = queue.run_info()
+        progress = queue.progress()
+        unfinished = sum(n for status, n in progress.items() if status != "done")
+        if unfinished:
+            logger.warning("Merging with %d unfinished units: %s", unfinished, progress)
+        _score_and_report(args, settings, logger, metrics, queue.results(), since, until)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
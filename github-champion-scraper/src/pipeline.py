@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .filters import filter_repositories_by_activity
+from .scoring import IncrementalLeaderboards
+
+PROGRESS_FILE = "progress.jsonl"
+
+class LeaderboardPipeline:
+    """
+    Score stage fed directly by the collectors.
+
+    Every repository is filtered, scored and folded into the running
+    leaderboards as soon as it finishes collecting, so scoring overlaps the
+    network waits of the repositories still in flight and the collectors can
+    drop its raw metrics. When `progress_path` is set, one JSON line per
+    repository is appended there with its leaderboard and a snapshot of the
+    organization leaderboard so far.
+    """
+
+    def __init__(
+        self,
+        leaderboards: IncrementalLeaderboards,
+        min_events: int = 1,
+        progress_path: Optional[Path] = None,
+        total: Optional[int] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.leaderboards = leaderboards
+        self.min_events = min_events
+        self.total = total
+        self.log = logger or logging.getLogger("github_champion.pipeline")
+        # Repositories that produced any metrics, before the activity filter
+        self.received = 0
+        self._progress = None
+        if progress_path is not None:
+            progress_path.parent.mkdir(parents=True, exist_ok=True)
+            self._progress = progress_path.open("w", encoding="utf-8")
+
+    @property
+    def added(self) -> int:
+        return len(self.leaderboards.per_repo_scores)
+
+    def add(self, repo_name: str, contributors: Dict[str, Dict[str, Any]]) -> None:
+        if not contributors:
+            return
+        self.received += 1
+        if not filter_repositories_by_activity({repo_name: contributors}, self.min_events):
+            self.log.debug("Skipping %s: fewer than %d events", repo_name, self.min_events)
+            return
+        leaderboard = self.leaderboards.add_repo(repo_name, contributors)
+        if self._progress is not None:
+            entry: Dict[str, Any] = {
+                "repository": repo_name,
+                "leaderboard": leaderboard,
+                "organization": self.leaderboards.org_leaderboard(),
+                "repositoriesScored": self.added,
+            }
+            if self.total is not None:
+                entry["repositoriesTotal"] = self.total
+            self._progress.write(json.dumps(entry) + "\n")
+            self._progress.flush()
+
+    def close(self) -> None:
+        if self._progress is not None:
+            self._progress.close()
+            self._progress = None
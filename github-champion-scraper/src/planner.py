@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Rough per-request latency used when nothing better is configured
+DEFAULT_LATENCY_SECONDS = 0.35
+
+@dataclass
+class RepoEstimate:
+    """
+    Estimated requests per endpoint for collecting one repository.
+    `source` says where the numbers come from: "search" probes, "history"
+    (the previous run's rates) or "listing" (size and open issue counts).
+    """
+
+    repo: str
+    issues: int
+    pulls: int
+    reviews: int
+    commits: int
+    source: str
+
+    @property
+    def total(self) -> int:
+        return self.issues + self.pulls + self.reviews + self.commits
+
+    def chain(self) -> int:
+        """
+        Longest run of requests that must happen one after another.
+        """
+        # Pages of one listing are sequential; reviews fan out after the pulls
+        return max(self.issues, self.pulls + (1 if self.reviews else 0), self.commits)
+
+def _pages(items: float, per_page: int) -> int:
+    return max(1, math.ceil(items / per_page))
+
+def estimate_from_search(
+    repo: str,
+    closed_total: int,
+    pulls_since: int,
+    pulls_in_window: int,
+    commit_requests: int,
+    per_page: int,
+) -> RepoEstimate:
+    """
+    Requests for one repository from search `total_count` probes.
+
+    The closed-issues listing is not limited by date, so it pages through
+    every closed issue and PR ever; the PR listing is sorted by last update
+    and stops at the start of the window (`pulls_since` PRs); reviews cost
+    one request per PR in `pulls_in_window`, the PRs updated in the window,
+    before any of them are served from the review cache.
+    """
+    return RepoEstimate(
+        repo=repo,
+        issues=_pages(closed_total, per_page),
+        pulls=_pages(pulls_since + 1, per_page),
+        reviews=pulls_in_window,
+        commits=commit_requests,
+        source="search",
+    )
+
+def estimate_from_costs(repo: str, costs: Dict[str, float], source: str) -> RepoEstimate:
+    """
+    Wrap a scheduling.estimate_endpoint_costs breakdown.
+    """
+    pulls = int(math.ceil(costs.get("pulls", 1.0)))
+    return RepoEstimate(
+        repo=repo,
+        issues=int(math.ceil(costs.get("issues", 1.0))),
+        pulls=pulls,
+        # estimate_endpoint_costs counts the PR listing again for reviews
+        reviews=max(int(math.ceil(costs.get("reviews", 0.0))) - pulls, 0),
+        commits=int(math.ceil(costs.get("commits", 1.0))),
+        source=source,
+    )
+
+def build_plan(
+    estimates: List[RepoEstimate],
+    rate_limit: Dict[str, Any],
+    listing_requests: int,
+    concurrency: int,
+    latency_seconds: float = DEFAULT_LATENCY_SECONDS,
+) -> Dict[str, Any]:
+    """
+    Total request counts, quota fit and expected wall-clock time.
+
+    `concurrency` is 1 for the synchronous client; with more, the run is
+    bounded by either total requests spread over the concurrency or the
+    longest sequential chain of a single repository.
+    """
+    totals = {
+        "issues": sum(e.issues for e in estimates),
+        "pulls": sum(e.pulls for e in estimates),
+        "reviews": sum(e.reviews for e in estimates),
+        "commits": sum(e.commits for e in estimates),
+    }
+    total_requests = listing_requests + sum(totals.values())
+    longest_chain = max((e.chain() for e in estimates), default=0)
+    seconds = latency_seconds * max(
+        total_requests / max(concurrency, 1),
+        longest_chain + listing_requests,
+    )
+
+    core = rate_limit.get("core") or {}
+    remaining = core.get("remaining")
+    plan: Dict[str, Any] = {
+        "repositories": len(estimates),
+        "requests": {"listing": listing_requests, **totals, "total": total_requests},
+        "concurrency": concurrency,
+        "estimatedSeconds": round(seconds, 1),
+        "rateLimit": {"remaining": remaining, "limit": core.get("limit")},
+        "perRepository": [
+            {
+                "repository": e.repo,
+                "issues": e.issues,
+                "pulls": e.pulls,
+                "reviews": e.reviews,
+                "commits": e.commits,
+                "total": e.total,
+                "source": e.source,
+            }
+            for e in sorted(estimates, key=lambda e: e.total, reverse=True)
+        ],
+    }
+    if remaining is not None:
+        plan["fitsQuota"] = total_requests <= int(remaining)
+        if core.get("reset"):
+            reset = datetime.fromtimestamp(int(core["reset"]), tz=timezone.utc)
+            plan["rateLimit"]["reset"] = reset.isoformat()
+    return plan
+
+def format_plan(plan: Dict[str, Any], top: Optional[int] = 20) -> str:
+    """
+    Human-readable rendering of a plan from build_plan.
+    """
+    requests = plan["requests"]
+    lines = [
+        f"Plan for {plan['repositories']} repositories "
+        f"(concurrency {plan['concurrency']}):",
+        f"  {'repository':<40} {'issues':>7} {'pulls':>7} {'reviews':>8} {'commits':>8} {'total':>8}  source",
+    ]
+    rows = plan["perRepository"]
+    for row in rows[:top] if top else rows:
+        lines.append(
+            f"  {row['repository'][:40]:<40} {row['issues']:>7} {row['pulls']:>7} "
+            f"{row['reviews']:>8} {row['commits']:>8} {row['total']:>8}  {row['source']}"
+        )
+    if top and len(rows) > top:
+        lines.append(f"  ... {len(rows) - top} more")
+    lines.append(
+        f"  {'TOTAL (+' + str(requests['listing']) + ' listing)':<40} {requests['issues']:>7} "
+        f"{requests['pulls']:>7} {requests['reviews']:>8} {requests['commits']:>8} "
+        f"{requests['total']:>8}"
+    )
+    minutes, seconds = divmod(int(plan["estimatedSeconds"]), 60)
+    lines.append(f"Estimated wall-clock time: {minutes}m{seconds:02d}s")
+    rate = plan["rateLimit"]
+    if rate.get("remaining") is not None:
+        verdict = "fits within" if plan.get("fitsQuota") else "EXCEEDS"
+        reset = f", resets {rate['reset']}" if rate.get("reset") else ""
+        lines.append(
+            f"Requests {verdict} the remaining quota of {rate['remaining']}/{rate['limit']}{reset}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:  # Not available on Windows
+    import resource
+except ImportError:  # pragma: no cover - exercised only on Windows
+    resource = None  # type: ignore[assignment]
+
+SUMMARY_FILE = "profile-summary.json"
+
+def peak_rss_kib() -> Optional[int]:
+    """
+    Peak resident set size of this process so far, in KiB.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return int(peak // 1024) if sys.platform == "darwin" else int(peak)
+
+@dataclass
+class PhaseStats:
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_traced_bytes: int = 0
+    peak_rss_kib: Optional[int] = None
+    top_allocators: List[Dict[str, Any]] = field(default_factory=list)
+    top_functions: List[Dict[str, Any]] = field(default_factory=list)
+
+class PhaseProfiler:
+    """
+    Profiles pipeline phases (list_repos, collect, score, report) with
+    cProfile and tracemalloc. Repositories are filtered and scored as they
+    finish collecting, so that work is part of "collect"; "score" covers
+    the final ranking and rollups.
+
+    Each phase gets `<directory>/<phase>.pstats` (loadable with pstats or
+    snakeviz) and an entry in `profile-summary.json` with wall and CPU time,
+    peak traced Python memory, peak RSS, the lines that allocated the most
+    memory still held at the end of the phase, and the functions with the
+    highest cumulative time. A phase entered more than once is accumulated.
+    """
+
+    def __init__(self, directory: Path, top_n: int = 15, logger: Optional[logging.Logger] = None) -> None:
+        self.directory = directory
+        self.top_n = top_n
+        self.log = logger or logging.getLogger("github_champion.profiling")
+        self.phases: Dict[str, PhaseStats] = {}
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            stats = self.phases.setdefault(name, PhaseStats())
+            stats.wall_seconds += time.perf_counter() - wall
+            stats.cpu_seconds += time.process_time() - cpu
+            _, peak = tracemalloc.get_traced_memory()
+            stats.peak_traced_bytes = max(stats.peak_traced_bytes, peak)
+            stats.peak_rss_kib = peak_rss_kib()
+            after = tracemalloc.take_snapshot()
+            stats.top_allocators = self._allocators(after, before)
+            stats.top_functions = self._functions(profile)
+
+    def _allocators(
+        self, after: tracemalloc.Snapshot, before: tracemalloc.Snapshot
+    ) -> List[Dict[str, Any]]:
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+        # compare_to ranks by absolute change; only growth is of interest here
+        grown = sorted((d for d in diff if d.size_diff > 0), key=lambda d: d.size_diff, reverse=True)
+        top: List[Dict[str, Any]] = []
+        for stat in grown[: self.top_n]:
+            frame = stat.traceback[0]
+            top.append(
+                {
+                    "location": f"{frame.filename}:{frame.lineno}",
+                    "sizeDiffKiB": round(stat.size_diff / 1024, 1),
+                    "sizeKiB": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+            )
+        return top
+
+    def _functions(self, profile: cProfile.Profile) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = sorted(
+            stats.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][3],
+            reverse=True,
+        )
+        top: List[Dict[str, Any]] = []
+        for (filename, lineno, func), (_, calls, tottime, cumtime, _) in rows[: self.top_n]:
+            top.append(
+                {
+                    "function": f"{filename}:{lineno}({func})",
+                    "calls": calls,
+                    "tottime": round(tottime, 4),
+                    "cumtime": round(cumtime, 4),
+                }
+            )
+        return top
+
+    def write(self) -> Path:
+        """
+        Write per-phase pstats files and the JSON summary; returns the summary path.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, profile in self._profiles.items():
+            profile.dump_stats(str(self.directory / f"{name}.pstats"))
+        summary = {
+            name: {
+                "wallSeconds": round(stats.wall_seconds, 4),
+                "cpuSeconds": round(stats.cpu_seconds, 4),
+                "peakTracedKiB": round(stats.peak_traced_bytes / 1024, 1),
+                "peakRssKiB": stats.peak_rss_kib,
+                "topAllocators": stats.top_allocators,
+                "topFunctions": stats.top_functions,
+            }
+            for name, stats in self.phases.items()
+        }
+        path = self.directory / SUMMARY_FILE
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        for name, stats in self.phases.items():
+            self.log.info(
+                "Phase %s: %.2fs wall, %.2fs CPU, peak traced %.1f MiB, peak RSS %s MiB",
+                name,
+                stats.wall_seconds,
+                stats.cpu_seconds,
+                stats.peak_traced_bytes / 1048576,
+                f"{stats.peak_rss_kib / 1024:.1f}" if stats.peak_rss_kib is not None else "n/a",
+            )
+        return path
+
+    def close(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
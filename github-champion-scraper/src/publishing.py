@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_FILE = "manifest.json"
+ORG_PARTITION = "org.json"
+GROUPS_PARTITION = "groups.json"
+
+# Detailed-metrics keys that the partition path and the manifest already carry
+_ROW_CONTEXT = ("repository", "timeRange", "generatedAt")
+
+def repo_partition(repo_name: str) -> str:
+    """
+    Relative path of a repository's partition; "owner/name" keys nest.
+    """
+    return f"repos/{repo_name}.json"
+
+def encode_partition(data: Any) -> bytes:
+    """
+    Serialized partition content. Partitions carry no timestamps, so the same
+    data always encodes to the same bytes and hash.
+    """
+    return (json.dumps(data, indent=2, sort_keys=False) + "\n").encode("utf-8")
+
+def write_atomic(payload: bytes, path: Path) -> None:
+    """
+    Write `payload` to `path` through a temporary file and a rename, so
+    readers and sync tools never see a partially written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Opened normally rather than with mkstemp so the file gets the usual
+    # umask permissions; published reports must stay world-readable
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def build_report_partitions(
+    organization_label: str,
+    org_leaderboard: List[Dict[str, Any]],
+    per_repo_leaderboards: Dict[str, List[Dict[str, Any]]],
+    detailed_rows: List[Dict[str, Any]],
+    organization_leaderboards: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    groups: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Split the reports into partitions keyed by relative path: the
+    organization file, one file per repository with its leaderboard and
+    detailed metrics, and the group rollups when configured.
+    """
+    org: Dict[str, Any] = {"label": organization_label, "leaderboard": org_leaderboard}
+    if organization_leaderboards:
+        org["organizations"] = organization_leaderboards
+    partitions: Dict[str, Any] = {ORG_PARTITION: org}
+
+    contributors: Dict[str, List[Dict[str, Any]]] = {}
+    for row in detailed_rows:
+        entry = {k: v for k, v in row.items() if k not in _ROW_CONTEXT}
+        contributors.setdefault(row["repository"], []).append(entry)
+    for repo_name, leaderboard in per_repo_leaderboards.items():
+        partitions[repo_partition(repo_name)] = {
+            "repository": repo_name,
+            "leaderboard": leaderboard,
+            "contributors": contributors.get(repo_name, []),
+        }
+
+    if groups is not None:
+        partitions[GROUPS_PARTITION] = groups
+    return partitions
+
+def publish_partitions(
+    directory: Path,
+    partitions: Dict[str, Any],
+    metadata: Optional[Dict[str, Any]] = None,
+    generated_at: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Publish `partitions` under `directory` and rewrite the manifest.
+
+    A partition whose content hash matches the previous manifest is left
+    untouched, so its mtime is unchanged and rsync or S3 sync skip it.
+    Partitions that disappeared (e.g. a repository dropped out of the
+    leaderboards) are removed. The manifest lists every partition with its
+    SHA-256, size and the time its content last changed; it is written last,
+    so a reader that follows it never sees a partition newer than its entry.
+
+    Returns counts of written, unchanged and removed partitions.
+    """
+    manifest_path = directory / MANIFEST_FILE
+    previous: Dict[str, Dict[str, Any]] = {}
+    if manifest_path.exists():
+        with manifest_path.open("r", encoding="utf-8") as f:
+            previous = json.load(f).get("partitions", {})
+    stamp = (generated_at or datetime.utcnow()).isoformat()
+
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+    entries: Dict[str, Dict[str, Any]] = {}
+    for relative, data in partitions.items():
+        payload = encode_partition(data)
+        digest = hashlib.sha256(payload).hexdigest()
+        path = directory / relative
+        old = previous.get(relative)
+        if old is not None and old.get("sha256") == digest and path.exists():
+            entries[relative] = old
+            counts["unchanged"] += 1
+            continue
+        write_atomic(payload, path)
+        entries[relative] = {"sha256": digest, "bytes": len(payload), "updatedAt": stamp}
+        counts["written"] += 1
+
+    for relative in previous:
+        if relative not in entries:
+            (directory / relative).unlink(missing_ok=True)
+            counts["removed"] += 1
+
+    manifest: Dict[str, Any] = {"generatedAt": stamp}
+    manifest.update(metadata or {})
+    manifest["partitions"] = entries
+    write_atomic(encode_partition(manifest), manifest_path)
+    return counts
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+DETAILED_METRICS_FILE = "detailed-metrics.json"
+
+# Per-contributor fields summed when rows are rolled up
+METRIC_FIELDS = (
+    "total",
+    "issuesClosed",
+    "pullReviews",
+    "pullsCreated",
+    "additions",
+    "deletions",
+    "commits",
+)
+
+def window_key(time_range: Dict[str, str]) -> str:
+    return f"{time_range.get('since')}..{time_range.get('until')}"
+
+def _rank(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(
+        rows,
+        key=lambda r: (r["total"], r["issuesClosed"], r["pullReviews"], r["pullsCreated"]),
+        reverse=True,
+    )
+
+def _rollup(rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    totals: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        agg = totals.get(row["id"])
+        if agg is None:
+            agg = totals[row["id"]] = {"id": row["id"], **{f: 0 for f in METRIC_FIELDS}}
+        for field in METRIC_FIELDS:
+            agg[field] += row.get(field, 0)
+    for agg in totals.values():
+        agg["total"] = round(agg["total"], 2)
+    return _rank(list(totals.values()))
+
+class _WindowIndex:
+    def __init__(self, rows: List[Dict[str, Any]], hierarchy: Optional[Any]) -> None:
+        by_repo: Dict[str, List[Dict[str, Any]]] = {}
+        by_contributor: Dict[str, List[Dict[str, Any]]] = {}
+        by_group: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_repo.setdefault(row["repository"], []).append(row)
+            by_contributor.setdefault(row["id"].lower(), []).append(row)
+            if hierarchy is not None:
+                for group in hierarchy.memberships(row["repository"], row["id"]):
+                    by_group.setdefault(group, []).append(row)
+        self.repos = {repo: _rank(repo_rows) for repo, repo_rows in by_repo.items()}
+        self.contributors = by_contributor
+        self.organization = _rollup(rows)
+        self.groups = {group: _rollup(group_rows) for group, group_rows in by_group.items()}
+
+class LeaderboardIndex:
+    """
+    In-memory, per-window indexes over detailed-metrics reports: ranked rows
+    per repository, rows per contributor, and pre-ranked organization and
+    group rollups. Built once per load; queries never touch the files.
+    """
+
+    def __init__(
+        self,
+        rows_by_window: Dict[str, List[Dict[str, Any]]],
+        hierarchy: Optional[Any] = None,
+    ) -> None:
+        self.windows: Dict[str, _WindowIndex] = {
+            window: _WindowIndex(rows, hierarchy) for window, rows in rows_by_window.items()
+        }
+        # Windows are "since..until" ISO dates, so the latest sorts last
+        self.latest: Optional[str] = max(self.windows) if self.windows else None
+
+    @classmethod
+    def load(cls, sources: Sequence[Path], hierarchy: Optional[Any] = None) -> "LeaderboardIndex":
+        """
+        Load detailed-metrics reports; each source is a report file or an
+        output directory containing one. Later sources win for a window.
+        """
+        rows_by_window: Dict[str, List[Dict[str, Any]]] = {}
+        for path in report_files(sources):
+            with path.open("r", encoding="utf-8") as f:
+                rows = json.load(f)
+            per_file: Dict[str, List[Dict[str, Any]]] = {}
+            for row in rows:
+                per_file.setdefault(window_key(row.get("timeRange") or {}), []).append(row)
+            rows_by_window.update(per_file)
+        return cls(rows_by_window, hierarchy)
+
+    def _window(self, window: Optional[str]) -> _WindowIndex:
+        key = window or self.latest
+        if key is None or key not in self.windows:
+            raise KeyError(f"Unknown window {window!r}")
+        return self.windows[key]
+
+    def top(
+        self,
+        n: int,
+        window: Optional[str] = None,
+        repo: Optional[str] = None,
+        group: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        index = self._window(window)
+        if repo is not None:
+            if repo not in index.repos:
+                raise KeyError(f"Unknown repository {repo!r}")
+            return index.repos[repo][:n]
+        if group is not None:
+            return index.groups.get(group, [])[:n]
+        return index.organization[:n]
+
+    def contributor(self, login: str, window: Optional[str] = None) -> Dict[str, Any]:
+        rows = self._window(window).contributors.get(login.lower())
+        if not rows:
+            raise KeyError(f"Unknown contributor {login!r}")
+        return {"totals": _rollup(rows)[0], "repositories": _rank(rows)}
+
+    def repository(self, repo: str, window: Optional[str] = None) -> List[Dict[str, Any]]:
+        index = self._window(window)
+        if repo not in index.repos:
+            raise KeyError(f"Unknown repository {repo!r}")
+        return index.repos[repo]
+
+def report_files(sources: Sequence[Path]) -> List[Path]:
+    files: List[Path] = []
+    for source in sources:
+        files.append(source / DETAILED_METRICS_FILE if source.is_dir() else source)
+    return [f for f in files if f.exists()]
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache of encoded responses.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.capacity = capacity
+        self._data: "OrderedDict[Any, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Any, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+class LeaderboardService:
+    """
+    Serves a LeaderboardIndex over HTTP/JSON and swaps in a rebuilt index
+    whenever a report file changes (e.g. at the end of a scheduled run).
+
+    Routes:
+        GET /windows
+        GET /top?n=10&window=&repo=&group=
+        GET /contributors/<login>?window=
+        GET /repos/<repo>?window=
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[Path],
+        hierarchy: Optional[Any] = None,
+        cache_size: int = 1024,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.sources = list(sources)
+        self.hierarchy = hierarchy
+        self.cache = LRUCache(cache_size)
+        self.log = logger or logging.getLogger("github_champion.query_service")
+        self.generation = 0
+        self._stamp = self._source_stamp()
+        self.index = LeaderboardIndex.load(self.sources, hierarchy)
+
+    def _source_stamp(self) -> Tuple[Tuple[str, int, int], ...]:
+        stamps = []
+        for path in report_files(self.sources):
+            stat = os.stat(path)
+            stamps.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Rebuild the index if any report changed. A report that is still being
+        written (invalid JSON) keeps the current index until the next check.
+        """
+        stamp = self._source_stamp()
+        if stamp == self._stamp:
+            return False
+        try:
+            index = LeaderboardIndex.load(self.sources, self.hierarchy)
+        except (ValueError, KeyError) as e:
+            self.log.warning("Not reloading leaderboards yet: %s", e)
+            return False
+        # Reference swap: in-flight requests finish against the old index
+        self.index = index
+        self.generation += 1
+        self._stamp = stamp
+        self.cache.clear()
+        self.log.info("Reloaded leaderboards (%d windows)", len(index.windows))
+        return True
+
+    def handle(self, raw_path: str) -> Tuple[int, bytes]:
+        """
+        Answer one GET request; returns (status, JSON body).
+        """
+        key = (self.generation, raw_path)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return 200, cached
+        try:
+            payload = self._route(raw_path)
+        except KeyError as e:
+            return 404, json.dumps({"error": str(e.args[0])}).encode("utf-8")
+        except ValueError as e:
+            return 400, json.dumps({"error": str(e)}).encode("utf-8")
+        body = json.dumps(payload).encode("utf-8")
+        self.cache.put(key, body)
+        return 200, body
+
+    def _route(self, raw_path: str) -> Any:
+        url = urlparse(raw_path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        window = query.get("window")
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        index = self.index
+        if parts == ["windows"]:
+            return {"windows": sorted(index.windows), "latest": index.latest}
+        if parts == ["top"]:
+            n = max(int(query.get("n", "10")), 0)
+            return index.top(n, window=window, repo=query.get("repo"), group=query.get("group"))
+        if len(parts) == 2 and parts[0] == "contributors":
+            return index.contributor(parts[1], window=window)
+        if len(parts) >= 2 and parts[0] == "repos":
+            # Multi-org repository keys contain a slash ("org/repo")
+            return index.repository("/".join(parts[1:]), window=window)
+        raise KeyError(f"No route for {url.path}")
+
+    def watch(self, interval: float) -> threading.Event:
+        """
+        Poll the report files every `interval` seconds in a daemon thread.
+        Set the returned event to stop polling.
+        """
+        stop = threading.Event()
+
+        def loop() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except OSError as e:
+                    self.log.warning("Could not check leaderboard reports: %s", e)
+
+        threading.Thread(target=loop, daemon=True).start()
+        return stop
+
+    def make_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        handle: Callable[[str], Tuple[int, bytes]] = self.handle
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this, keep-alive
+            # clients wait on delayed ACKs for every response.
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802 (http.server API)
+                status, body = handle(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return ThreadingHTTPServer((host, port), _Handler)
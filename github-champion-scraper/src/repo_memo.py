@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repo_metrics (
+    repo TEXT NOT NULL,
+    since TEXT NOT NULL,
+    until TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    PRIMARY KEY (repo, since, until)
+);
+"""
+
+def activity_fingerprint(repo_meta: Optional[Dict[str, Any]], salt: str = "") -> Optional[str]:
+    """
+    Fingerprint of a repository's activity from its org listing entry, or
+    None when the listing lacks the fields.
+
+    Pushes move `pushed_at`; issues and pull requests being opened, closed
+    or reopened move `updated_at` and the open issue count. `salt` folds in
+    the settings that shape the metrics (exclusions, aliases), so changing
+    them invalidates every entry.
+    """
+    if not repo_meta or not repo_meta.get("pushed_at") or not repo_meta.get("updated_at"):
+        return None
+    payload = json.dumps(
+        [repo_meta["pushed_at"], repo_meta["updated_at"], repo_meta.get("open_issues_count"), salt]
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def window_is_closed(
+    until: datetime, now: Optional[datetime] = None, settle: timedelta = timedelta(hours=24)
+) -> bool:
+    """
+    True when the window ended more than `settle` ago, so nothing new can
+    land in it. The margin covers windows that end "now" (presets) and
+    events that show up in the API a little after their timestamp.
+    """
+    return until + settle < (now or datetime.now(timezone.utc))
+
+class RepoMemo:
+    """
+    SQLite-backed store of each repository's collected contributor metrics
+    per window, tagged with the repository's activity fingerprint at the time.
+
+    For a closed window, a repository whose fingerprint is unchanged gives
+    the same metrics, so it need not be collected again: a historical
+    backfill then costs only the org listing. Entries for open windows are
+    never read, since new events can still land in them.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.hits = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=60000")
+        self._conn.executescript(_SCHEMA)
+
+    def get(
+        self, repo: str, since: datetime, until: datetime, fingerprint: str
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        row = self._conn.execute(
+            "SELECT metrics FROM repo_metrics "
+            "WHERE repo = ? AND since = ? AND until = ? AND fingerprint = ?",
+            (repo, since.isoformat(), until.isoformat(), fingerprint),
+        ).fetchone()
+        if row is None:
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(
+        self,
+        repo: str,
+        since: datetime,
+        until: datetime,
+        fingerprint: str,
+        metrics: Dict[str, Dict[str, Any]],
+    ) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO repo_metrics (repo, since, until, fingerprint, metrics) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (repo, since.isoformat(), until.isoformat(), fingerprint, json.dumps(metrics)),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
@@ -6,6 +6,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Iterable, Optional
 
+from .publishing import write_atomic
 from .scoring import ContributorScore
 
 def generate_leaderboard_report(
@@ -14,28 +15,72 @@ def generate_leaderboard_report(
     org_leaderboard: List[Dict[str, Any]],
     time_range: Optional[Dict[str, str]] = None,
     generated_at: Optional[datetime] = None,
+    completeness: Optional[Dict[str, Any]] = None,
+    organization_leaderboards: Optional[Dict[str, List[Dict[str, Any]]]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Build a leaderboard structure matching the example in the README.
+
+    `completeness` (from a request-budgeted run) records which metrics were
+    fully collected and is added to the metadata entry. For a
+    multi-organization run, `org_leaderboard` spans all organizations and
+    `organization_leaderboards` adds one entry per organization after it;
+    their names are listed under `_metadata.organizations`.
     """
     report: List[Dict[str, Any]] = []
 
     report.append({organization_label: org_leaderboard})
 
+    for org_name, leaderboard in (organization_leaderboards or {}).items():
+        report.append({org_name: leaderboard})
+
     for repo_name, leaderboard in per_repo_leaderboards.items():
         report.append({repo_name: leaderboard})
 
     # timeRange and generatedAt can be added as metadata in a separate entry if desired
-    if time_range or generated_at:
+    if time_range or generated_at or completeness or organization_leaderboards:
         metadata: Dict[str, Any] = {}
         if time_range:
             metadata["timeRange"] = time_range
         if generated_at:
             metadata["generatedAt"] = generated_at.isoformat()
+        if completeness:
+            metadata["completeness"] = completeness
+        if organization_leaderboards:
+            metadata["organizations"] = list(organization_leaderboards)
         report.append({"_metadata": metadata})
 
     return report
 
+def generate_group_leaderboard_report(
+    group_leaderboards: Dict[str, List[Dict[str, Any]]],
+    kinds: Dict[str, str],
+    parents: Dict[str, str],
+    time_range: Optional[Dict[str, str]] = None,
+    generated_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Build the team/group rollup report: one leaderboard per group, with the
+    group's kind ("repos", "team" or "group") and parent.
+    """
+    groups: Dict[str, Any] = {}
+    for name, leaderboard in group_leaderboards.items():
+        entry: Dict[str, Any] = {"kind": kinds.get(name, "group")}
+        if name in parents:
+            entry["parent"] = parents[name]
+        entry["leaderboard"] = leaderboard
+        groups[name] = entry
+
+    report: Dict[str, Any] = {"groups": groups}
+    if time_range or generated_at:
+        metadata: Dict[str, Any] = {}
+        if time_range:
+            metadata["timeRange"] = time_range
+        if generated_at:
+            metadata["generatedAt"] = generated_at.isoformat()
+        report["_metadata"] = metadata
+    return report
+
 def generate_detailed_metrics_report(
     per_repo_scores: Dict[str, Dict[str, ContributorScore]],
     time_range: Optional[Dict[str, str]] = None,
@@ -69,8 +114,7 @@ def generate_detailed_metrics_report(
 
 def save_json(data: Any, path: Path) -> None:
     """
-    Serialize `data` to JSON at `path`, creating parent dirs as needed.
+    Serialize `data` to JSON at `path`, creating parent dirs as needed. The
+    file is replaced atomically, so readers never see a partial report.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, sort_keys=False)
\ No newline at end of file
+    write_atomic(json.dumps(data, indent=2, sort_keys=False).encode("utf-8"), path)
\ No newline at end of file
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .event_archive import EventArchive
+from .main import _load_settings, _score_and_report
+from .utils.date_ranges import parse_date_range
+from .utils.logging_setup import setup_logging
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Rebuild leaderboards from a raw event archive without calling the "
+            "GitHub API. Scoring weights are read from the settings file."
+        )
+    )
+    parser.add_argument(
+        "--archive",
+        dest="archive",
+        help="Event archive directory (defaults to event_archive.directory in settings).",
+    )
+    parser.add_argument("--settings", dest="settings", help="Optional path to a settings JSON file.")
+    parser.add_argument("--since", help="Start date (YYYY-MM-DD). Must be used with --until.")
+    parser.add_argument("--until", help="End date (YYYY-MM-DD). Must be used with --since.")
+    parser.add_argument(
+        "--preset",
+        default=None,
+        help="Date range preset. If no range is given, the whole archive is scored.",
+    )
+    parser.add_argument("--output-dir", dest="output_dir", default="data")
+    parser.add_argument("--top-n", dest="top_n", type=int, default=3)
+    parser.add_argument("--min-events", dest="min_events", type=int, default=1)
+    parser.add_argument("--log-level", dest="log_level", default="INFO")
+    return parser.parse_args()
+
+def _requested_window(
+    preset: Optional[str],
+    since_str: Optional[str],
+    until_str: Optional[str],
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    if preset or (since_str and until_str):
+        date_range = parse_date_range(preset=preset, since_str=since_str, until_str=until_str)
+        return date_range.since, date_range.until
+    return None, None
+
+def main() -> None:
+    args = parse_args()
+    logger = setup_logging(args.log_level)
+    settings = _load_settings(args.settings) if args.settings else {}
+
+    archive_dir = args.archive or settings.get("event_archive", {}).get("directory")
+    if not archive_dir:
+        raise RuntimeError("An event archive must be provided via --archive or settings.")
+
+    archive = EventArchive(Path(archive_dir))
+    try:
+        time_range = settings.get("time_range", {})
+        since, until = _requested_window(
+            args.preset or time_range.get("preset"),
+            args.since or time_range.get("since"),
+            args.until or time_range.get("until"),
+        )
+        per_repo_metrics = archive.to_repo_metrics(since, until)
+        if since is None or until is None:
+            stamps = archive.columns["timestamp"]
+            if not len(stamps):
+                raise RuntimeError(f"Event archive {archive_dir} is empty.")
+            since = datetime.fromtimestamp(min(stamps), tz=timezone.utc)
+            until = datetime.fromtimestamp(max(stamps), tz=timezone.utc)
+    finally:
+        archive.close()
+
+    logger.info(
+        "Rescoring %d events from %s for %s to %s",
+        len(archive),
+        archive_dir,
+        since.isoformat(),
+        until.isoformat(),
+    )
+    _score_and_report(args, settings, logger, None, per_repo_metrics, since, until)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    owner TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    reviews TEXT NOT NULL,
+    PRIMARY KEY (owner, repo, number)
+);
+"""
+
+class ReviewCache:
+    """
+    SQLite-backed store of every pull request's reviews, recorded with the
+    pull's `updated_at` at the time they were fetched.
+
+    Submitting, editing or dismissing a review bumps the pull's `updated_at`,
+    so a pull whose `updated_at` is unchanged has the same reviews and does
+    not need to be fetched again. Reviews are stored unfiltered (all dates,
+    no exclusions) so the entry stays valid for any window.
+
+    Every write commits on its own (autocommit), so no write lock is held
+    across network fetches and several processes may share the file
+    (sharded workers).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=60, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=60000")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, owner: str, repo: str, number: int, updated_at: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Cached reviews of a pull, or None if it was never fetched or has
+        been updated since.
+        """
+        row = self._conn.execute(
+            "SELECT reviews FROM reviews WHERE owner = ? AND repo = ? AND number = ? AND updated_at = ?",
+            (owner, repo, number, updated_at),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(
+        self,
+        owner: str,
+        repo: str,
+        number: int,
+        updated_at: str,
+        reviews: List[Dict[str, Any]],
+    ) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO reviews (owner, repo, number, updated_at, reviews) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (owner, repo, number, updated_at, json.dumps(reviews, separators=(",", ":"))),
+        )
+
+    def close(self) -> None:
+        self._conn.close()
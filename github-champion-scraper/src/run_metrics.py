@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import bisect
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+METRIC_PREFIX = "github_champion"
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out: List[Tuple[str, int]] = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            out.append((_format_value(bound), running))
+        out.append(("+Inf", self.count))
+        return out
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+def _labels(pairs: Mapping[str, str]) -> str:
+    if not pairs:
+        return ""
+    inner = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in sorted(pairs.items())
+    )
+    return "{" + inner + "}"
+
+class RunMetrics:
+    """
+    In-process collector for scrape-run metrics, rendered in the Prometheus
+    text exposition format.
+
+    Exposed either through a local `/metrics` HTTP endpoint (`serve`) or
+    written atomically for the node_exporter textfile collector
+    (`write_textfile`).
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._lock = threading.Lock()
+        self._latency_buckets = tuple(latency_buckets)
+        self._latency: Dict[str, _Histogram] = {}
+        self._requests: Dict[Tuple[str, int], int] = {}
+        self._items: Dict[str, int] = {}
+        # X-RateLimit-Resource -> {"remaining" | "limit" | "reset": value}
+        self._rate_limit: Dict[str, Dict[str, float]] = {}
+        self._phase_durations: Dict[str, float] = {}
+        self._phase_started: Dict[str, float] = {}
+        self._repos_processed = 0
+        self._last_success: Optional[int] = None
+
+    # Hooks fed by the client and the pipeline
+
+    def observe_request(self, endpoint: str, status: int, seconds: float) -> None:
+        with self._lock:
+            hist = self._latency.get(endpoint)
+            if hist is None:
+                hist = self._latency[endpoint] = _Histogram(self._latency_buckets)
+            hist.observe(seconds)
+            key = (endpoint, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def observe_rate_limit(self, headers: Mapping[str, str]) -> None:
+        """
+        Record the rate-limit budget reported by GitHub response headers,
+        per resource (core, search, ...); responses without
+        X-RateLimit-Resource count against core.
+        """
+        values: Dict[str, float] = {}
+        for header, name in (
+            ("X-RateLimit-Remaining", "remaining"),
+            ("X-RateLimit-Limit", "limit"),
+            ("X-RateLimit-Reset", "reset"),
+        ):
+            raw = headers.get(header)
+            if raw is None:
+                continue
+            try:
+                values[name] = float(raw)
+            except ValueError:
+                continue
+        if values:
+            resource = headers.get("X-RateLimit-Resource") or "core"
+            with self._lock:
+                self._rate_limit.setdefault(resource, {}).update(values)
+
+    def add_items(self, endpoint: str, count: int) -> None:
+        with self._lock:
+            self._items[endpoint] = self._items.get(endpoint, 0) + count
+
+    def repo_processed(self) -> None:
+        with self._lock:
+            self._repos_processed += 1
+
+    def set_run_success(self, success: bool) -> None:
+        with self._lock:
+            self._last_success = 1 if success else 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a pipeline phase (collect / score / report).
+        """
+        started = time.monotonic()
+        with self._lock:
+            self._phase_started[name] = started
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._phase_durations[name] = (
+                    self._phase_durations.get(name, 0.0) + time.monotonic() - started
+                )
+                self._phase_started.pop(name, None)
+
+    # Exposition
+
+    def _repos_per_second(self) -> float:
+        if "collect" in self._phase_started:
+            elapsed = time.monotonic() - self._phase_started["collect"]
+        else:
+            elapsed = self._phase_durations.get("collect", 0.0)
+        if elapsed <= 0:
+            return 0.0
+        return self._repos_processed / elapsed
+
+    def render(self) -> str:
+        p = METRIC_PREFIX
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# HELP {p}_request_duration_seconds GitHub API request latency.")
+            lines.append(f"# TYPE {p}_request_duration_seconds histogram")
+            for endpoint, hist in sorted(self._latency.items()):
+                for le, count in hist.cumulative():
+                    lines.append(
+                        f"{p}_request_duration_seconds_bucket"
+                        f"{_labels({'endpoint': endpoint, 'le': le})} {count}"
+                    )
+                lines.append(
+                    f"{p}_request_duration_seconds_sum{_labels({'endpoint': endpoint})} {hist.total}"
+                )
+                lines.append(
+                    f"{p}_request_duration_seconds_count{_labels({'endpoint': endpoint})} {hist.count}"
+                )
+
+            lines.append(f"# HELP {p}_requests_total GitHub API requests by endpoint and status.")
+            lines.append(f"# TYPE {p}_requests_total counter")
+            for (endpoint, status), count in sorted(self._requests.items()):
+                labels = _labels({"endpoint": endpoint, "status": str(status)})
+                lines.append(f"{p}_requests_total{labels} {count}")
+
+            lines.append(f"# HELP {p}_items_parsed_total Items decoded from API responses.")
+            lines.append(f"# TYPE {p}_items_parsed_total counter")
+            for endpoint, count in sorted(self._items.items()):
+                lines.append(f"{p}_items_parsed_total{_labels({'endpoint': endpoint})} {count}")
+
+            for name in ("remaining", "limit", "reset"):
+                seen = {
+                    resource: values[name]
+                    for resource, values in sorted(self._rate_limit.items())
+                    if name in values
+                }
+                if seen:
+                    metric = f"{p}_rate_limit_{name}"
+                    lines.append(
+                        f"# HELP {metric} Last X-RateLimit-{name.capitalize()} seen per resource."
+                    )
+                    lines.append(f"# TYPE {metric} gauge")
+                    for resource, value in seen.items():
+                        lines.append(f"{metric}{_labels({'resource': resource})} {value}")
+
+            lines.append(f"# HELP {p}_repos_processed_total Repositories fully collected.")
+            lines.append(f"# TYPE {p}_repos_processed_total counter")
+            lines.append(f"{p}_repos_processed_total {self._repos_processed}")
+
+            lines.append(f"# HELP {p}_repos_per_second Collection throughput.")
+            lines.append(f"# TYPE {p}_repos_per_second gauge")
+            lines.append(f"{p}_repos_per_second {self._repos_per_second()}")
+
+            lines.append(f"# HELP {p}_phase_duration_seconds Wall-clock time per pipeline phase.")
+            lines.append(f"# TYPE {p}_phase_duration_seconds gauge")
+            for name, seconds in sorted(self._phase_durations.items()):
+                lines.append(f"{p}_phase_duration_seconds{_labels({'phase': name})} {seconds}")
+
+            if self._last_success is not None:
+                lines.append(f"# HELP {p}_last_run_success Whether the last run completed.")
+                lines.append(f"# TYPE {p}_last_run_success gauge")
+                lines.append(f"{p}_last_run_success {self._last_success}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """
+        Atomically write the current metrics for the textfile collector.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+        try:
+            os.chmod(tmp, 0o644)  # mkstemp creates 0600; the textfile collector must read it
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Start a background HTTP server exposing `/metrics`.
+        """
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (http.server API)
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
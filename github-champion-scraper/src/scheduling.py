@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Estimated requests at or above which a repository is split into sub-tasks
+DEFAULT_SPLIT_COST = 400.0
+DEFAULT_SLICES = 4
+
+@dataclass
+class CollectionTask:
+    """
+    One unit of collection work: a repository, optionally restricted to some
+    endpoints and to a slice of the window (see collect_repository_contributions).
+    """
+
+    repo: str
+    cost: float
+    endpoints: Optional[Tuple[str, ...]] = None
+    created_between: Optional[Tuple[datetime, datetime]] = None
+
+def _window_days(since: datetime, until: datetime) -> float:
+    return max((until - since).total_seconds() / 86400.0, 1.0)
+
+def estimate_endpoint_costs(
+    repo_meta: Optional[Dict[str, Any]],
+    history: Optional[Dict[str, Any]],
+    since: datetime,
+    until: datetime,
+    per_page: int = 100,
+) -> Dict[str, float]:
+    """
+    Estimate the number of requests each endpoint group will need.
+
+    Previous-run statistics (daily rates of issues, pulls and commits) are
+    preferred. Otherwise a rough guess is made from the org listing: open
+    issues/PRs as an activity proxy and repository size for commit volume.
+    """
+    days = _window_days(since, until)
+    if history:
+        issues = float(history.get("issues_per_day", 0.0)) * days
+        pulls = float(history.get("pulls_per_day", 0.0)) * days
+        commits = float(history.get("commits_per_day", 0.0)) * days
+    elif repo_meta:
+        activity = float(repo_meta.get("open_issues_count") or 0)
+        issues = activity
+        pulls = activity
+        commits = float(repo_meta.get("size") or 0) / 1024.0
+    else:
+        issues = pulls = commits = 0.0
+    return {
+        "issues": 1.0 + math.ceil(issues / per_page),
+        "pulls": 1.0 + math.ceil(pulls / per_page),
+        # one request per pull, on top of listing the pulls again
+        "reviews": 1.0 + math.ceil(pulls / per_page) + pulls,
+        "commits": 1.0 + math.ceil(commits / per_page),
+    }
+
+def _slices(since: datetime, until: datetime, count: int) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [since, until] into `count` non-overlapping inclusive windows.
+
+    Inner bounds are whole seconds and each slice ends one second before the
+    next begins, matching the second precision of API timestamps.
+    """
+    step = (until - since) / count
+    starts = [since] + [(since + step * i).replace(microsecond=0) for i in range(1, count)]
+    ends = [start - timedelta(seconds=1) for start in starts[1:]] + [until]
+    return list(zip(starts, ends))
+
+def plan_tasks(
+    repos: List[str],
+    endpoint_costs: Dict[str, Dict[str, float]],
+    since: datetime,
+    until: datetime,
+    split_cost: float = DEFAULT_SPLIT_COST,
+    slices: int = DEFAULT_SLICES,
+) -> List[CollectionTask]:
+    """
+    Turn repositories into collection tasks ordered most expensive first.
+
+    Repositories whose estimated cost reaches `split_cost` are split by
+    endpoint, and their commits further by date slice, so a single huge
+    repository does not set the wall-clock time of a parallel run. Only
+    commits are sliced: their listing filters by date on the server, so each
+    slice reads just its own pages. Pulls are listed newest first and every
+    slice would page from the top down to its lower bound, and reviews come
+    from the pulls updated in the whole window; both stay one task.
+    """
+    slices = min(slices, int((until - since).total_seconds()))
+    tasks: List[CollectionTask] = []
+    for repo in repos:
+        costs = endpoint_costs.get(repo) or {}
+        total = sum(costs.values())
+        if total < split_cost or slices < 1:
+            tasks.append(CollectionTask(repo=repo, cost=total))
+            continue
+        for endpoint in ("issues", "pulls", "reviews"):
+            tasks.append(CollectionTask(repo=repo, cost=costs.get(endpoint, 0.0), endpoints=(endpoint,)))
+        share = costs.get("commits", 0.0) / slices
+        for window in _slices(since, until, slices):
+            tasks.append(
+                CollectionTask(
+                    repo=repo,
+                    cost=share,
+                    endpoints=("commits",),
+                    created_between=window,
+                )
+            )
+    tasks.sort(key=lambda t: t.cost, reverse=True)
+    return tasks
+
+def merge_contributor_metrics(
+    target: Dict[str, Dict[str, Any]],
+    partial: Dict[str, Dict[str, Any]],
+) -> None:
+    """
+    Add the per-contributor counts of `partial` into `target` in place.
+    """
+    for login, data in partial.items():
+        existing = target.get(login)
+        if existing is None:
+            target[login] = dict(data)
+            continue
+        for key, value in data.items():
+            existing[key] = existing.get(key, 0) + value
+
+class RepoStatsStore:
+    """
+    Per-repository activity rates observed by previous runs, used to estimate
+    collection cost. Stored as JSON keyed by "owner/repo".
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                self.stats = json.load(f)
+
+    def get(self, owner: str, repo: str) -> Optional[Dict[str, Any]]:
+        return self.stats.get(f"{owner}/{repo}")
+
+    def record(
+        self,
+        owner: str,
+        repo: str,
+        contributors: Dict[str, Dict[str, Any]],
+        since: datetime,
+        until: datetime,
+    ) -> None:
+        days = _window_days(since, until)
+        totals = {"issuesClosed": 0, "pullsCreated": 0, "commits": 0}
+        for data in contributors.values():
+            for key in totals:
+                totals[key] += int(data.get(key, 0))
+        self.stats[f"{owner}/{repo}"] = {
+            "issues_per_day": totals["issuesClosed"] / days,
+            "pulls_per_day": totals["pullsCreated"] / days,
+            "commits_per_day": totals["commits"] / days,
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.stats, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
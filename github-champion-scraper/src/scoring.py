@@ -1,12 +1,33 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
-from typing import Dict, List, Any, Tuple
+from fnmatch import fnmatchcase
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
 
 ISSUES_CLOSED_WEIGHT = 1.0
 PULL_REVIEWS_WEIGHT = 0.75
 PULLS_CREATED_WEIGHT = 0.5
 
+@dataclass(frozen=True)
+class ScoringWeights:
+    issues_closed: float = ISSUES_CLOSED_WEIGHT
+    pull_reviews: float = PULL_REVIEWS_WEIGHT
+    pulls_created: float = PULLS_CREATED_WEIGHT
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "ScoringWeights":
+        """
+        Read weights from the `scoring.weights` section of a settings dict,
+        falling back to the module defaults for anything not set.
+        """
+        weights = settings.get("scoring", {}).get("weights") or {}
+        return cls(
+            issues_closed=float(weights.get("issues_closed", ISSUES_CLOSED_WEIGHT)),
+            pull_reviews=float(weights.get("pull_reviews", PULL_REVIEWS_WEIGHT)),
+            pulls_created=float(weights.get("pulls_created", PULLS_CREATED_WEIGHT)),
+        )
+
 @dataclass
 class ContributorScore:
     id: str
@@ -22,15 +43,19 @@ def _compute_total_score(
     issues_closed: int,
     pull_reviews: int,
     pulls_created: int,
+    weights: Optional[ScoringWeights] = None,
 ) -> float:
+    if weights is None:
+        weights = ScoringWeights()
     return (
-        issues_closed * ISSUES_CLOSED_WEIGHT
-        + pull_reviews * PULL_REVIEWS_WEIGHT
-        + pulls_created * PULLS_CREATED_WEIGHT
+        issues_closed * weights.issues_closed
+        + pull_reviews * weights.pull_reviews
+        + pulls_created * weights.pulls_created
     )
 
 def compute_scores_for_repo(
-    repo_contributors: Dict[str, Dict[str, Any]]
+    repo_contributors: Dict[str, Dict[str, Any]],
+    weights: Optional[ScoringWeights] = None,
 ) -> Dict[str, ContributorScore]:
     """
     Convert raw per-contributor metrics for a repository into ContributorScore objects.
@@ -48,6 +73,7 @@ def compute_scores_for_repo(
             issues_closed=issues_closed,
             pull_reviews=pull_reviews,
             pulls_created=pulls_created,
+            weights=weights,
         )
 
         result[contributor_id] = ContributorScore(
@@ -71,29 +97,164 @@ def aggregate_organization_scores(
     """
     aggregated: Dict[str, ContributorScore] = {}
     for repo_scores in per_repo_scores.values():
-        for contributor_id, score in repo_scores.items():
-            if contributor_id not in aggregated:
-                aggregated[contributor_id] = ContributorScore(
-                    id=contributor_id,
-                    total=score.total,
-                    issues_closed=score.issues_closed,
-                    pull_reviews=score.pull_reviews,
-                    pulls_created=score.pulls_created,
-                    additions=score.additions,
-                    deletions=score.deletions,
-                    commits=score.commits,
-                )
-            else:
-                agg = aggregated[contributor_id]
-                agg.total += score.total
-                agg.issues_closed += score.issues_closed
-                agg.pull_reviews += score.pull_reviews
-                agg.pulls_created += score.pulls_created
-                agg.additions += score.additions
-                agg.deletions += score.deletions
-                agg.commits += score.commits
+        for score in repo_scores.values():
+            _add_score(aggregated, score)
     return aggregated
 
+def _add_score(target: Dict[str, ContributorScore], score: ContributorScore) -> None:
+    agg = target.get(score.id)
+    if agg is None:
+        target[score.id] = ContributorScore(
+            id=score.id,
+            total=score.total,
+            issues_closed=score.issues_closed,
+            pull_reviews=score.pull_reviews,
+            pulls_created=score.pulls_created,
+            additions=score.additions,
+            deletions=score.deletions,
+            commits=score.commits,
+        )
+        return
+    agg.total += score.total
+    agg.issues_closed += score.issues_closed
+    agg.pull_reviews += score.pull_reviews
+    agg.pulls_created += score.pulls_created
+    agg.additions += score.additions
+    agg.deletions += score.deletions
+    agg.commits += score.commits
+
+class RollupHierarchy:
+    """
+    Team and product-area groups above repositories, read from the `rollups`
+    settings section:
+
+        repo_groups  group -> repository names or globs ("api-*", "org/repo")
+        teams        team -> contributor logins
+        parents      group or team -> parent group (any depth)
+
+    A (repository, contributor) pair belongs to every repo group matching the
+    repository, every team containing the contributor, and all of their
+    ancestors; a parent counts each pair once even if several children match.
+    """
+
+    def __init__(
+        self,
+        repo_groups: Optional[Dict[str, List[str]]] = None,
+        teams: Optional[Dict[str, List[str]]] = None,
+        parents: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.repo_groups = dict(repo_groups or {})
+        self.teams = {team: [m.lower() for m in members] for team, members in (teams or {}).items()}
+        self.parents = dict(parents or {})
+
+        names: List[str] = []
+        for name in list(self.repo_groups) + list(self.teams) + list(self.parents.values()):
+            if name not in names:
+                names.append(name)
+        for name in self.parents:
+            if name not in names:
+                raise ValueError(f"Rollup parent set for unknown group {name!r}")
+        self.groups: List[str] = names
+        self._index = {name: i for i, name in enumerate(names)}
+        self._lineage = {name: self._ancestors(name) for name in names}
+
+        self._team_members: Dict[str, List[str]] = {}
+        for team, members in self.teams.items():
+            for login in members:
+                self._team_members.setdefault(login, []).append(team)
+        self._repo_cache: Dict[str, FrozenSet[int]] = {}
+        self._login_cache: Dict[str, FrozenSet[int]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["RollupHierarchy"]:
+        rollups = settings.get("rollups") or {}
+        if not (rollups.get("repo_groups") or rollups.get("teams")):
+            return None
+        return cls(
+            repo_groups=rollups.get("repo_groups"),
+            teams=rollups.get("teams"),
+            parents=rollups.get("parents"),
+        )
+
+    def _ancestors(self, name: str) -> FrozenSet[int]:
+        lineage = []
+        current: Optional[str] = name
+        while current is not None:
+            if current in lineage:
+                raise ValueError(f"Rollup hierarchy has a cycle through {current!r}")
+            lineage.append(current)
+            current = self.parents.get(current)
+        return frozenset(self._index[n] for n in lineage)
+
+    def kind(self, name: str) -> str:
+        if name in self.repo_groups:
+            return "repos"
+        if name in self.teams:
+            return "team"
+        return "group"
+
+    def _repo_memberships(self, repo: str) -> FrozenSet[int]:
+        cached = self._repo_cache.get(repo)
+        if cached is None:
+            short = repo.rsplit("/", 1)[-1]
+            rows: FrozenSet[int] = frozenset()
+            for group, patterns in self.repo_groups.items():
+                if any(fnmatchcase(repo, p) or fnmatchcase(short, p) for p in patterns):
+                    rows |= self._lineage[group]
+            cached = self._repo_cache[repo] = rows
+        return cached
+
+    def _login_memberships(self, login: str) -> FrozenSet[int]:
+        cached = self._login_cache.get(login)
+        if cached is None:
+            rows: FrozenSet[int] = frozenset()
+            for team in self._team_members.get(login.lower(), ()):
+                rows |= self._lineage[team]
+            cached = self._login_cache[login] = rows
+        return cached
+
+    def rows(self, repo: str, login: str) -> FrozenSet[int]:
+        """
+        Indexes into `groups` of every group the (repository, contributor)
+        pair rolls up into, for addressing per-group accumulators.
+        """
+        return self._repo_memberships(repo) | self._login_memberships(login)
+
+    def memberships(self, repo: str, login: str) -> FrozenSet[str]:
+        """
+        Names of every group the (repository, contributor) pair rolls up into.
+        """
+        return frozenset(self.groups[row] for row in self.rows(repo, login))
+
+    def aggregate(
+        self, per_repo_scores: Dict[str, Dict[str, ContributorScore]]
+    ) -> Dict[str, Dict[str, ContributorScore]]:
+        """
+        Roll per-repository scores up to every group of the hierarchy at once.
+
+        Each (repository, contributor) score is visited exactly once and added
+        to the accumulators of all groups in its (cached, sparse) membership
+        row, rather than rescoring a filtered copy of the metrics per group.
+        """
+        accumulators: List[Dict[str, ContributorScore]] = [{} for _ in self.groups]
+        for repo_name, repo_scores in per_repo_scores.items():
+            self.accumulate(accumulators, repo_name, repo_scores)
+        return {name: accumulators[i] for i, name in enumerate(self.groups)}
+
+    def accumulate(
+        self,
+        accumulators: List[Dict[str, ContributorScore]],
+        repo_name: str,
+        repo_scores: Dict[str, ContributorScore],
+    ) -> None:
+        """
+        Add one repository's scores to per-group accumulators, indexed like `groups`.
+        """
+        repo_rows = self._repo_memberships(repo_name)
+        for contributor_id, score in repo_scores.items():
+            for row in repo_rows | self._login_memberships(contributor_id):
+                _add_score(accumulators[row], score)
+
 def leaderboard_from_scores(
     scores: Dict[str, ContributorScore],
     top_n: int = 3,
@@ -101,13 +262,14 @@ def leaderboard_from_scores(
     """
     Convert ContributorScore objects into a top-N leaderboard list, sorted by total desc.
     """
-    sorted_scores = sorted(
+    # Same order as sorted(..., reverse=True)[:top_n], ties included
+    top_scores = heapq.nlargest(
+        top_n,
         scores.values(),
         key=lambda s: (s.total, s.issues_closed, s.pull_reviews, s.pulls_created),
-        reverse=True,
     )
     leaderboard: List[Dict[str, Any]] = []
-    for score in sorted_scores[:top_n]:
+    for score in top_scores:
         leaderboard.append(
             {
                 "name": score.id,
@@ -122,6 +284,7 @@ def leaderboard_from_scores(
 def compute_all_leaderboards(
     repo_metrics: Dict[str, Dict[str, Dict[str, Any]]],
     top_n: int = 3,
+    weights: Optional[ScoringWeights] = None,
 ) -> Tuple[
     Dict[str, Dict[str, ContributorScore]],
     Dict[str, ContributorScore],
@@ -136,7 +299,7 @@ def compute_all_leaderboards(
     """
     per_repo_scores: Dict[str, Dict[str, ContributorScore]] = {}
     for repo_name, contributors in repo_metrics.items():
-        per_repo_scores[repo_name] = compute_scores_for_repo(contributors)
+        per_repo_scores[repo_name] = compute_scores_for_repo(contributors, weights=weights)
 
     org_scores = aggregate_organization_scores(per_repo_scores)
 
@@ -146,4 +309,104 @@ def compute_all_leaderboards(
 
     org_leaderboard = leaderboard_from_scores(org_scores, top_n=top_n)
 
-    return per_repo_scores, org_scores, per_repo_leaderboards, org_leaderboard
\ No newline at end of file
+    return per_repo_scores, org_scores, per_repo_leaderboards, org_leaderboard
+
+def _owner(repo_key: str) -> str:
+    return repo_key.split("/", 1)[0] if "/" in repo_key else ""
+
+class IncrementalLeaderboards:
+    """
+    Scores repositories one at a time, as they finish collecting, and folds
+    them into running organization, per-organization and group totals.
+
+    Leaderboards can be read at any point, and a repository's raw metrics
+    can be released as soon as it has been added. `finalize` puts the
+    results in the order a batch run (compute_all_leaderboards and
+    RollupHierarchy.aggregate) would have produced them.
+    """
+
+    def __init__(
+        self,
+        top_n: int = 3,
+        weights: Optional[ScoringWeights] = None,
+        hierarchy: Optional[RollupHierarchy] = None,
+    ) -> None:
+        self.top_n = top_n
+        self.weights = weights
+        self.hierarchy = hierarchy
+        self.per_repo_scores: Dict[str, Dict[str, ContributorScore]] = {}
+        self.per_repo_leaderboards: Dict[str, List[Dict[str, Any]]] = {}
+        self.org_scores: Dict[str, ContributorScore] = {}
+        self.owner_scores: Dict[str, Dict[str, ContributorScore]] = {}
+        self.group_scores: List[Dict[str, ContributorScore]] = (
+            [{} for _ in hierarchy.groups] if hierarchy is not None else []
+        )
+
+    def add_repo(self, repo_name: str, contributors: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score one repository, fold it into every total and return its leaderboard.
+        """
+        scores = compute_scores_for_repo(contributors, weights=self.weights)
+        self.per_repo_scores[repo_name] = scores
+        leaderboard = leaderboard_from_scores(scores, top_n=self.top_n)
+        self.per_repo_leaderboards[repo_name] = leaderboard
+        owner_scores = self.owner_scores.setdefault(_owner(repo_name), {})
+        for score in scores.values():
+            _add_score(self.org_scores, score)
+            _add_score(owner_scores, score)
+        if self.hierarchy is not None:
+            self.hierarchy.accumulate(self.group_scores, repo_name, scores)
+        return leaderboard
+
+    def org_leaderboard(self) -> List[Dict[str, Any]]:
+        return leaderboard_from_scores(self.org_scores, top_n=self.top_n)
+
+    def organization_leaderboards(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        One leaderboard per organization when repositories are keyed
+        "owner/name" across several organizations, else empty.
+        """
+        owners = {owner: scores for owner, scores in self.owner_scores.items() if owner}
+        if len(owners) < 2:
+            return {}
+        return {
+            owner: leaderboard_from_scores(scores, top_n=self.top_n)
+            for owner, scores in owners.items()
+        }
+
+    def group_leaderboards(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self.hierarchy is None:
+            return {}
+        return {
+            name: leaderboard_from_scores(self.group_scores[i], top_n=self.top_n)
+            for i, name in enumerate(self.hierarchy.groups)
+        }
+
+    def finalize(self, repo_order: List[str]) -> None:
+        """
+        Order repositories as `repo_order` and re-key every total in the
+        order its contributors first appear there, so exact ties rank the
+        same whichever repository finished collecting first. The totals
+        themselves are reused, not recomputed.
+        """
+        self.per_repo_scores = {
+            r: self.per_repo_scores[r] for r in repo_order if r in self.per_repo_scores
+        }
+        self.per_repo_leaderboards = {r: self.per_repo_leaderboards[r] for r in self.per_repo_scores}
+        org: Dict[str, ContributorScore] = {}
+        owners: Dict[str, Dict[str, ContributorScore]] = {}
+        groups: List[Dict[str, ContributorScore]] = [{} for _ in self.group_scores]
+        for repo_name, scores in self.per_repo_scores.items():
+            owner = _owner(repo_name)
+            owner_totals = self.owner_scores[owner]
+            ordered_owner = owners.setdefault(owner, {})
+            for contributor_id in scores:
+                org.setdefault(contributor_id, self.org_scores[contributor_id])
+                ordered_owner.setdefault(contributor_id, owner_totals[contributor_id])
+                if self.hierarchy is not None:
+                    for row in self.hierarchy.rows(repo_name, contributor_id):
+                        groups[row].setdefault(contributor_id, self.group_scores[row][contributor_id])
+        self.org_scores = org
+        self.owner_scores = owners
+        if self.hierarchy is not None:
+            self.group_scores = groups
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .main import _load_settings
+from .query_service import LeaderboardService
+from .scoring import RollupHierarchy
+from .utils.logging_setup import setup_logging
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve leaderboard queries over HTTP/JSON from stored reports, "
+            "reloading automatically when a new run writes them."
+        )
+    )
+    parser.add_argument(
+        "--reports",
+        nargs="*",
+        default=None,
+        help="Output directories or detailed-metrics.json files to serve (default: data).",
+    )
+    parser.add_argument("--settings", dest="settings", help="Optional path to a settings JSON file.")
+    parser.add_argument("--host", default=None, help="Interface to bind (default 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=None, help="Port to listen on (default 8080).")
+    parser.add_argument(
+        "--reload-interval",
+        dest="reload_interval",
+        type=float,
+        default=None,
+        help="Seconds between checks for new reports (default 2).",
+    )
+    parser.add_argument("--log-level", dest="log_level", default="INFO")
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    logger = setup_logging(args.log_level)
+    settings = _load_settings(args.settings) if args.settings else {}
+    service_settings = settings.get("service", {})
+
+    sources = [Path(p) for p in (args.reports or service_settings.get("reports") or ["data"])]
+    service = LeaderboardService(
+        sources,
+        hierarchy=RollupHierarchy.from_settings(settings),
+        cache_size=int(service_settings.get("cache_size", 1024)),
+        logger=logger,
+    )
+    service.watch(float(args.reload_interval or service_settings.get("reload_interval", 2)))
+
+    host = args.host or service_settings.get("host", "127.0.0.1")
+    port = int(args.port or service_settings.get("port", 8080))
+    server = service.make_server(port, host)
+    logger.info(
+        "Serving %d leaderboard windows on http://%s:%d", len(service.index.windows), host, port
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
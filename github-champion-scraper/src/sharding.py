@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_LEASE_SECONDS = 15 * 60
+DEFAULT_MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    organization TEXT NOT NULL,
+    since TEXT NOT NULL,
+    until TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo TEXT NOT NULL UNIQUE,
+    weight REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    leased_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS units_claim ON units (status, weight);
+"""
+
+@dataclass
+class WorkUnit:
+    id: int
+    repo: str
+    weight: float
+    attempts: int
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class WorkQueue:
+    """
+    SQLite-backed queue of per-repository work units.
+
+    The coordinator fills it, any number of worker processes (on this host or
+    on others sharing the file) claim units under a time-limited lease and
+    store their partial metrics, and the merge step reads all results back.
+    Workers renew their lease while they collect; units whose lease expires
+    (crashed worker) are handed out again until `max_attempts` is reached.
+    A unit's attempt count identifies the lease, so a worker that lost its
+    lease can no longer complete or fail the unit.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    @classmethod
+    def from_settings(cls, path: Path, settings: Dict[str, Any]) -> "WorkQueue":
+        section = settings.get("sharding", {})
+        return cls(
+            path,
+            lease_seconds=float(section.get("lease_seconds", DEFAULT_LEASE_SECONDS)),
+            max_attempts=int(section.get("max_attempts", DEFAULT_MAX_ATTEMPTS)),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=60000")
+        return conn
+
+    def initialize(
+        self,
+        organization: str,
+        since: datetime,
+        until: datetime,
+        units: Iterable[Tuple[str, float]],
+    ) -> int:
+        """
+        Reset the queue for a new run and enqueue (repo, weight) units.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM units")
+            conn.execute("DELETE FROM run")
+            conn.execute(
+                "INSERT INTO run (id, organization, since, until) VALUES (1, ?, ?, ?)",
+                (organization, since.isoformat(), until.isoformat()),
+            )
+            conn.executemany(
+                "INSERT INTO units (repo, weight) VALUES (?, ?)",
+                list(units),
+            )
+            conn.execute("COMMIT")
+            (count,) = conn.execute("SELECT COUNT(*) FROM units").fetchone()
+        finally:
+            conn.close()
+        return int(count)
+
+    def run_info(self) -> Tuple[str, datetime, datetime]:
+        """
+        Organization and time window the queue was initialized with.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT organization, since, until FROM run WHERE id = 1").fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            raise RuntimeError(f"Work queue {self.path} has not been initialized")
+        organization, since, until = row
+        return organization, datetime.fromisoformat(since), datetime.fromisoformat(until)
+
+    def claim(self, worker_id: str) -> Optional[WorkUnit]:
+        """
+        Lease the heaviest available unit to `worker_id`, or return None.
+        Expired leases that used up their attempts are marked failed instead.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                """
+                UPDATE units
+                SET status = 'failed', leased_until = NULL, error = 'lease expired'
+                WHERE status = 'leased' AND leased_until < ? AND attempts >= ?
+                """,
+                (now, self.max_attempts),
+            )
+            row = conn.execute(
+                """
+                SELECT id, repo, weight, attempts FROM units
+                WHERE status = 'pending'
+                   OR (status = 'leased' AND leased_until < ?)
+                ORDER BY weight DESC, id
+                LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            unit = WorkUnit(id=row[0], repo=row[1], weight=row[2], attempts=row[3] + 1)
+            conn.execute(
+                """
+                UPDATE units
+                SET status = 'leased', worker = ?, leased_until = ?, attempts = ?
+                WHERE id = ?
+                """,
+                (worker_id, now + self.lease_seconds, unit.attempts, unit.id),
+            )
+            conn.execute("COMMIT")
+            return unit
+        finally:
+            conn.close()
+
+    def renew(self, unit: WorkUnit) -> bool:
+        """
+        Extend the unit's lease by `lease_seconds`. Returns False when the
+        lease was already lost.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE units SET leased_until = ?
+                WHERE id = ? AND status = 'leased' AND attempts = ?
+                """,
+                (time.time() + self.lease_seconds, unit.id, unit.attempts),
+            )
+        finally:
+            conn.close()
+        return cursor.rowcount == 1
+
+    @contextmanager
+    def heartbeat(self, unit: WorkUnit, interval: Optional[float] = None) -> Iterator[None]:
+        """
+        Renew the unit's lease from a background thread, every third of the
+        lease by default, while the block runs.
+        """
+        stop = threading.Event()
+        wait = interval if interval is not None else max(self.lease_seconds / 3, 1.0)
+
+        def beat() -> None:
+            while not stop.wait(wait):
+                if not self.renew(unit):
+                    return
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, unit: WorkUnit, metrics: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Store the unit's metrics. Returns False, storing nothing, when the
+        lease was lost to another worker.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE units SET status = 'done', leased_until = NULL, result = ?
+                WHERE id = ? AND status = 'leased' AND attempts = ?
+                """,
+                (json.dumps(metrics), unit.id, unit.attempts),
+            )
+        finally:
+            conn.close()
+        return cursor.rowcount == 1
+
+    def fail(self, unit: WorkUnit, error: str) -> bool:
+        """
+        Record a failure; the unit is retried until `max_attempts` is reached.
+        Returns False, recording nothing, when the lease was lost.
+        """
+        status = "failed" if unit.attempts >= self.max_attempts else "pending"
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE units SET status = ?, leased_until = NULL, error = ?
+                WHERE id = ? AND status = 'leased' AND attempts = ?
+                """,
+                (status, error, unit.id, unit.attempts),
+            )
+        finally:
+            conn.close()
+        return cursor.rowcount == 1
+
+    def progress(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM units GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        return {status: int(count) for status, count in rows}
+
+    def results(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Partial metrics of every completed unit, keyed by repository.
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT repo, result FROM units WHERE status = 'done' ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {repo: json.loads(result) for repo, result in rows}
+
+def run_worker(
+    queue: WorkQueue,
+    client: Any,
+    worker_id: Optional[str] = None,
+    logger: Optional[logging.Logger] = None,
+) -> int:
+    """
+    Claim and collect units until the queue is drained. Returns units completed.
+
+    `client` is any object with GitHubClient's `collect_repository_contributions`.
+    """
+    log = logger or logging.getLogger("github_champion.sharding")
+    worker_id = worker_id or default_worker_id()
+    organization, since, until = queue.run_info()
+    done = 0
+    while True:
+        unit = queue.claim(worker_id)
+        if unit is None:
+            break
+        # Multi-organization runs queue repositories as "owner/name"
+        owner, _, name = unit.repo.rpartition("/")
+        owner = owner or organization
+        slug = f"{owner}/{name}"
+        log.info("Worker %s collecting %s", worker_id, slug)
+        try:
+            with queue.heartbeat(unit):
+                metrics = client.collect_repository_contributions(
+                    owner=owner,
+                    repo=name,
+                    since=since,
+                    until=until,
+                )
+        except RuntimeError as e:
+            log.error("Worker %s failed on %s: %s", worker_id, slug, e)
+            if not queue.fail(unit, str(e)):
+                log.warning("Worker %s lost its lease on %s", worker_id, slug)
+            continue
+        # The client logs and skips endpoints that fail; retry the whole unit
+        # rather than storing partial metrics
+        incomplete = getattr(client, "incomplete", None)
+        if incomplete is not None and slug in incomplete:
+            incomplete.discard(slug)
+            log.error("Worker %s collected %s only partially", worker_id, slug)
+            if not queue.fail(unit, "an endpoint failed to fetch"):
+                log.warning("Worker %s lost its lease on %s", worker_id, slug)
+            continue
+        if not queue.complete(unit, metrics):
+            log.warning("Worker %s lost its lease on %s; discarding its metrics", worker_id, slug)
+            continue
+        done += 1
+    log.info("Worker %s finished after %d units", worker_id, done)
+    return done
+
+def split_tokens(raw: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated GITHUB_TOKENS value.
+    """
+    return [t.strip() for t in (raw or "").split(",") if t.strip()]
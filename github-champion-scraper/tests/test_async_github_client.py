@@ -0,0 +1,237 @@
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+# The async client imports its sync sibling relatively, so load src as a package
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.async_github_client import AsyncGitHubClient
+from src.budget import RequestBudget
+from src.checkpoint import RunCheckpoint
+from src.github_client import BudgetExhausted, GitHubClient
+
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+UNTIL = datetime(2025, 1, 31, tzinfo=timezone.utc)
+
+ISSUES = [
+    {"number": 1, "closed_at": "2025-01-05T00:00:00Z", "assignee": {"login": "ann"}},
+    {"number": 2, "closed_at": "2024-12-20T00:00:00Z", "assignee": {"login": "ann"}},
+    {"number": 3, "closed_at": "2025-01-06T00:00:00Z", "assignee": {"login": "bob"}},
+    {
+        "number": 4,
+        "closed_at": "2025-01-07T00:00:00Z",
+        "assignee": {"login": "bob"},
+        "pull_request": {},
+    },
+]
+PULLS = [
+    {
+        "number": 12,
+        "created_at": "2025-01-20T00:00:00Z",
+        "updated_at": "2025-01-22T00:00:00Z",
+        "user": {"login": "bob"},
+    },
+    {
+        "number": 11,
+        "created_at": "2025-01-03T00:00:00Z",
+        "updated_at": "2025-01-10T00:00:00Z",
+        "user": {"login": "ann"},
+    },
+    {
+        "number": 10,
+        "created_at": "2024-11-01T00:00:00Z",
+        "updated_at": "2024-11-02T00:00:00Z",
+        "user": {"login": "ann"},
+    },
+]
+REVIEWS = {
+    12: [{"submitted_at": "2025-01-21T00:00:00Z", "user": {"login": "ann"}}],
+    11: [
+        {"submitted_at": "2025-01-04T00:00:00Z", "user": {"login": "bob"}},
+        {"submitted_at": "2025-02-04T00:00:00Z", "user": {"login": "bob"}},
+    ],
+}
+COMMITS = [
+    {
+        "sha": "a",
+        "author": {"login": "ann"},
+        "commit": {"author": {"date": "2025-01-02T00:00:00Z", "email": "ann@x"}},
+    },
+    {
+        "sha": "b",
+        "author": {"login": "bob"},
+        "commit": {"author": {"date": "2025-01-09T00:00:00Z", "email": "bob@x"}},
+    },
+]
+
+def fake_github(failures=None):
+    """
+    Handler serving the fixtures above with GitHub-style page/per_page
+    pagination; `failures` maps a path to the status it answers with.
+    """
+    failures = failures or {}
+    pulls_by_key = {
+        "created": sorted(PULLS, key=lambda p: p["created_at"], reverse=True),
+        "updated": sorted(PULLS, key=lambda p: p["updated_at"], reverse=True),
+    }
+    routes = {
+        "/orgs/org/repos": [{"name": f"repo-{i}"} for i in range(4)] + [{"name": "old", "archived": True}],
+        "/repos/org/repo/issues": ISSUES,
+        "/repos/org/repo/commits": COMMITS,
+    }
+    for number, reviews in REVIEWS.items():
+        routes[f"/repos/org/repo/pulls/{number}/reviews"] = reviews
+
+    def handler(request):
+        path = request.url.path
+        if path in failures:
+            return httpx.Response(failures[path], json={"message": "nope"})
+        params = request.url.params
+        if path == "/repos/org/repo/pulls":
+            items = pulls_by_key[params.get("sort", "created")]
+        elif path in routes:
+            items = routes[path]
+        else:
+            return httpx.Response(404, json={"message": "Not Found"})
+        page, per_page = int(params.get("page", 1)), int(params.get("per_page", 30))
+        return httpx.Response(200, json=items[(page - 1) * per_page : page * per_page])
+
+    return handler
+
+def make_client(handler, **kwargs):
+    client = AsyncGitHubClient(token="dummy-token", http2=False, **kwargs)
+    client.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), headers=client.client.headers
+    )
+    return client
+
+class HandlerSession:
+    """
+    requests.Session stand-in that answers through an httpx handler.
+    """
+
+    def __init__(self, handler):
+        self.headers = {}
+        self._handler = handler
+
+    def get(self, url, params=None, timeout=30):
+        request = httpx.Request("GET", url, params=params)
+        response = self._handler(request)
+        response.request = request
+        return response
+
+def test_pagination_follows_pages_and_skips_archived_repos():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return fake_github()(request)
+
+    async def main():
+        async with make_client(handler, per_page=2) as client:
+            return await client.get_org_repos("org")
+
+    assert asyncio.run(main()) == [f"repo-{i}" for i in range(4)]
+    assert [r.url.params["page"] for r in requests] == ["1", "2", "3"]
+    assert requests[0].headers["Authorization"] == "token dummy-token"
+
+def test_items_are_filtered_to_the_window():
+    async def main():
+        async with make_client(fake_github(), per_page=2) as client:
+            issues = await client.get_closed_issues("org", "repo", SINCE, UNTIL)
+            pulls = await client.get_pulls("org", "repo", SINCE, UNTIL)
+            reviews = await client.get_pull_reviews("org", "repo", 11, SINCE, UNTIL)
+            return issues, pulls, reviews
+
+    issues, pulls, reviews = asyncio.run(main())
+    assert [i["number"] for i in issues] == [1, 3]
+    assert [p["number"] for p in pulls] == [12, 11]
+    assert [r["submitted_at"] for r in reviews] == ["2025-01-04T00:00:00Z"]
+
+def test_contributions_match_the_sync_client():
+    sync = GitHubClient(token="dummy-token", per_page=2)
+    sync.session = HandlerSession(fake_github())  # type: ignore[assignment]
+
+    async def main():
+        async with make_client(fake_github(), per_page=2) as client:
+            return await client.collect_repository_contributions("org", "repo", SINCE, UNTIL)
+
+    expected = sync.collect_repository_contributions("org", "repo", SINCE, UNTIL)
+    assert asyncio.run(main()) == expected
+    assert expected["ann"]["issuesClosed"] == 1
+    assert expected["bob"]["pullReviews"] == 1
+
+def test_failed_endpoint_marks_repo_incomplete_and_keeps_the_rest():
+    async def main():
+        handler = fake_github(failures={"/repos/org/repo/commits": 403})
+        async with make_client(handler, per_page=2) as client:
+            result = await client.collect_repository_contributions("org", "repo", SINCE, UNTIL)
+            return result, client.incomplete
+
+    result, incomplete = asyncio.run(main())
+    assert incomplete == {"org/repo"}
+    assert result["ann"]["commits"] == result["bob"]["commits"] == 0
+    assert result["ann"]["issuesClosed"] == 1
+
+def test_timeouts_and_server_errors_fail_only_their_endpoint():
+    def handler(request):
+        if request.url.path == "/repos/org/repo/commits":
+            raise httpx.ConnectTimeout("timed out", request=request)
+        if request.url.path == "/repos/org/repo/pulls/12/reviews":
+            return httpx.Response(502, json={"message": "Bad Gateway"})
+        return fake_github()(request)
+
+    async def main():
+        async with make_client(handler, per_page=2) as client:
+            result = await client.collect_repository_contributions("org", "repo", SINCE, UNTIL)
+            return result, client.incomplete
+
+    result, incomplete = asyncio.run(main())
+    assert incomplete == {"org/repo"}
+    assert result["ann"]["commits"] == result["bob"]["commits"] == 0
+    assert result["ann"]["pullReviews"] == 0
+    assert result["bob"]["pullReviews"] == 1
+    assert result["ann"]["issuesClosed"] == 1
+
+def test_budget_exhaustion_propagates():
+    async def main():
+        async with make_client(fake_github(), budget=RequestBudget(max_requests=1)) as client:
+            await client.collect_repository_contributions("org", "repo", SINCE, UNTIL)
+
+    try:
+        asyncio.run(main())
+    except BudgetExhausted as e:
+        assert "budget" in str(e)
+    else:
+        raise AssertionError("BudgetExhausted was not raised")
+
+def test_rerun_after_a_failed_page_resumes_from_the_checkpoint(tmp_path):
+    pages = []
+    fail = [True]
+
+    def handler(request):
+        pages.append(request.url.params["page"])
+        if request.url.params["page"] == "2" and fail[0]:
+            return httpx.Response(403, json={"message": "rate limited"})
+        return fake_github()(request)
+
+    async def list_repos(checkpoint):
+        async with make_client(handler, per_page=2, checkpoint=checkpoint) as client:
+            return await client.get_org_repos("org")
+
+    try:
+        asyncio.run(list_repos(RunCheckpoint.start(tmp_path, "org", SINCE, UNTIL)))
+    except RuntimeError as e:
+        assert "Forbidden" in str(e)
+    else:
+        raise AssertionError("the failed page was not reported")
+    fail[0] = False
+    repos = asyncio.run(list_repos(RunCheckpoint.resume(tmp_path, "org")))
+    assert repos == [f"repo-{i}" for i in range(4)]
+    # The resume reads page 1 again to check the listing did not change
+    assert pages == ["1", "2", "1", "2", "3"]
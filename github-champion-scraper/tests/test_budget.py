@@ -0,0 +1,79 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from budget import RequestBudget, completeness_report, parse_deadline
+
+def test_budget_honours_request_cap_deadline_and_observed_quota():
+    budget = RequestBudget(max_requests=3, quota_reserve=5)
+    assert budget.try_spend()
+    budget.observe_rate_limit({"X-RateLimit-Remaining": "6"})
+    assert budget.remaining == 1
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.reason == "GitHub rate-limit quota exhausted"
+    assert budget.used == 2
+
+    assert not RequestBudget(deadline_seconds=0).try_spend()
+
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert parse_deadline("20m") == 1200
+    assert parse_deadline("1.5h") == 5400
+    assert parse_deadline("2025-01-01T00:10:00Z", now=now) == 600
+
+def test_budget_ignores_quota_of_search_responses():
+    budget = RequestBudget(quota_reserve=5)
+    budget.observe_rate_limit({"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "4000"})
+    budget.observe_rate_limit({"X-RateLimit-Resource": "search", "X-RateLimit-Remaining": "2"})
+    assert budget.quota_remaining == 4000
+    assert budget.try_spend()
+
+def test_completeness_report_marks_partial_and_missing_metrics():
+    budget = RequestBudget(max_requests=10)
+    report = completeness_report(
+        ["a", "b"],
+        {"issues": ["a", "b"], "pulls": ["a", "b"], "reviews": ["a"]},
+        budget,
+    )
+    assert report["status"] == "partial"
+    assert report["metrics"]["issuesClosed"] == "complete"
+    assert report["metrics"]["pullReviews"] == "partial"
+    assert report["metrics"]["commits"] == "missing"
+    assert report["pendingRepositories"] == {"reviews": ["b"], "commits": ["a", "b"]}
+    assert report["requestBudget"] == 10
+
+def test_budgeted_collection_does_not_cover_passes_with_failed_endpoints():
+    import logging
+
+    if str(ROOT) not in sys.path:
+        sys.path.append(str(ROOT))
+    from src.main import _collect_budgeted
+
+    class FlakyClient:
+        def __init__(self):
+            self.incomplete = set()
+
+        def collect_repository_contributions(self, owner, repo, since, until, endpoints):
+            if repo == "b" and endpoints == ("reviews",):
+                # Endpoint errors are logged and skipped, flagging the repository
+                self.incomplete.add(f"{owner}/{repo}")
+                return {}
+            return {"ann": {"issuesClosed": 1}}
+
+    client = FlakyClient()
+    costs = {repo: {"issues": 1.0, "pulls": 1.0, "reviews": 1.0, "commits": 1.0} for repo in "ab"}
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    _, report = _collect_budgeted(
+        client, "org", ["a", "b"], costs, now, now, RequestBudget(), logging.getLogger("test"), None
+    )
+    assert report["metrics"]["pullReviews"] == "partial"
+    assert report["metrics"]["commits"] == "complete"
+    assert report["pendingRepositories"] == {"reviews": ["b"]}
+    # The memo still sees the failure from the reviews pass
+    assert client.incomplete == {"org/b"}
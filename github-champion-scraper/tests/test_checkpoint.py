@@ -0,0 +1,62 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from checkpoint import RunCheckpoint
+
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+UNTIL = datetime(2025, 1, 31, tzinfo=timezone.utc)
+
+def test_resume_restores_window_and_completed_repos(tmp_path):
+    checkpoint = RunCheckpoint.start(tmp_path / "ckpt", "my-org", SINCE, UNTIL)
+    checkpoint.save_repo("repo-one", {"gandalf": {"issuesClosed": 2}})
+
+    resumed = RunCheckpoint.resume(tmp_path / "ckpt", "my-org")
+    assert resumed is not None
+    assert resumed.since == SINCE
+    assert resumed.until == UNTIL
+    assert resumed.completed_repos() == {"repo-one": {"gandalf": {"issuesClosed": 2}}}
+
+    assert RunCheckpoint.resume(tmp_path / "missing", "my-org") is None
+
+def test_cursor_resumes_after_last_complete_page(tmp_path):
+    checkpoint = RunCheckpoint.start(tmp_path / "ckpt", "my-org", SINCE, UNTIL)
+    key = checkpoint.cursor_key("https://api.github.com/repos/o/r/pulls", {"state": "all"}, 100)
+    checkpoint.save_cursor_page(key, [{"number": 1}])
+    checkpoint.save_cursor_page(key, [{"number": 2}])
+    # Simulate a crash in the middle of writing the third page
+    with (checkpoint.cursors_dir / f"{key}.jsonl").open("a", encoding="utf-8") as f:
+        f.write('[{"numb')
+
+    page, results = checkpoint.load_cursor(key)
+    assert page == 3
+    assert results == [{"number": 1}, {"number": 2}]
+
+    checkpoint.save_cursor_page(key, [{"number": 3}])
+    page, results = checkpoint.load_cursor(key)
+    assert page == 4
+    assert [r["number"] for r in results] == [1, 2, 3]
+
+    checkpoint.clear_cursor(key)
+    assert checkpoint.load_cursor(key) is None
+
+def test_resumed_listing_replaces_updated_items_and_drops_repeats():
+    from checkpoint import ResumedListing
+
+    listing = ResumedListing(2, [{"number": 5, "updated_at": "1"}, {"number": 4, "updated_at": "1"}])
+    # Sorted by update time: #4 was updated and moved to the top
+    assert not listing.add_head([{"number": 6, "updated_at": "3"}, {"number": 4, "updated_at": "2"}])
+    assert listing.add_head([{"number": 5, "updated_at": "1"}, {"number": 3, "updated_at": "0"}])
+    tail = listing.add([{"number": 5, "updated_at": "1"}, {"number": 3, "updated_at": "0"}])
+    assert listing.merged(tail) == [
+        {"number": 6, "updated_at": "3"},
+        {"number": 4, "updated_at": "2"},
+        {"number": 5, "updated_at": "1"},
+        {"number": 3, "updated_at": "0"},
+    ]
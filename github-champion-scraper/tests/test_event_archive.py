@@ -0,0 +1,114 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from event_archive import EventArchive, EventArchiveWriter
+
+def test_archive_round_trip_rebuilds_metrics_for_window(tmp_path):
+    writer = EventArchiveWriter(tmp_path)
+    writer.record("my-org", "repo-one", "issue_closed", "gandalf", "2025-01-05T10:00:00Z")
+    writer.record("my-org", "repo-one", "pull_review", "gandalf", "2025-01-06T10:00:00Z")
+    writer.record("my-org", "repo-one", "commit", "frodo", "2025-01-07T10:00:00Z", 10, 4)
+    writer.record("my-org", "repo-one", "pull_created", "frodo", "2025-03-01T10:00:00Z")
+    writer.commit_repo("my-org", "repo-one")
+    # Never committed (e.g. the repository failed mid-collection)
+    writer.record("my-org", "repo-two", "issue_closed", "samwise", "2025-01-05T10:00:00Z")
+    writer.discard_repo("my-org", "repo-two")
+
+    archive = EventArchive(tmp_path)
+    try:
+        assert len(archive) == 4
+        metrics = archive.to_repo_metrics(
+            since=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            until=datetime(2025, 1, 31, tzinfo=timezone.utc),
+        )
+    finally:
+        archive.close()
+
+    assert set(metrics) == {"repo-one"}
+    assert metrics["repo-one"]["gandalf"]["issuesClosed"] == 1
+    assert metrics["repo-one"]["gandalf"]["pullReviews"] == 1
+    assert metrics["repo-one"]["frodo"]["commits"] == 1
+    assert metrics["repo-one"]["frodo"]["additions"] == 10
+    assert metrics["repo-one"]["frodo"]["pullsCreated"] == 0
+
+def test_append_keeps_committed_rows_and_qualifies_multi_org_repos(tmp_path):
+    writer = EventArchiveWriter(tmp_path)
+    writer.record("org-a", "shared", "issue_closed", "gandalf", "2025-01-05T10:00:00Z")
+    writer.commit_repo("org-a", "shared")
+
+    writer = EventArchiveWriter(tmp_path)
+    writer.record("org-b", "shared", "issue_closed", "gandalf", "2025-01-05T10:00:00Z")
+    writer.commit_repo("org-b", "shared")
+
+    archive = EventArchive(tmp_path)
+    try:
+        metrics = archive.to_repo_metrics()
+    finally:
+        archive.close()
+    assert set(metrics) == {"org-a/shared", "org-b/shared"}
+
+    EventArchiveWriter(tmp_path, append=False)
+    archive = EventArchive(tmp_path)
+    try:
+        assert len(archive) == 0
+    finally:
+        archive.close()
+
+def test_events_collected_again_by_a_later_run_count_once(tmp_path):
+    def run(assignee):
+        writer = EventArchiveWriter(tmp_path)
+        writer.record("my-org", "repo", "issue_closed", assignee, "2025-01-05T10:00:00Z", ref="7")
+        writer.record("my-org", "repo", "commit", "frodo", "2025-01-06T10:00:00Z", 3, 1, ref="abc")
+        # Same author and second, different commit (e.g. a cherry-pick)
+        writer.record("my-org", "repo", "commit", "frodo", "2025-01-06T10:00:00Z", 3, 1, ref="def")
+        writer.commit_repo("my-org", "repo")
+
+    run("gandalf")
+    # A later run over an overlapping window, after the issue was reassigned
+    run("samwise")
+
+    archive = EventArchive(tmp_path)
+    try:
+        assert len(archive) == 6
+        metrics = archive.to_repo_metrics()
+    finally:
+        archive.close()
+    assert metrics["repo"]["frodo"]["commits"] == 2
+    assert metrics["repo"]["frodo"]["additions"] == 6
+    assert metrics["repo"]["samwise"]["issuesClosed"] == 1
+    assert "gandalf" not in metrics["repo"]
+
+def test_archives_without_refs_stay_readable_and_appendable(tmp_path):
+    import json
+
+    writer = EventArchiveWriter(tmp_path)
+    writer.record("my-org", "repo", "issue_closed", "gandalf", "2025-01-05T10:00:00Z", ref="7")
+    writer.commit_repo("my-org", "repo")
+    # Rewrite as a version 1 archive, which had no ref column
+    meta = json.loads((tmp_path / "archive.json").read_text())
+    meta.update(version=1, columns=[c for c in meta["columns"] if c != "ref"])
+    (tmp_path / "archive.json").write_text(json.dumps(meta))
+    (tmp_path / "ref.col").unlink()
+
+    archive = EventArchive(tmp_path)
+    try:
+        assert archive.to_repo_metrics()["repo"]["gandalf"]["issuesClosed"] == 1
+    finally:
+        archive.close()
+
+    writer = EventArchiveWriter(tmp_path)
+    writer.record("my-org", "repo", "issue_closed", "gandalf", "2025-01-05T10:00:00Z", ref="7")
+    writer.commit_repo("my-org", "repo")
+    archive = EventArchive(tmp_path)
+    try:
+        # The old row has no ref to match, so both rows count
+        assert archive.to_repo_metrics()["repo"]["gandalf"]["issuesClosed"] == 2
+    finally:
+        archive.close()
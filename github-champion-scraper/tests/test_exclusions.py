@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from exclusions import ExclusionRules
+
+def test_rules_match_logins_bots_labels_and_repo_globs():
+    rules = ExclusionRules.from_settings(
+        {
+            "exclude": {
+                "logins": ["Dependabot*", "renovate*"],
+                "bots": True,
+                "labels": ["Dependencies"],
+                "repos": ["sandbox-*", "acme/archive"],
+            }
+        }
+    )
+    assert rules is not None
+    assert ExclusionRules.from_settings({"exclude": {"logins": []}}) is None
+
+    assert rules.skip_repo("sandbox-ui")
+    assert rules.skip_repo("acme/archive")
+    assert rules.skip_repo("globex/sandbox-api")
+    assert not rules.skip_repo("api")
+
+    issues = [
+        {"assignee": {"login": "sam"}, "labels": [{"name": "dependencies"}]},
+        {"assignee": {"login": "DEPENDABOT"}},
+        {"assignee": {"login": "sam"}, "labels": [{"name": "bug"}]},
+        {"assignee": None},
+    ]
+    assert rules.filter("issues", issues) == issues[2:]
+
+    commits = [
+        {"author": {"login": "github-actions[bot]"}},
+        {"author": {"login": "ci", "type": "Bot"}},
+        {"author": {"login": "sam", "type": "User"}},
+    ]
+    assert rules.filter("commits", commits) == commits[2:]
+    # Drafts are only excluded when asked for
+    assert rules.filter("pulls", [{"user": {"login": "sam"}, "draft": True}])
@@ -1,3 +1,4 @@
+import json
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
@@ -10,12 +11,27 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.append(str(SRC))
 
-from github_client import GitHubClient
+from github_client import (
+    BudgetExhausted,
+    ContributionTally,
+    GitHubClient,
+    field_tree,
+    filter_items_by_date,
+    project_fields,
+)
+from identity import IdentityResolver
+from review_cache import ReviewCache
+from run_metrics import RunMetrics
 
 class DummyResponse:
     def __init__(self, status_code=200, json_data=None):
         self.status_code = status_code
         self._json_data = json_data or []
+        self.headers = {}
+
+    @property
+    def content(self):
+        return json.dumps(self._json_data).encode("utf-8")
 
     def json(self):
         return self._json_data
@@ -71,4 +87,280 @@ def test_filter_items_by_date_range(monkeypatch):
         {"created_at": "invalid-date"},
     ]
     filtered = client._filter_items_by_date(items, since=since, until=until)
-    assert len(filtered) == 1
\ No newline at end of file
+    assert len(filtered) == 1
+
+def test_contribution_tally_counts_each_source():
+    tally = ContributionTally()
+    tally.add_closed_issues([{"assignee": {"login": "gandalf"}}, {"assignee": None}])
+    tally.add_pulls([{"user": {"login": "frodo"}}])
+    tally.add_reviews([{"user": {"login": "gandalf"}}, {"user": {"login": "samwise"}}])
+    tally.add_commits([{"author": {"login": "frodo"}, "stats": {"additions": 3, "deletions": 1}}])
+
+    assert tally.contributors["gandalf"]["issuesClosed"] == 1
+    assert tally.contributors["gandalf"]["pullReviews"] == 1
+    assert tally.contributors["frodo"]["pullsCreated"] == 1
+    assert tally.contributors["frodo"]["commits"] == 1
+    assert tally.contributors["frodo"]["additions"] == 3
+    assert set(tally.contributors) == {"gandalf", "frodo", "samwise"}
+
+def test_filter_items_by_date_string_fast_path_matches_parsed_bounds():
+    since = datetime(2025, 1, 1, 0, 0, 0, 500000, tzinfo=timezone.utc)
+    until = datetime(2025, 1, 31, 12, 0, 0, tzinfo=timezone.utc)
+    items = [
+        {"created_at": "2025-01-01T00:00:00Z"},  # before `since` (sub-second)
+        {"created_at": "2025-01-01T00:00:01Z"},
+        {"created_at": "2025-01-31T12:00:00Z"},  # inclusive upper bound
+        {"created_at": "2025-01-31T12:00:01Z"},
+        {"created_at": "2025-01-15T10:00:00+02:00"},  # non-canonical, parsed
+    ]
+    filtered = filter_items_by_date(items, since=since, until=until)
+    assert [i["created_at"] for i in filtered] == [
+        "2025-01-01T00:00:01Z",
+        "2025-01-31T12:00:00Z",
+        "2025-01-15T10:00:00+02:00",
+    ]
+
+def test_project_fields_keeps_only_requested_paths():
+    tree = field_tree("number", "user.login")
+    item = {"number": 7, "body": "long text", "user": {"login": "frodo", "id": 1}, "labels": []}
+    assert project_fields(item, tree) == {"number": 7, "user": {"login": "frodo"}}
+    assert project_fields({"number": 8, "user": None}, tree) == {"number": 8, "user": None}
+
+def test_search_requests_are_labelled_apart_from_repo_listings():
+    metrics = RunMetrics()
+    client = GitHubClient(token="dummy-token", metrics=metrics)
+    client.session = DummySession(  # type: ignore[assignment]
+        [DummyResponse(200, {"total_count": 7}), DummyResponse(200, [])]
+    )
+
+    assert client.search_total_count("repo:org/repo is:issue") == 7
+    client._get("/repos/org/repo/issues")
+
+    text = metrics.render()
+    assert 'github_champion_request_duration_seconds_count{endpoint="search_issues"} 1' in text
+    assert 'github_champion_request_duration_seconds_count{endpoint="issues"} 1' in text
+
+def test_get_resumes_pagination_from_checkpoint(tmp_path):
+    from checkpoint import RunCheckpoint
+
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    checkpoint = RunCheckpoint.start(tmp_path, "my-org", since, since)
+    client = GitHubClient(token="dummy-token", per_page=2, checkpoint=checkpoint)
+    key = checkpoint.cursor_key(f"{client.base_url}/orgs/my-org/repos", None, 2)
+    checkpoint.save_cursor_page(key, [{"name": "a"}, {"name": "b"}])
+
+    session = DummySession(
+        responses=[
+            # Page 1 is read again and is unchanged, so the resume goes on at page 2
+            DummyResponse(json_data=[{"name": "a"}, {"name": "b"}]),
+            DummyResponse(json_data=[{"name": "c"}]),
+        ]
+    )
+    client.session = session  # type: ignore[assignment]
+
+    assert client.get_org_repos("my-org") == ["a", "b", "c"]
+    assert [params["page"] for _, params, _ in session._calls] == [1, 2]
+    assert checkpoint.load_cursor(key) is None
+
+def test_resume_merges_items_added_to_the_listing_since_the_crash(tmp_path):
+    from checkpoint import RunCheckpoint
+
+    def issue(number, login):
+        return {"number": number, "closed_at": "2025-01-05T00:00:00Z", "assignee": {"login": login}}
+
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2025, 1, 31, tzinfo=timezone.utc)
+    checkpoint = RunCheckpoint.start(tmp_path, "org", since, until)
+    client = GitHubClient(token="dummy-token", per_page=2, checkpoint=checkpoint)
+    key = checkpoint.cursor_key(f"{client.base_url}/repos/org/repo/issues", {"state": "closed"}, 2)
+    checkpoint.save_cursor_page(key, [issue(10, "ann"), issue(9, "ann")])
+    # Two issues were closed before the resume and pushed the saved page down
+    listing = [issue(12, "cat"), issue(11, "cat"), issue(10, "ann"), issue(9, "ann"), issue(8, "bob")]
+    client.session = DummySession(  # type: ignore[assignment]
+        responses=[DummyResponse(json_data=listing[i : i + 2]) for i in (0, 2, 4)]
+    )
+
+    issues = client.get_closed_issues("org", "repo", since, until)
+    assert sorted(i["number"] for i in issues) == [8, 9, 10, 11, 12]
+
+def test_request_budget_stops_collection_without_swallowing():
+    from budget import RequestBudget
+
+    budget = RequestBudget(max_requests=1)
+    client = GitHubClient(token="dummy-token", per_page=2, budget=budget)
+    session = DummySession(
+        responses=[
+            DummyResponse(
+                json_data=[{"number": 1, "closed_at": "2025-01-02T00:00:00Z", "assignee": {"login": "sam"}}]
+            )
+        ]
+    )
+    client.session = session  # type: ignore[assignment]
+
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2025, 1, 31, tzinfo=timezone.utc)
+    assert client.collect_repository_contributions("org", "repo", since, until, endpoints=["issues"]) == {
+        "sam": {
+            "issuesClosed": 1,
+            "pullReviews": 0,
+            "pullsCreated": 0,
+            "additions": 0,
+            "deletions": 0,
+            "commits": 0,
+        }
+    }
+    try:
+        client.collect_repository_contributions("org", "repo", since, until, endpoints=["pulls"])
+    except BudgetExhausted as e:
+        assert "budget" in str(e)
+    else:
+        raise AssertionError("BudgetExhausted was not raised")
+    assert len(session._calls) == 1
+
+def test_excluded_pulls_never_cost_a_review_request():
+    from exclusions import ExclusionRules
+
+    rules = ExclusionRules(logins=["renovate*"], bots=True, drafts=True)
+    client = GitHubClient(token="dummy-token", per_page=10, exclusions=rules)
+    created = "2025-01-02T00:00:00Z"
+    pulls = [
+        {"number": 1, "created_at": created, "user": {"login": "dependabot[bot]", "type": "Bot"}},
+        {"number": 2, "created_at": created, "user": {"login": "renovate-app", "type": "User"}},
+        {"number": 3, "created_at": created, "user": {"login": "sam"}, "draft": True},
+        {"number": 4, "created_at": created, "user": {"login": "sam"}, "draft": False},
+    ]
+    for pull in pulls:
+        pull["updated_at"] = created
+    reviews = [
+        {"submitted_at": created, "user": {"login": "ann"}},
+        {"submitted_at": created, "user": {"login": "ci-bot[bot]"}},
+    ]
+    session = DummySession(responses=[DummyResponse(json_data=pulls), DummyResponse(json_data=reviews)])
+    client.session = session  # type: ignore[assignment]
+
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2025, 1, 31, tzinfo=timezone.utc)
+    result = client.collect_repository_contributions(
+        "org", "repo", since, until, endpoints=["pulls", "reviews"]
+    )
+    assert sorted(result) == ["ann", "sam"]
+    assert result["sam"]["pullsCreated"] == 1
+    assert result["ann"]["pullReviews"] == 1
+    assert [url.rsplit("/", 2)[-2:] for url, _, _ in session._calls] == [
+        ["repo", "pulls"],
+        ["4", "reviews"],
+    ]
+
+def test_unchanged_pulls_reuse_cached_reviews_and_old_pulls_are_found_by_update(tmp_path):
+    cache = ReviewCache(tmp_path / "reviews.sqlite")
+    client = GitHubClient(token="dummy-token", per_page=10, review_cache=cache)
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2025, 1, 31, tzinfo=timezone.utc)
+    # Listed most recently updated first; #7 predates the window but was reviewed in it
+    pulls = [
+        {"number": 9, "created_at": "2025-01-20T00:00:00Z", "updated_at": "2025-01-21T00:00:00Z", "user": {"login": "sam"}},
+        {"number": 7, "created_at": "2024-11-02T00:00:00Z", "updated_at": "2025-01-10T00:00:00Z", "user": {"login": "frodo"}},
+        {"number": 5, "created_at": "2024-10-01T00:00:00Z", "updated_at": "2024-12-01T00:00:00Z", "user": {"login": "frodo"}},
+    ]
+    reviews_9 = [{"submitted_at": "2025-01-21T00:00:00Z", "user": {"login": "ann"}}]
+    reviews_7 = [
+        {"submitted_at": "2024-11-03T00:00:00Z", "user": {"login": "ann"}},
+        {"submitted_at": "2025-01-10T00:00:00Z", "user": {"login": "bob"}},
+    ]
+
+    session = DummySession(
+        responses=[
+            DummyResponse(json_data=pulls),
+            DummyResponse(json_data=reviews_9),
+            DummyResponse(json_data=reviews_7),
+        ]
+    )
+    client.session = session  # type: ignore[assignment]
+    first = client.collect_repository_contributions(
+        "org", "repo", since, until, endpoints=["pulls", "reviews"]
+    )
+    assert first["sam"]["pullsCreated"] == 1
+    assert "frodo" not in first
+    assert first["ann"]["pullReviews"] == 1 and first["bob"]["pullReviews"] == 1
+    assert session._calls[0][1]["sort"] == "updated"
+    # The listing stops at the first pull last updated before the window
+    assert len(session._calls) == 3
+
+    # Next run: only #9 moved, so only its reviews are fetched again
+    moved = dict(pulls[0], updated_at="2025-01-25T00:00:00Z")
+    reviews_9 = reviews_9 + [{"submitted_at": "2025-01-25T00:00:00Z", "user": {"login": "bob"}}]
+    session = DummySession(
+        responses=[DummyResponse(json_data=[moved] + pulls[1:]), DummyResponse(json_data=reviews_9)]
+    )
+    client.session = session  # type: ignore[assignment]
+    second = client.collect_repository_contributions(
+        "org", "repo", since, until, endpoints=["reviews"]
+    )
+    assert [url.rsplit("/", 2)[-2:] for url, _, _ in session._calls] == [
+        ["repo", "pulls"],
+        ["9", "reviews"],
+    ]
+    assert second["ann"]["pullReviews"] == 1 and second["bob"]["pullReviews"] == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+
+def test_unlinked_commit_emails_are_looked_up_once_and_aliases_apply_everywhere():
+    identities = IdentityResolver(aliases={"sam-work": "sam"})
+    client = GitHubClient(token="dummy-token", per_page=10, identities=identities)
+    date = "2025-01-02T00:00:00Z"
+    pulls = [{"number": 1, "created_at": date, "updated_at": date, "user": {"login": "sam-work"}}]
+    reviews = [{"submitted_at": date, "user": {"login": "sam-work"}}]
+    commits = [
+        {"sha": "a", "author": None, "commit": {"author": {"date": date, "email": "ann@corp.example"}}},
+        {"sha": "b", "author": None, "commit": {"author": {"date": date, "email": "Ann@corp.example"}}},
+        {"sha": "c", "author": {"login": "sam"}, "commit": {"author": {"date": date, "email": "s@x"}}},
+    ]
+    session = DummySession(
+        responses=[
+            DummyResponse(json_data=pulls),
+            DummyResponse(json_data=reviews),
+            DummyResponse(json_data=commits),
+            DummyResponse(json_data={"total_count": 1, "items": [{"login": "ann"}]}),
+        ]
+    )
+    client.session = session  # type: ignore[assignment]
+
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2025, 1, 31, tzinfo=timezone.utc)
+    result = client.collect_repository_contributions(
+        "org", "repo", since, until, endpoints=["pulls", "reviews", "commits"]
+    )
+    assert sorted(result) == ["ann", "sam"]
+    assert result["ann"]["commits"] == 2
+    sam = result["sam"]
+    assert (sam["pullsCreated"], sam["pullReviews"], sam["commits"]) == (1, 1, 1)
+    lookups = [params["q"] for url, params, _ in session._calls if url.endswith("/search/users")]
+    assert lookups == ["ann@corp.example in:email"]
+
+def test_repos_with_emails_left_unlooked_are_marked_unresolved():
+    date = "2025-01-02T00:00:00Z"
+    commits = [
+        {"sha": "a", "author": None, "commit": {"author": {"date": date, "email": "ann@corp.example"}}},
+        {"sha": "b", "author": None, "commit": {"author": {"date": date, "email": "bob@corp.example"}}},
+    ]
+    miss = {"total_count": 0, "items": []}
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2025, 1, 31, tzinfo=timezone.utc)
+
+    def collect(searches, max_lookups=None):
+        client = GitHubClient(
+            token="dummy-token", per_page=10, identities=IdentityResolver(max_lookups=max_lookups)
+        )
+        client.session = DummySession(  # type: ignore[assignment]
+            responses=[DummyResponse(json_data=[dict(c) for c in commits])]
+            + searches
+        )
+        client.collect_repository_contributions("org", "repo", since, until, endpoints=["commits"])
+        assert client.incomplete == set()
+        return client.unresolved
+
+    # bob@ is cut off by max_lookups, so a later run could still credit him
+    assert collect([DummyResponse(json_data=miss)], max_lookups=1) == {"org/repo"}
+    # A failed search stops the lookups and leaves both emails unsettled
+    assert collect([DummyResponse(status_code=422)]) == {"org/repo"}
+    # Misses answered by GitHub are final
+    assert collect([DummyResponse(json_data=miss), DummyResponse(json_data=miss)]) == set()
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from identity import DAY_SECONDS, IdentityCache, IdentityResolver
+
+def _commit(email, login=None):
+    return {"author": {"login": login} if login else None, "commit": {"author": {"email": email}}}
+
+def test_cache_expires_hits_and_misses_on_their_own_ttl(tmp_path):
+    cache = IdentityCache(tmp_path / "ids.sqlite", ttl_seconds=30 * DAY_SECONDS, negative_ttl_seconds=DAY_SECONDS)
+    cache.put("ann@corp.example", "ann", now=0)
+    cache.put("ghost@corp.example", None, now=0)
+    assert cache.get("ann@corp.example", now=2 * DAY_SECONDS) == (True, "ann")
+    assert cache.get("ghost@corp.example", now=DAY_SECONDS / 2) == (True, None)
+    assert cache.get("ghost@corp.example", now=2 * DAY_SECONDS) == (False, None)
+    assert cache.get("ann@corp.example", now=31 * DAY_SECONDS) == (False, None)
+    assert cache.get("nobody@corp.example") == (False, None)
+    cache.close()
+
+def test_cache_entries_are_shared_between_open_connections(tmp_path):
+    writer = IdentityCache(tmp_path / "ids.sqlite")
+    reader = IdentityCache(tmp_path / "ids.sqlite")
+    writer.put("ann@corp.example", "ann")
+    assert reader.get("ann@corp.example") == (True, "ann")
+    reader.put("bob@corp.example", None)
+    assert writer.get("bob@corp.example") == (True, None)
+    writer.close()
+    reader.close()
+
+def test_resolver_needs_one_lookup_per_unknown_email_across_runs(tmp_path):
+    path = tmp_path / "ids.sqlite"
+    resolver = IdentityResolver(
+        aliases={"Jane@Corp.example": "jane", "jane-old": "jane"},
+        cache=IdentityCache(path),
+    )
+    commits = [
+        _commit("jane@corp.example"),
+        _commit("4242+samwise@users.noreply.github.com"),
+        _commit("ann@corp.example"),
+        _commit("ANN@corp.example"),
+        _commit("ghost@corp.example"),
+        _commit("linked@corp.example", login="frodo"),
+    ]
+    assert resolver.pending_emails(commits) == ["ann@corp.example", "ghost@corp.example"]
+    # Claimed emails are not handed out twice, even before they are answered
+    assert resolver.pending_emails(commits) == []
+    resolver.record("ann@corp.example", "ann")
+    resolver.record("ghost@corp.example", None)
+    resolver.attribute_commits(commits)
+    assert [(c["author"] or {}).get("login") for c in commits] == [
+        "jane", "samwise", "ann", "ann", None, "frodo",
+    ]
+    assert resolver.canonical("jane-old") == "jane" and resolver.canonical("frodo") == "frodo"
+    resolver.close()
+
+    # The next run answers both emails, the miss included, from the cache
+    rerun = IdentityResolver(cache=IdentityCache(path))
+    assert rerun.pending_emails([_commit("ann@corp.example"), _commit("ghost@corp.example")]) == []
+    assert rerun.login_for_email("ann@corp.example") == "ann"
+    rerun.close()
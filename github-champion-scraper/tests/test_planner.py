@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from planner import build_plan, estimate_from_costs, estimate_from_search, format_plan
+
+def test_search_estimate_pages_listings_and_counts_reviews_per_pull():
+    estimate = estimate_from_search(
+        "big", closed_total=950, pulls_since=120, pulls_in_window=80, commit_requests=3, per_page=100
+    )
+    assert (estimate.issues, estimate.pulls, estimate.reviews, estimate.commits) == (10, 2, 80, 3)
+    assert estimate.total == 95
+
+    fallback = estimate_from_costs(
+        "small", {"issues": 1.0, "pulls": 2.0, "reviews": 7.0, "commits": 1.0}, "history"
+    )
+    assert (fallback.pulls, fallback.reviews) == (2, 5)
+
+def test_plan_totals_time_and_quota_fit():
+    estimates = [
+        estimate_from_search("big", 950, 120, 80, 3, 100),
+        estimate_from_costs("small", {"issues": 1.0, "pulls": 1.0, "reviews": 1.0, "commits": 1.0}, "listing"),
+    ]
+    rate_limit = {"core": {"limit": 5000, "remaining": 100, "reset": 1735689600}}
+
+    sync_plan = build_plan(estimates, rate_limit, listing_requests=1, concurrency=1, latency_seconds=0.5)
+    assert sync_plan["requests"]["total"] == 1 + 95 + 3
+    assert sync_plan["estimatedSeconds"] == 49.5
+    assert sync_plan["fitsQuota"] is True
+    assert sync_plan["perRepository"][0]["repository"] == "big"
+
+    # Concurrency is bounded by the longest single listing (10 issue pages + listing)
+    async_plan = build_plan(estimates, rate_limit, listing_requests=1, concurrency=50, latency_seconds=0.5)
+    assert async_plan["estimatedSeconds"] == 5.5
+
+    tight = build_plan(estimates, {"core": {"limit": 5000, "remaining": 50}}, 1, 1)
+    assert tight["fitsQuota"] is False
+    assert "EXCEEDS" in format_plan(tight)
@@ -0,0 +1,35 @@
+import json
+import pstats
+import sys
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from profiling import PhaseProfiler
+
+def _allocate():
+    return [str(i) * 10 for i in range(20000)]
+
+def test_phase_profiler_writes_pstats_and_summary(tmp_path):
+    profiler = PhaseProfiler(tmp_path / "profile", top_n=5)
+    with profiler.phase("collect"):
+        kept = _allocate()
+    with profiler.phase("score"):
+        sum(range(1000))
+    summary_path = profiler.write()
+    profiler.close()
+
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert set(summary) == {"collect", "score"}
+    collect = summary["collect"]
+    assert collect["peakTracedKiB"] > 100
+    assert collect["topAllocators"][0]["location"].endswith(f"test_profiling.py:{_allocate.__code__.co_firstlineno + 1}")
+    assert any("_allocate" in f["function"] for f in collect["topFunctions"])
+
+    stats = pstats.Stats(str(tmp_path / "profile" / "collect.pstats"))
+    assert stats.total_calls > 0
+    assert len(kept) == 20000
@@ -0,0 +1,41 @@
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from publishing import MANIFEST_FILE, build_report_partitions, publish_partitions, repo_partition
+
+def _partitions(alpha_total, repos=("alpha", "beta")):
+    leaderboards = {name: [{"name": "ann", "total": alpha_total if name == "alpha" else 3.0}] for name in repos}
+    rows = [
+        {"repository": name, "id": "ann", "total": board[0]["total"], "generatedAt": "x", "timeRange": {}}
+        for name, board in leaderboards.items()
+    ]
+    return build_report_partitions("All-stars", [{"name": "ann", "total": 9.0}], leaderboards, rows)
+
+def test_only_changed_partitions_are_rewritten_and_stale_ones_removed(tmp_path):
+    first = publish_partitions(tmp_path, _partitions(5.0), {"timeRange": {}}, datetime(2025, 1, 1))
+    assert first == {"written": 3, "unchanged": 0, "removed": 0}
+    beta = tmp_path / repo_partition("beta")
+    assert json.loads(beta.read_text())["contributors"] == [{"id": "ann", "total": 3.0}]
+    beta_mtime = beta.stat().st_mtime_ns
+
+    # A new run with the same data for beta and the org, new data for alpha
+    second = publish_partitions(tmp_path, _partitions(6.0), {"timeRange": {}}, datetime(2025, 1, 2))
+    assert second == {"written": 1, "unchanged": 2, "removed": 0}
+    assert beta.stat().st_mtime_ns == beta_mtime
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert manifest["generatedAt"] == "2025-01-02T00:00:00"
+    assert manifest["partitions"]["repos/alpha.json"]["updatedAt"] == "2025-01-02T00:00:00"
+    assert manifest["partitions"]["repos/beta.json"]["updatedAt"] == "2025-01-01T00:00:00"
+
+    third = publish_partitions(tmp_path, _partitions(6.0, repos=("alpha",)), None, datetime(2025, 1, 3))
+    assert third == {"written": 0, "unchanged": 2, "removed": 1}
+    assert not beta.exists()
+    assert sorted(p.name for p in tmp_path.rglob("*")) == ["alpha.json", MANIFEST_FILE, "org.json", "repos"]
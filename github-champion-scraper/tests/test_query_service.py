@@ -0,0 +1,81 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from query_service import LeaderboardService, LRUCache
+from scoring import RollupHierarchy
+
+def _row(repo, login, total, since="2025-01-01", until="2025-01-31"):
+    return {
+        "repository": repo,
+        "id": login,
+        "additions": 0,
+        "deletions": 0,
+        "commits": 0,
+        "pullsCreated": 0,
+        "pullReviews": 0,
+        "issuesClosed": int(total),
+        "total": float(total),
+        "timeRange": {"since": since, "until": until},
+    }
+
+def _write(path, rows):
+    path.write_text(json.dumps(rows), encoding="utf-8")
+
+def test_service_answers_indexed_queries_from_cache(tmp_path):
+    report = tmp_path / "detailed-metrics.json"
+    _write(
+        report,
+        [
+            _row("api", "ann", 3),
+            _row("api", "ben", 5),
+            _row("web", "ann", 4),
+            _row("api", "ann", 9, since="2024-12-01", until="2024-12-31"),
+        ],
+    )
+    service = LeaderboardService([tmp_path], hierarchy=RollupHierarchy(teams={"core": ["ann"]}))
+
+    status, body = service.handle("/top?n=1")
+    assert status == 200
+    assert [r["id"] for r in json.loads(body)] == ["ann"]
+    assert json.loads(body)[0]["total"] == 7
+
+    assert [r["id"] for r in json.loads(service.handle("/top?repo=api")[1])] == ["ben", "ann"]
+    assert [r["id"] for r in json.loads(service.handle("/top?group=core")[1])] == ["ann"]
+    older = json.loads(service.handle("/top?window=2024-12-01..2024-12-31")[1])
+    assert older[0]["total"] == 9
+
+    detail = json.loads(service.handle("/contributors/ANN")[1])
+    assert detail["totals"]["issuesClosed"] == 7
+    assert [r["repository"] for r in detail["repositories"]] == ["web", "api"]
+    assert service.handle("/repos/missing")[0] == 404
+
+    service.handle("/top?n=1")
+    assert service.cache.hits == 1
+
+def test_service_hot_reloads_and_keeps_index_on_torn_write(tmp_path):
+    report = tmp_path / "detailed-metrics.json"
+    _write(report, [_row("api", "ann", 1)])
+    service = LeaderboardService([report])
+    assert json.loads(service.handle("/top")[1])[0]["id"] == "ann"
+
+    report.write_text('[{"repository": "api"', encoding="utf-8")
+    assert not service.reload_if_changed()
+    assert json.loads(service.handle("/top")[1])[0]["id"] == "ann"
+
+    _write(report, [_row("api", "ann", 1), _row("api", "cat", 2)])
+    assert service.reload_if_changed()
+    assert json.loads(service.handle("/top")[1])[0]["id"] == "cat"
+
+    cache = LRUCache(capacity=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.get("a")
+    cache.put("c", b"3")
+    assert cache.get("b") is None and cache.get("a") == b"1"
@@ -0,0 +1,47 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from repo_memo import RepoMemo, activity_fingerprint, window_is_closed
+
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+UNTIL = datetime(2025, 1, 31, 23, 59, 59, tzinfo=timezone.utc)
+
+def test_fingerprint_moves_with_activity_and_settings():
+    meta = {
+        "name": "repo",
+        "pushed_at": "2025-02-01T00:00:00Z",
+        "updated_at": "2025-02-02T00:00:00Z",
+        "open_issues_count": 4,
+    }
+    base = activity_fingerprint(meta)
+    assert base == activity_fingerprint(dict(meta, size=999))
+    assert base != activity_fingerprint(dict(meta, pushed_at="2025-02-03T00:00:00Z"))
+    assert base != activity_fingerprint(dict(meta, open_issues_count=3))
+    assert base != activity_fingerprint(meta, salt='{"bots": true}')
+    assert activity_fingerprint({"name": "repo"}) is None and activity_fingerprint(None) is None
+
+    assert window_is_closed(UNTIL, now=datetime(2025, 2, 2, tzinfo=timezone.utc))
+    # Still settling: events may show up a little after their timestamp
+    assert not window_is_closed(UNTIL, now=datetime(2025, 2, 1, 12, tzinfo=timezone.utc))
+
+def test_memo_returns_metrics_only_for_same_window_and_fingerprint(tmp_path):
+    path = tmp_path / ".repo-memo.sqlite"
+    metrics = {"ann": {"commits": 3, "pullReviews": 1}}
+    memo = RepoMemo(path)
+    memo.put("org/repo", SINCE, UNTIL, "fp1", metrics)
+    memo.close()
+
+    reopened = RepoMemo(path)
+    assert reopened.get("org/repo", SINCE, UNTIL, "fp1") == metrics
+    assert reopened.get("org/repo", SINCE, UNTIL, "fp2") is None
+    assert reopened.get("org/repo", SINCE, datetime(2025, 1, 15, tzinfo=timezone.utc), "fp1") is None
+    assert reopened.get("org/other", SINCE, UNTIL, "fp1") is None
+    assert reopened.hits == 1
+    reopened.close()
@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from review_cache import ReviewCache
+
+def test_entries_survive_reopening_and_expire_when_the_pull_moves(tmp_path):
+    path = tmp_path / "reviews.sqlite"
+    reviews = [{"submitted_at": "2025-01-02T00:00:00Z", "user": {"login": "ann"}}]
+    cache = ReviewCache(path)
+    assert cache.get("org", "repo", 1, "2025-01-02T00:00:00Z") is None
+    cache.put("org", "repo", 1, "2025-01-02T00:00:00Z", reviews)
+    cache.close()
+
+    reopened = ReviewCache(path)
+    assert reopened.get("org", "repo", 1, "2025-01-02T00:00:00Z") == reviews
+    assert reopened.get("org", "repo", 1, "2025-01-05T00:00:00Z") is None
+    assert reopened.get("org", "other", 1, "2025-01-02T00:00:00Z") is None
+    assert (reopened.hits, reopened.misses) == (1, 2)
+
+    # A refetch replaces the entry rather than adding a second one
+    reopened.put("org", "repo", 1, "2025-01-05T00:00:00Z", [])
+    assert reopened.get("org", "repo", 1, "2025-01-05T00:00:00Z") == []
+    assert reopened.get("org", "repo", 1, "2025-01-02T00:00:00Z") is None
+    reopened.close()
+
+def test_two_connections_write_without_waiting_on_each_other(tmp_path):
+    path = tmp_path / "reviews.sqlite"
+    first = ReviewCache(path)
+    second = ReviewCache(path)
+    # Interleaved writes, as from two sharded workers; a write lock held
+    # between puts would make the second connection time out here.
+    second._conn.execute("PRAGMA busy_timeout=100")
+    for number in range(5):
+        first.put("org", "repo", number, "2025-01-02T00:00:00Z", [])
+        second.put("org", "other", number, "2025-01-02T00:00:00Z", [])
+    assert first.get("org", "other", 4, "2025-01-02T00:00:00Z") == []
+    assert second.get("org", "repo", 4, "2025-01-02T00:00:00Z") == []
+    first.close()
+    second.close()
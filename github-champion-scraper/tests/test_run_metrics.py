@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from run_metrics import RunMetrics
+
+def test_render_exposes_latency_rate_limit_and_phases():
+    metrics = RunMetrics(latency_buckets=(0.1, 1.0))
+    metrics.observe_request("pulls", 200, 0.05)
+    metrics.observe_request("pulls", 200, 0.5)
+    metrics.observe_rate_limit({"X-RateLimit-Remaining": "4321", "X-RateLimit-Limit": "5000"})
+    metrics.observe_rate_limit(
+        {"X-RateLimit-Resource": "search", "X-RateLimit-Remaining": "29", "X-RateLimit-Limit": "30"}
+    )
+    metrics.add_items("pulls", 100)
+    with metrics.phase("collect"):
+        metrics.repo_processed()
+
+    text = metrics.render()
+    assert 'github_champion_request_duration_seconds_bucket{endpoint="pulls",le="0.1"} 1' in text
+    assert 'github_champion_request_duration_seconds_bucket{endpoint="pulls",le="+Inf"} 2' in text
+    assert 'github_champion_rate_limit_remaining{resource="core"} 4321.0' in text
+    assert 'github_champion_rate_limit_remaining{resource="search"} 29.0' in text
+    assert "github_champion_rate_limit_reset" not in text
+    assert 'github_champion_items_parsed_total{endpoint="pulls"} 100' in text
+    assert "github_champion_repos_processed_total 1" in text
+    assert 'github_champion_phase_duration_seconds{phase="collect"}' in text
+
+def test_write_textfile_is_atomic(tmp_path):
+    metrics = RunMetrics()
+    metrics.set_run_success(True)
+    target = tmp_path / "champion.prom"
+    metrics.write_textfile(target)
+
+    assert "github_champion_last_run_success 1" in target.read_text()
+    assert [p.name for p in tmp_path.iterdir()] == ["champion.prom"]
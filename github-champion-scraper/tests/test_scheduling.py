@@ -0,0 +1,60 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from scheduling import RepoStatsStore, estimate_endpoint_costs, merge_contributor_metrics, plan_tasks
+
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+UNTIL = datetime(2025, 1, 31, 23, 59, 59, tzinfo=timezone.utc)
+
+def test_plan_tasks_orders_by_cost_and_splits_large_repositories():
+    costs = {
+        "tiny": {"issues": 1.0, "pulls": 1.0, "reviews": 2.0, "commits": 1.0},
+        "mid": {"issues": 5.0, "pulls": 2.0, "reviews": 30.0, "commits": 5.0},
+        "monorepo": {"issues": 50.0, "pulls": 9.0, "reviews": 800.0, "commits": 40.0},
+    }
+    tasks = plan_tasks(["tiny", "mid", "monorepo"], costs, SINCE, UNTIL, split_cost=100, slices=4)
+
+    assert tasks[0].repo == "monorepo" and tasks[0].endpoints == ("reviews",)
+    assert tasks[0].created_between is None
+    assert [t.repo for t in tasks if t.endpoints is None] == ["mid", "tiny"]
+
+    # Pulls page newest first from the top, so slicing them saves nothing
+    pulls = [t for t in tasks if t.endpoints == ("pulls",)]
+    assert [(t.cost, t.created_between) for t in pulls] == [(9.0, None)]
+
+    commit_slices = [t.created_between for t in tasks if t.endpoints == ("commits",)]
+    assert len(commit_slices) == 4
+    commit_slices.sort()
+    assert commit_slices[0][0] == SINCE and commit_slices[-1][1] == UNTIL
+    # Slices tile the window without overlapping at second precision
+    for (_, end), (start, _) in zip(commit_slices, commit_slices[1:]):
+        assert (start - end).total_seconds() == 1
+
+def test_estimates_prefer_history_and_stats_round_trip(tmp_path):
+    meta = {"name": "repo", "size": 2048, "open_issues_count": 250}
+    from_listing = estimate_endpoint_costs(meta, None, SINCE, UNTIL, per_page=100)
+    assert from_listing["reviews"] > from_listing["issues"] > from_listing["commits"]
+
+    store = RepoStatsStore(tmp_path / ".repo-stats.json")
+    store.record(
+        "my-org",
+        "repo",
+        {"a": {"issuesClosed": 0, "pullsCreated": 64, "commits": 320}},
+        SINCE,
+        UNTIL,
+    )
+    store.save()
+    history = RepoStatsStore(tmp_path / ".repo-stats.json").get("my-org", "repo")
+    from_history = estimate_endpoint_costs(meta, history, SINCE, UNTIL, per_page=100)
+    assert from_history == {"issues": 1.0, "pulls": 2.0, "reviews": 66.0, "commits": 5.0}
+
+    target = {"a": {"commits": 2, "additions": 5}}
+    merge_contributor_metrics(target, {"a": {"commits": 1, "additions": 1}, "b": {"commits": 3}})
+    assert target == {"a": {"commits": 3, "additions": 6}, "b": {"commits": 3}}
@@ -8,9 +8,13 @@ if str(SRC) not in sys.path:
     sys.path.append(str(SRC))
 
 from scoring import (
+    IncrementalLeaderboards,
+    compute_all_leaderboards,
     compute_scores_for_repo,
     aggregate_organization_scores,
     leaderboard_from_scores,
+    RollupHierarchy,
+    ScoringWeights,
 )
 
 def test_compute_scores_for_repo_and_leaderboard():
@@ -84,4 +88,105 @@ def test_aggregate_organization_scores():
     assert agg.issues_closed == 3  # 1 + 2
     assert agg.pull_reviews == 3  # 2 + 1
     assert agg.pulls_created == 3  # 3 + 0
-    assert agg.commits == 3  # 1 + 2
\ No newline at end of file
+    assert agg.commits == 3  # 1 + 2
+
+def test_scoring_weights_from_settings():
+    weights = ScoringWeights.from_settings({"scoring": {"weights": {"pull_reviews": 2.0}}})
+    assert weights.pull_reviews == 2.0
+    assert weights.issues_closed == 1.0
+
+    scores = compute_scores_for_repo(
+        {"gandalf": {"issuesClosed": 1, "pullReviews": 2, "pullsCreated": 2}},
+        weights=weights,
+    )
+    assert scores["gandalf"].total == 1.0 + 4.0 + 1.0
+
+def test_rollup_hierarchy_aggregates_every_level_in_one_pass():
+    per_repo_scores = {
+        "api": compute_scores_for_repo({"ann": {"issuesClosed": 2}, "ben": {"pullReviews": 4}}),
+        "web": compute_scores_for_repo({"ann": {"pullsCreated": 2}, "cat": {"issuesClosed": 1}}),
+        "docs": compute_scores_for_repo({"cat": {"issuesClosed": 5}}),
+    }
+    hierarchy = RollupHierarchy(
+        repo_groups={"backend": ["api"], "frontend": ["w*"]},
+        teams={"core": ["Ann", "cat"]},
+        parents={"backend": "engineering", "frontend": "engineering", "core": "engineering"},
+    )
+
+    group_scores = hierarchy.aggregate(per_repo_scores)
+
+    assert set(group_scores["backend"]) == {"ann", "ben"}
+    assert group_scores["core"]["cat"].issues_closed == 6
+    # "ann" on "api" is in both backend and core but counts once for engineering
+    engineering = group_scores["engineering"]
+    assert engineering["ann"].issues_closed == 2 and engineering["ann"].pulls_created == 2
+    assert engineering["cat"].issues_closed == 6
+    assert [row["name"] for row in leaderboard_from_scores(engineering, top_n=5)] == ["cat", "ann", "ben"]
+    assert hierarchy.kind("engineering") == "group" and hierarchy.kind("core") == "team"
+
+def test_organization_leaderboards_split_owner_qualified_repositories():
+    def metrics(issues, reviews):
+        return {
+            "issuesClosed": issues,
+            "pullReviews": reviews,
+            "pullsCreated": 0,
+            "additions": 0,
+            "deletions": 0,
+            "commits": 0,
+        }
+
+    repo_metrics = {
+        "acme/api": {"ann": metrics(2, 0), "ben": metrics(1, 0)},
+        "acme/web": {"ben": metrics(2, 0)},
+        "globex/api": {"ann": metrics(0, 4)},
+    }
+    incremental = IncrementalLeaderboards(top_n=5)
+    for repo, contributors in repo_metrics.items():
+        incremental.add_repo(repo, contributors)
+    leaderboards = incremental.organization_leaderboards()
+
+    assert sorted(leaderboards) == ["acme", "globex"]
+    assert [row["name"] for row in leaderboards["acme"]] == ["ben", "ann"]
+    assert leaderboards["acme"][0]["total"] == 3.0
+    assert leaderboards["globex"] == [
+        {"name": "ann", "total": 3.0, "pullReviews": 4, "issuesClosed": 0, "pullsCreated": 0}
+    ]
+    # Cross-organization totals are the plain aggregate over every repository
+    assert aggregate_organization_scores(incremental.per_repo_scores)["ann"].total == 5.0
+
+def test_incremental_leaderboards_match_batch_in_any_arrival_order():
+    def metrics(issues, reviews, pulls):
+        return {
+            "issuesClosed": issues,
+            "pullReviews": reviews,
+            "pullsCreated": pulls,
+            "additions": 0,
+            "deletions": 0,
+            "commits": 0,
+        }
+
+    repo_metrics = {
+        "acme/api": {"ann": metrics(1, 0, 0), "ben": metrics(2, 1, 0)},
+        "acme/web": {"cat": metrics(1, 0, 0), "ann": metrics(0, 4, 2)},
+        "globex/api": {"dan": metrics(1, 0, 0), "ben": metrics(0, 0, 1)},
+    }
+    hierarchy = RollupHierarchy(repo_groups={"apis": ["api"]}, teams={"core": ["ann", "dan"]})
+    per_repo_scores, _, per_repo_leaderboards, org_leaderboard = compute_all_leaderboards(
+        repo_metrics, top_n=10
+    )
+    group_leaderboards = {
+        name: leaderboard_from_scores(scores, top_n=10)
+        for name, scores in hierarchy.aggregate(per_repo_scores).items()
+    }
+
+    incremental = IncrementalLeaderboards(top_n=10, hierarchy=hierarchy)
+    for repo in reversed(list(repo_metrics)):
+        incremental.add_repo(repo, repo_metrics[repo])
+    assert [row["name"] for row in incremental.org_leaderboard()][:2] == ["ann", "ben"]
+
+    incremental.finalize(list(repo_metrics))
+    # Ties (cat and dan on one closed issue) rank as in the batch run
+    assert incremental.org_leaderboard() == org_leaderboard
+    assert list(incremental.per_repo_leaderboards.items()) == list(per_repo_leaderboards.items())
+    assert incremental.group_leaderboards() == group_leaderboards
+    assert sorted(incremental.organization_leaderboards()) == ["acme", "globex"]
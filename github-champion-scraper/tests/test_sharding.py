@@ -0,0 +1,107 @@
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure src is on the import path
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from sharding import WorkQueue, run_worker
+
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+UNTIL = datetime(2025, 1, 31, tzinfo=timezone.utc)
+
+class FakeClient:
+    def __init__(self, failing=(), partial=(), seconds=0.0):
+        self.failing = set(failing)
+        self.partial = set(partial)
+        self.seconds = seconds
+        self.calls = []
+        self.incomplete = set()
+
+    def collect_repository_contributions(self, owner, repo, since, until):
+        self.calls.append(repo)
+        time.sleep(self.seconds)
+        if repo in self.failing:
+            raise RuntimeError("boom")
+        if repo in self.partial:
+            # Endpoint failures are logged and skipped by the real clients
+            self.incomplete.add(f"{owner}/{repo}")
+            return {}
+        return {"gandalf": {"issuesClosed": len(repo)}}
+
+def test_queue_hands_out_heaviest_units_first_and_expires_leases(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", lease_seconds=-1)
+    queue.initialize("my-org", SINCE, UNTIL, [("small", 1.0), ("huge", 100.0), ("mid", 10.0)])
+
+    first = queue.claim("worker-a")
+    assert first.repo == "huge"
+    # The lease is already expired, so another worker can take the unit over
+    second = queue.claim("worker-b")
+    assert second.repo == "huge"
+    assert second.attempts == 2
+
+def test_only_the_current_lease_can_complete_or_fail_a_unit(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", lease_seconds=-1)
+    queue.initialize("my-org", SINCE, UNTIL, [("repo", 1.0)])
+
+    stale = queue.claim("worker-a")
+    current = queue.claim("worker-b")
+    assert not queue.complete(stale, {"gandalf": {"issuesClosed": 1}})
+    assert not queue.fail(stale, "boom")
+    assert queue.progress() == {"leased": 1}
+
+    assert queue.complete(current, {"gandalf": {"issuesClosed": 2}})
+    # A finished unit cannot be failed or overwritten afterwards
+    assert not queue.fail(current, "boom")
+    assert not queue.complete(current, {})
+    assert queue.results() == {"repo": {"gandalf": {"issuesClosed": 2}}}
+
+def test_run_worker_drains_queue_and_retries_failures(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=2)
+    queue.initialize("my-org", SINCE, UNTIL, [("repo-a", 2.0), ("repo-bb", 1.0)])
+    client = FakeClient(failing={"repo-a"})
+
+    assert run_worker(queue, client, worker_id="w1") == 1
+    assert client.calls == ["repo-a", "repo-a", "repo-bb"]
+    assert queue.progress() == {"done": 1, "failed": 1}
+    assert queue.results() == {"repo-bb": {"gandalf": {"issuesClosed": 7}}}
+    assert queue.run_info() == ("my-org", SINCE, UNTIL)
+
+def test_partially_collected_units_are_retried_not_completed(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=2)
+    queue.initialize("my-org", SINCE, UNTIL, [("repo-a", 1.0)])
+    client = FakeClient(partial={"repo-a"})
+
+    assert run_worker(queue, client, worker_id="w1") == 0
+    assert client.calls == ["repo-a", "repo-a"]
+    assert queue.progress() == {"failed": 1}
+    assert client.incomplete == set()
+
+def test_expired_leases_stop_after_max_attempts(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", lease_seconds=-1, max_attempts=2)
+    queue.initialize("my-org", SINCE, UNTIL, [("repo", 1.0)])
+
+    assert queue.claim("worker-a").attempts == 1
+    assert queue.claim("worker-b").attempts == 2
+    assert queue.claim("worker-c") is None
+    assert queue.progress() == {"failed": 1}
+
+def test_heartbeat_keeps_a_long_collection_leased(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", lease_seconds=0.3)
+    queue.initialize("my-org", SINCE, UNTIL, [("repo", 1.0)])
+    unit = queue.claim("worker-a")
+
+    with queue.heartbeat(unit, interval=0.05):
+        time.sleep(0.6)
+        assert queue.claim("worker-b") is None
+    assert queue.complete(unit, {})
+
+def test_queue_reads_lease_and_attempts_from_settings(tmp_path):
+    queue = WorkQueue.from_settings(
+        tmp_path / "queue.sqlite", {"sharding": {"lease_seconds": 60, "max_attempts": 5}}
+    )
+    assert (queue.lease_seconds, queue.max_attempts) == (60.0, 5)